@@ -0,0 +1,83 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+MAIN = os.path.join(ROOT, "src", "main.py")
+HEAVY_MODULES = ["docker", "requests", "urllib3", "rich", "yaml"]
+
+
+def parse_importtime(stderr: str) -> tuple[dict[str, int], int]:
+    modules = {}
+    lines = [line for line in stderr.splitlines() if line.startswith("import time:")]
+    # Everything up to and including `site` is interpreter startup, not ours.
+    start = 0
+    for index, line in enumerate(lines):
+        if line.split("|")[-1].strip() == "site":
+            start = index + 1
+    total_us = 0
+    for line in lines[start:]:
+        _, cumulative, name = line.split("|")
+        modules[name.strip()] = int(cumulative)
+        if not name.startswith("  "):
+            total_us += int(cumulative)
+    return modules, total_us
+
+
+def run_once(args: list[str], env: dict) -> tuple[float, dict[str, int], int]:
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", MAIN] + args,
+        capture_output=True, text=True, env=env
+    )
+    elapsed = time.perf_counter() - start
+    modules, total_us = parse_importtime(result.stderr)
+    return elapsed, modules, total_us
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold-start budget for the scanner CLI")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--import-budget-ms", type=float, default=100.0)
+    parser.add_argument("--wall-budget-ms", type=float, default=400.0)
+    options = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        dockerfile = os.path.join(tmp, "Dockerfile")
+        with open(dockerfile, "w") as f:
+            f.write("FROM python:3.12-slim\nUSER app\nHEALTHCHECK CMD true\n")
+        env = dict(os.environ, XDG_CACHE_HOME=os.path.join(tmp, "cache"))
+
+        walls = []
+        imports = []
+        heavy = set()
+        for _ in range(options.runs):
+            elapsed, modules, total_us = run_once(["--dockerfile", dockerfile, "--json"], env)
+            walls.append(elapsed * 1000)
+            imports.append(total_us / 1000)
+            heavy.update(name for name in HEAVY_MODULES if name in modules)
+
+    wall_ms = statistics.median(walls)
+    import_ms = statistics.median(imports)
+    print(f"wall time (median of {options.runs}): {wall_ms:7.1f} ms  (budget {options.wall_budget_ms:.0f} ms)")
+    print(f"scanner imports (median):    {import_ms:7.1f} ms  (budget {options.import_budget_ms:.0f} ms)")
+
+    failed = False
+    if heavy:
+        print(f"FAIL: heavy modules imported on a Dockerfile JSON run: {', '.join(sorted(heavy))}")
+        failed = True
+    if import_ms > options.import_budget_ms:
+        print("FAIL: import time over budget")
+        failed = True
+    if wall_ms > options.wall_budget_ms:
+        print("FAIL: wall time over budget")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
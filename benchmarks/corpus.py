@@ -0,0 +1,74 @@
+import os
+import random
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'tests'))
+
+from fake_docker import make_container
+
+BASE_IMAGES = ["ubuntu", "ubuntu:22.04", "alpine:3.19", "python:3.12-slim", "node:latest", "golang:1.22"]
+PORTS = [22, 80, 443, 3306, 5432, 6379, 8080, 9200]
+
+
+def make_dockerfile(line_count: int, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    lines = [f"FROM {rng.choice(BASE_IMAGES)} AS build"]
+    while len(lines) < line_count:
+        roll = rng.random()
+        if roll < 0.45:
+            lines.append(f"RUN apt-get install -y pkg-{len(lines)} && \\")
+            lines.append(f"    rm -rf /var/lib/apt/lists/{len(lines)}")
+        elif roll < 0.6:
+            lines.append(f"COPY src/{len(lines)} /app/{len(lines)}")
+        elif roll < 0.7:
+            lines.append(f"ADD file-{len(lines)}.txt /app/")
+        elif roll < 0.78:
+            lines.append(f"EXPOSE {rng.choice(PORTS)}/tcp")
+        elif roll < 0.85:
+            lines.append(f"# comment {len(lines)}")
+        elif roll < 0.9:
+            lines.append(f"ENV KEY_{len(lines)}=value")
+        elif roll < 0.93:
+            lines.append(f"FROM {rng.choice(BASE_IMAGES)}")
+        else:
+            lines.append(f"WORKDIR /srv/{len(lines)}")
+    return lines[:line_count]
+
+
+def make_compose(service_count: int, seed: int = 0) -> dict:
+    rng = random.Random(seed)
+    services = {}
+    for i in range(service_count):
+        service = {"image": f"registry.local/app-{i}:1.{i % 7}" if rng.random() < 0.8 else f"app-{i}"}
+        if rng.random() < 0.4:
+            service["user"] = "app"
+        if rng.random() < 0.3:
+            service["deploy"] = {"resources": {"limits": {"memory": "256m", "cpus": "0.5"}}}
+        if rng.random() < 0.2:
+            service["ports"] = [f"{8000 + i % 1000}:80", f"{rng.choice(PORTS)}:{rng.choice(PORTS)}"]
+        if rng.random() < 0.1:
+            service["expose"] = ["80"]
+        if rng.random() < 0.05:
+            service["privileged"] = True
+        services[f"svc-{i}"] = service
+    return {"services": services}
+
+
+def make_containers(count: int, seed: int = 0) -> list[dict]:
+    rng = random.Random(seed)
+    containers = []
+    for i in range(count):
+        host_config = {}
+        if rng.random() < 0.5:
+            host_config["Memory"] = 1 << 28
+        if rng.random() < 0.5:
+            host_config["NanoCpus"] = 500_000_000
+        if rng.random() < 0.05:
+            host_config["Privileged"] = True
+        if rng.random() < 0.05:
+            host_config["NetworkMode"] = "host"
+        attrs = make_container(i, **host_config)
+        if rng.random() < 0.1:
+            attrs["Mounts"] = [{"Source": rng.choice(["/var/run/docker.sock", "/etc/ssl", "/data"]), "Destination": "/x"}]
+        containers.append(attrs)
+    return containers
@@ -0,0 +1,182 @@
+import argparse
+import contextlib
+import io
+import json
+import math
+import multiprocessing
+import os
+import statistics
+import sys
+import time
+from typing import Callable
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# corpus puts src/ and tests/ on sys.path for the imports below.
+
+from corpus import make_dockerfile, make_compose, make_containers
+from fake_docker import FakeDockerDaemon
+from checks.dockerfile_checks import run_dockerfile_checks
+from checks.compose_checks import run_compose_checks
+from checks.container_runtime_checks import run_runtime_checks, DOCKER_CONNECTION_ERROR
+from utils.file_loader import parse_dockerfile
+from utils.report import print_findings, JsonLinesWriter, SarifWriter
+
+BASELINES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines.json")
+# Each timed sample of a case runs it in a loop for at least this long, so
+# sub-millisecond cases are not lost in timer and scheduler noise.
+MIN_SAMPLE_SECONDS = 0.05
+
+
+def calibration_workload():
+    # A fixed pure-Python workload; case timings are stored relative to it so
+    # baselines recorded on one machine remain meaningful on another.
+    table = {}
+    for i in range(200_000):
+        table[i % 997] = table.get(i % 997, 0) + len(str(i))
+    return table
+
+
+def _timed(func: Callable, loops: int) -> float:
+    start = time.perf_counter()
+    for _ in range(loops):
+        func()
+    return (time.perf_counter() - start) / loops
+
+
+def median_of(func: Callable, repeat: int, min_sample: float = 0.0) -> tuple[float, float]:
+    # The machine's speed drifts during a run and has short fast and slow
+    # bursts, so every case sample is bracketed by calibration samples and
+    # the median of each is kept: both then describe the same machine state,
+    # and a single lucky sample cannot set the result.
+    loops = max(1, math.ceil(min_sample / max(_timed(func, 1), 1e-6))) if min_sample else 1
+    seconds, units = [], []
+    for _ in range(repeat):
+        before = _timed(calibration_workload, 1)
+        seconds.append(_timed(func, loops))
+        units.append((before + _timed(calibration_workload, 1)) / 2)
+    return statistics.median(seconds), statistics.median(units)
+
+
+def dockerfile_case(line_count: int) -> Callable:
+    lines = make_dockerfile(line_count)
+    return lambda: run_dockerfile_checks(parse_dockerfile(lines))
+
+
+def compose_case(service_count: int) -> Callable:
+    config = make_compose(service_count)
+    return lambda: run_compose_checks(config)
+
+
+def render_case(kind: str, service_count: int) -> Callable:
+    findings = run_compose_checks(make_compose(service_count))
+
+    def render():
+        if kind == "table":
+            with contextlib.redirect_stdout(io.StringIO()):
+                print_findings(findings)
+            return
+        writer = JsonLinesWriter(io.StringIO()) if kind == "jsonl" else SarifWriter(io.StringIO())
+        for index in range(0, len(findings), 500):
+            writer.write(findings[index:index + 500])
+        writer.close()
+    return render
+
+
+CASES = {
+    "dockerfile_10_lines": (lambda: dockerfile_case(10), 15),
+    "dockerfile_1k_lines": (lambda: dockerfile_case(1_000), 15),
+    "dockerfile_10k_lines": (lambda: dockerfile_case(10_000), 9),
+    "compose_1k_services": (lambda: compose_case(1_000), 15),
+    "compose_50k_services": (lambda: compose_case(50_000), 5),
+    "report_table_2k_services": (lambda: render_case("table", 2_000), 5),
+    "report_jsonl_20k_services": (lambda: render_case("jsonl", 20_000), 5),
+    "report_sarif_20k_services": (lambda: render_case("sarif", 20_000), 5),
+}
+
+
+def _serve_fake_daemon(containers: list[dict], urls, stop) -> None:
+    with FakeDockerDaemon(containers) as daemon:
+        urls.put(daemon.base_url)
+        stop.wait()
+
+
+def run_runtime_case(container_count: int, repeat: int) -> tuple[float, float]:
+    # Serve from a separate process so the daemon's HTTP handling does not
+    # compete with the scanner for the GIL.
+    context = multiprocessing.get_context("fork")
+    urls = context.Queue()
+    stop = context.Event()
+    server = context.Process(target=_serve_fake_daemon, args=(make_containers(container_count), urls, stop))
+    server.start()
+    try:
+        base_url = urls.get(timeout=30)
+
+        def scan():
+            # A failed scan returns quickly; timing it would hide a broken case.
+            errors = [f for f in run_runtime_checks(base_url, workers=16) if f.rule.id == DOCKER_CONNECTION_ERROR.id]
+            if errors:
+                raise RuntimeError(f"Runtime case failed: {errors[0].details}")
+        return median_of(scan, repeat)
+    finally:
+        stop.set()
+        server.join()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scanner benchmark suite with a baseline regression gate")
+    parser.add_argument("--filter", default="", help="Only run cases whose name contains this text")
+    parser.add_argument("--containers", type=int, default=2_000, help="Containers served by the fake daemon")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="Allowed slowdown over baseline (0.5 = 50%%)")
+    parser.add_argument("--update-baselines", action="store_true", help="Record this run as the new baselines")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    options = parser.parse_args()
+
+    results = {}
+    units = {}
+    for name, (factory, repeat) in CASES.items():
+        if options.filter not in name:
+            continue
+        results[name], units[name] = median_of(factory(), repeat, MIN_SAMPLE_SECONDS)
+    runtime_name = f"runtime_{options.containers}_containers"
+    if options.filter in runtime_name:
+        results[runtime_name], units[runtime_name] = run_runtime_case(options.containers, 5)
+
+    baselines = {}
+    if os.path.exists(BASELINES):
+        with open(BASELINES) as f:
+            baselines = json.load(f)
+
+    failed = []
+    print(f"{'case':32} {'time':>11} {'calib':>9} {'relative':>9} {'baseline':>9}")
+    for name, seconds in results.items():
+        relative = seconds / units[name]
+        baseline = baselines.get(name)
+        status = ""
+        if baseline is not None and not options.update_baselines:
+            if relative > baseline * (1 + options.tolerance):
+                status = "REGRESSION"
+                failed.append(name)
+        baseline_text = f"{baseline:9.4g}" if baseline is not None else f"{'-':>9}"
+        print(
+            f"{name:32} {seconds * 1000:8.3f} ms {units[name] * 1000:6.1f} ms {relative:9.4g} {baseline_text} {status}"
+        )
+
+    if options.output:
+        with open(options.output, "w") as f:
+            json.dump({"calibration": units, "seconds": results}, f, indent=2)
+
+    if options.update_baselines:
+        baselines.update({name: float(f"{seconds / units[name]:.4g}") for name, seconds in results.items()})
+        with open(BASELINES, "w") as f:
+            json.dump(dict(sorted(baselines.items())), f, indent=2)
+            f.write("\n")
+        print(f"baselines written to {BASELINES}")
+
+    if failed:
+        print(f"FAIL: {len(failed)} case(s) slower than baseline + {options.tolerance:.0%}: {', '.join(failed)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,119 +1,122 @@
-from config import SENSITIVE_PORTS
+from typing import Callable
+from utils.finding import Finding, Rule, Severity
+from utils.ports import parse_compose_port, sensitive_port_index
 
+RUNNING_AS_ROOT = Rule(
+    "DC001", Severity.HIGH, "Container running as root", "Service '{service}' has no user or runs as root"
+)
+MISSING_MEMORY_LIMIT = Rule("DC002", Severity.MEDIUM, "Missing memory limit", "Service '{service}' has no memory limit")
+MISSING_CPU_LIMIT = Rule("DC003", Severity.MEDIUM, "Missing CPU limit", "Service '{service}' has no CPU limit")
+PRIVILEGED_MODE = Rule(
+    "DC004", Severity.HIGH, "Privileged mode enabled", "Service '{service}' runs in privileged mode"
+)
+EXPOSED_WITHOUT_MAPPING = Rule(
+    "DC005", Severity.LOW, "Exposed ports without mapping", "Service '{service}' exposes ports but no port mapping"
+)
+SENSITIVE_PORT_MAPPED = Rule(
+    "DC006", Severity.HIGH, "Sensitive port mapped", "Service '{service}' maps sensitive port {0}"
+)
+UNPINNED_IMAGE = Rule(
+    "DC007", Severity.HIGH, "Unpinned image version", "Service '{service}' uses latest or no tag: {0}"
+)
 
-def check_running_as_root(config: dict) -> list[dict]:
-    findings = []
-    services = config.get("services", {})
-    for name, service in services.items():
-        if isinstance(service, dict):
-            user = service.get("user")
-            if not user or user == "root" or user == "0":
-                findings.append({
-                    "severity": "HIGH",
-                    "check": "Container running as root",
-                    "details": f"Service '{name}' has no user or runs as root"
-                })
-    return findings
+
+def running_as_root(name: str, service: dict) -> list[Finding]:
+    user = service.get("user")
+    if not user or user == "root" or user == "0":
+        return [Finding(RUNNING_AS_ROOT, service=name)]
+    return []
 
 
-def check_missing_resource_limits(config: dict) -> list[dict]:
+def missing_resource_limits(name: str, service: dict) -> list[Finding]:
     findings = []
-    services = config.get("services", {})
-    for name, service in services.items():
-        if isinstance(service, dict):
-            deploy = service.get("deploy", {})
-            resources = deploy.get("resources", {})
-            limits = resources.get("limits", {})
-            
-            if not limits.get("memory") and not service.get("mem_limit"):
-                findings.append({
-                    "severity": "MEDIUM",
-                    "check": "Missing memory limit",
-                    "details": f"Service '{name}' has no memory limit"
-                })
-            
-            if not limits.get("cpus") and not service.get("cpus"):
-                findings.append({
-                    "severity": "MEDIUM",
-                    "check": "Missing CPU limit",
-                    "details": f"Service '{name}' has no CPU limit"
-                })
-    return findings
+    deploy = service.get("deploy") or {}
+    resources = deploy.get("resources") or {}
+    limits = resources.get("limits") or {}
 
+    if not limits.get("memory") and not service.get("mem_limit"):
+        findings.append(Finding(MISSING_MEMORY_LIMIT, service=name))
 
-def check_privileged_mode(config: dict) -> list[dict]:
-    findings = []
-    services = config.get("services", {})
-    for name, service in services.items():
-        if isinstance(service, dict):
-            if service.get("privileged"):
-                findings.append({
-                    "severity": "HIGH",
-                    "check": "Privileged mode enabled",
-                    "details": f"Service '{name}' runs in privileged mode"
-                })
+    if not limits.get("cpus") and not service.get("cpus"):
+        findings.append(Finding(MISSING_CPU_LIMIT, service=name))
     return findings
 
 
-def check_exposed_ports_without_mapping(config: dict) -> list[dict]:
-    findings = []
-    services = config.get("services", {})
-    for name, service in services.items():
-        if isinstance(service, dict):
-            expose = service.get("expose", [])
-            ports = service.get("ports", [])
-            
-            if expose and not ports:
-                findings.append({
-                    "severity": "LOW",
-                    "check": "Exposed ports without mapping",
-                    "details": f"Service '{name}' exposes ports but no port mapping"
-                })
-            
-            for port_def in ports:
-                if isinstance(port_def, str):
-                    parts = port_def.split(":")
-                    if len(parts) >= 2:
-                        try:
-                            host_port = int(parts[0])
-                            if host_port in SENSITIVE_PORTS:
-                                findings.append({
-                                    "severity": "HIGH",
-                                    "check": "Sensitive port mapped",
-                                    "details": f"Service '{name}' maps sensitive port {host_port}"
-                                })
-                        except ValueError:
-                            continue
-    return findings
+def privileged_mode(name: str, service: dict) -> list[Finding]:
+    if service.get("privileged"):
+        return [Finding(PRIVILEGED_MODE, service=name)]
+    return []
 
 
-def check_unpinned_versions(config: dict) -> list[dict]:
+def exposed_ports_without_mapping(name: str, service: dict) -> list[Finding]:
     findings = []
-    services = config.get("services", {})
-    for name, service in services.items():
-        if isinstance(service, dict):
-            image = service.get("image", "")
-            if image:
-                if ":latest" in image or ":" not in image:
-                    findings.append({
-                        "severity": "HIGH",
-                        "check": "Unpinned image version",
-                        "details": f"Service '{name}' uses latest or no tag: {image}"
-                    })
+    expose = service.get("expose", [])
+    ports = service.get("ports", [])
+
+    if expose and not ports:
+        findings.append(Finding(EXPOSED_WITHOUT_MAPPING, service=name))
+
+    if not ports:
+        return findings
+    index = sensitive_port_index()
+    for port_def in ports:
+        mapping = parse_compose_port(port_def)
+        if mapping is None or mapping.published is None:
+            continue
+        # One lookup per published range, however many ports it spans.
+        for port_range in index.overlaps(*mapping.published):
+            findings.append(Finding(SENSITIVE_PORT_MAPPED, (port_range.label(),), service=name))
     return findings
 
 
+def unpinned_versions(name: str, service: dict) -> list[Finding]:
+    image = service.get("image", "")
+    if image:
+        if ":latest" in image or ":" not in image:
+            return [Finding(UNPINNED_IMAGE, (image,), service=name)]
+    return []
+
+
 COMPOSE_CHECKS = [
-    check_running_as_root,
-    check_missing_resource_limits,
-    check_privileged_mode,
-    check_exposed_ports_without_mapping,
-    check_unpinned_versions,
+    running_as_root,
+    missing_resource_limits,
+    privileged_mode,
+    exposed_ports_without_mapping,
+    unpinned_versions,
 ]
 
 
-def run_compose_checks(config: dict) -> list[dict]:
+def run_service_rules(config: dict, rules: list[Callable[[str, dict], list[Finding]]]) -> list[Finding]:
+    services = config.get("services") or {}
     findings = []
-    for check in COMPOSE_CHECKS:
-        findings.extend(check(config))
+    # One walk per rule keeps findings in registry order without sorting
+    # them afterwards; the walk costs little next to the rule bodies.
+    for rule in rules:
+        for name, service in services.items():
+            if isinstance(service, dict):
+                findings.extend(rule(name, service))
     return findings
+
+
+def check_running_as_root(config: dict) -> list[Finding]:
+    return run_service_rules(config, [running_as_root])
+
+
+def check_missing_resource_limits(config: dict) -> list[Finding]:
+    return run_service_rules(config, [missing_resource_limits])
+
+
+def check_privileged_mode(config: dict) -> list[Finding]:
+    return run_service_rules(config, [privileged_mode])
+
+
+def check_exposed_ports_without_mapping(config: dict) -> list[Finding]:
+    return run_service_rules(config, [exposed_ports_without_mapping])
+
+
+def check_unpinned_versions(config: dict) -> list[Finding]:
+    return run_service_rules(config, [unpinned_versions])
+
+
+def run_compose_checks(config: dict) -> list[Finding]:
+    return run_service_rules(config, COMPOSE_CHECKS)
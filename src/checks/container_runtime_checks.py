@@ -1,70 +1,71 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from typing import Iterator, Optional
 import docker
-from config import SENSITIVE_HOST_PATHS
+from config import SENSITIVE_HOST_PATHS, HOST_PATH_ALIASES, RUNTIME_INSPECT_WORKERS, RUNTIME_HOST_CONCURRENCY, DOCKER_TIMEOUT_SECONDS
+from utils.docker_fetch import create_client, list_container_summaries, iter_inspected_containers, DOCKER_ERRORS
+from utils.finding import Finding, Rule, Severity
+from utils.path_trie import HostPathMatcher
+from utils.snapshots import SnapshotStore
+from utils import profiling
 
+PRIVILEGED_CONTAINER = Rule("RT001", Severity.HIGH, "Privileged container", "Container {0} runs in privileged mode")
+NO_MEMORY_LIMIT = Rule("RT002", Severity.MEDIUM, "No memory limit", "Container {0} has no memory limit")
+NO_CPU_LIMIT = Rule("RT003", Severity.MEDIUM, "No CPU limit", "Container {0} has no CPU limit")
+HOST_NETWORK = Rule("RT004", Severity.HIGH, "Host network mode", "Container {0} uses host network")
+SENSITIVE_MOUNT = Rule("RT005", Severity.HIGH, "Sensitive host path mounted", "Container {0} mounts {1}")
+DOCKER_CONNECTION_ERROR = Rule("RT000", Severity.HIGH, "Docker connection error", "{0}")
 
-def check_privileged_containers(container) -> list[dict]:
+
+def check_privileged_containers(container) -> list[Finding]:
     findings = []
     host_config = container.attrs.get("HostConfig", {})
     if host_config.get("Privileged"):
-        findings.append({
-            "severity": "HIGH",
-            "check": "Privileged container",
-            "details": f"Container {container.name} runs in privileged mode"
-        })
+        findings.append(Finding(PRIVILEGED_CONTAINER, (container.name,)))
     return findings
 
 
-def check_resource_limits(container) -> list[dict]:
+def check_resource_limits(container) -> list[Finding]:
     findings = []
     host_config = container.attrs.get("HostConfig", {})
     
     memory = host_config.get("Memory", 0)
     if memory == 0:
-        findings.append({
-            "severity": "MEDIUM",
-            "check": "No memory limit",
-            "details": f"Container {container.name} has no memory limit"
-        })
+        findings.append(Finding(NO_MEMORY_LIMIT, (container.name,)))
     
     cpu_shares = host_config.get("CpuShares", 0)
     nano_cpus = host_config.get("NanoCpus", 0)
     if cpu_shares == 0 and nano_cpus == 0:
-        findings.append({
-            "severity": "MEDIUM",
-            "check": "No CPU limit",
-            "details": f"Container {container.name} has no CPU limit"
-        })
+        findings.append(Finding(NO_CPU_LIMIT, (container.name,)))
     
     return findings
 
 
-def check_host_network(container) -> list[dict]:
+def check_host_network(container) -> list[Finding]:
     findings = []
     host_config = container.attrs.get("HostConfig", {})
     network_mode = host_config.get("NetworkMode", "")
     if network_mode == "host":
-        findings.append({
-            "severity": "HIGH",
-            "check": "Host network mode",
-            "details": f"Container {container.name} uses host network"
-        })
+        findings.append(Finding(HOST_NETWORK, (container.name,)))
     return findings
 
 
-def check_sensitive_mounts(container) -> list[dict]:
+@lru_cache(maxsize=1)
+def sensitive_path_matcher() -> HostPathMatcher:
+    return HostPathMatcher(SENSITIVE_HOST_PATHS, HOST_PATH_ALIASES)
+
+
+def check_sensitive_mounts(container) -> list[Finding]:
     findings = []
     mounts = container.attrs.get("Mounts", [])
+    matcher = sensitive_path_matcher()
     
     for mount in mounts:
         source = mount.get("Source", "")
-        for sensitive_path in SENSITIVE_HOST_PATHS:
-            if source == sensitive_path or (source.startswith(sensitive_path + "/") and sensitive_path != "/"):
-                findings.append({
-                    "severity": "HIGH",
-                    "check": "Sensitive host path mounted",
-                    "details": f"Container {container.name} mounts {source}"
-                })
-                break
+        if source and matcher.match(source) is not None:
+            findings.append(Finding(SENSITIVE_MOUNT, (container.name, source)))
     
     return findings
 
@@ -77,20 +78,242 @@ RUNTIME_CHECKS = [
 ]
 
 
-def run_runtime_checks() -> list[dict]:
+WATCH_RESCAN_ACTIONS = ["create", "start", "update"]
+WATCH_DROP_ACTIONS = ["destroy"]
+
+
+def _docker_error(details: str) -> Finding:
+    return Finding(DOCKER_CONNECTION_ERROR, (details,))
+
+
+def iter_container_checks(container) -> Iterator[Finding]:
+    for check in RUNTIME_CHECKS:
+        yield from check(container)
+
+
+def _run_checks(container) -> list[Finding]:
+    return list(iter_container_checks(container))
+
+
+def run_container_checks(container) -> list[Finding]:
+    findings = profiling.measure(profiling.RUNNER, "run_runtime_checks", _run_checks, container)
+    short_id = (container.id or "")[:12] or None
+    for finding in findings:
+        finding.container = short_id
+    return findings
+
+
+def _check_inspected(summary: dict, container, snapshots: Optional[SnapshotStore]) -> list[Finding]:
+    if snapshots is None:
+        return run_container_checks(container)
+    findings = snapshots.reuse(summary, container.attrs)
+    if findings is None:
+        findings = run_container_checks(container)
+        snapshots.put(summary, container.attrs, findings)
+    return findings
+
+
+def iter_scan_containers(
+    client,
+    summaries: list[dict],
+    workers: int = RUNTIME_INSPECT_WORKERS,
+    snapshots: Optional[SnapshotStore] = None
+) -> Iterator[tuple[str, list[Finding]]]:
+    ready = {}
+    pending = list(range(len(summaries)))
+    if snapshots is not None:
+        # Containers whose list summary matches their snapshot are not
+        # inspected at all.
+        pending = []
+        for index, summary in enumerate(summaries):
+            findings = snapshots.lookup(summary)
+            if findings is None:
+                pending.append(index)
+            else:
+                ready[index] = (summary["Id"], findings)
+
+    # Checks run as each inspect completes; results are released in list
+    # order as soon as every earlier container has been handled.
+    next_index = 0
+
+    def release() -> list[tuple[str, list[Finding]]]:
+        nonlocal next_index
+        released = []
+        while next_index in ready:
+            result = ready.pop(next_index)
+            if result is not None:
+                released.append(result)
+            next_index += 1
+        return released
+
+    yield from release()
+    inspected = iter_inspected_containers(client, [summaries[i] for i in pending], workers=workers)
+    for position, container in inspected:
+        index = pending[position]
+        if container is None:
+            ready[index] = None
+        elif isinstance(container, Exception):
+            finding = _docker_error(f"Container inspection failed: {container}")
+            finding.container = summaries[index]["Id"][:12]
+            ready[index] = (summaries[index]["Id"], [finding])
+        else:
+            ready[index] = (container.id, _check_inspected(summaries[index], container, snapshots))
+        yield from release()
+
+
+def scan_containers(
+    client,
+    summaries: list[dict],
+    workers: int = RUNTIME_INSPECT_WORKERS
+) -> list[tuple[str, list[Finding]]]:
+    return list(iter_scan_containers(client, summaries, workers=workers))
+
+
+def iter_runtime_checks(
+    base_url: Optional[str] = None,
+    workers: int = RUNTIME_INSPECT_WORKERS,
+    timeout: int = DOCKER_TIMEOUT_SECONDS,
+    snapshots: Optional[SnapshotStore] = None
+) -> Iterator[list[Finding]]:
     try:
-        client = docker.from_env()
-        containers = client.containers.list()
-    except docker.errors.DockerException as e:
-        return [{
-            "severity": "HIGH",
-            "check": "Docker connection error",
-            "details": f"Cannot connect to Docker: {str(e)}"
-        }]
-    
+        client = create_client(base_url, workers=workers, timeout=timeout)
+        summaries = list_container_summaries(client)
+    except DOCKER_ERRORS as e:
+        yield [_docker_error(f"Cannot connect to Docker: {str(e)}")]
+        return
+
+    try:
+        for _, found in iter_scan_containers(client, summaries, workers=workers, snapshots=snapshots):
+            yield found
+    except DOCKER_ERRORS as e:
+        yield [_docker_error(f"Container inspection failed: {str(e)}")]
+    finally:
+        client.close()
+
+
+def run_runtime_checks(
+    base_url: Optional[str] = None,
+    workers: int = RUNTIME_INSPECT_WORKERS,
+    timeout: int = DOCKER_TIMEOUT_SECONDS,
+    snapshots: Optional[SnapshotStore] = None
+) -> list[Finding]:
     findings = []
-    for container in containers:
-        for check in RUNTIME_CHECKS:
-            findings.extend(check(container))
-    
+    for found in iter_runtime_checks(base_url, workers=workers, timeout=timeout, snapshots=snapshots):
+        findings.extend(found)
     return findings
+
+
+def _scan_host(
+    base_url: str,
+    workers: int,
+    timeout: int,
+    stop: Optional[threading.Event] = None,
+    snapshots: Optional[SnapshotStore] = None
+) -> list[Finding]:
+    findings = []
+    scan = iter_runtime_checks(base_url, workers=workers, timeout=timeout, snapshots=snapshots)
+    try:
+        for found in scan:
+            findings.extend(found)
+            if stop is not None and stop.is_set():
+                break
+    finally:
+        scan.close()
+    for finding in findings:
+        finding.host = base_url
+    return findings
+
+
+def iter_multi_host_checks(
+    hosts: list[str],
+    workers: int = RUNTIME_INSPECT_WORKERS,
+    concurrency: int = RUNTIME_HOST_CONCURRENCY,
+    timeout: int = DOCKER_TIMEOUT_SECONDS,
+    snapshots: Optional[SnapshotStore] = None
+) -> Iterator[list[Finding]]:
+    if not hosts:
+        return
+    # Each host has its own client and pool; results are released as each
+    # host finishes, so a slow or unreachable daemon only delays itself.
+    stop = threading.Event()
+    executor = ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(hosts))))
+    try:
+        futures = [executor.submit(_scan_host, host, workers, timeout, stop, snapshots) for host in hosts]
+        for future in as_completed(futures):
+            yield future.result()
+    finally:
+        # Stopped early: hosts not started are dropped and running ones
+        # give up after their current container.
+        stop.set()
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def run_multi_host_checks(
+    hosts: list[str],
+    workers: int = RUNTIME_INSPECT_WORKERS,
+    concurrency: int = RUNTIME_HOST_CONCURRENCY,
+    timeout: int = DOCKER_TIMEOUT_SECONDS,
+    snapshots: Optional[SnapshotStore] = None
+) -> list[Finding]:
+    findings = []
+    scan = iter_multi_host_checks(
+        hosts, workers=workers, concurrency=concurrency, timeout=timeout, snapshots=snapshots
+    )
+    for found in scan:
+        findings.extend(found)
+    return findings
+
+
+def watch_runtime_checks(
+    base_url: Optional[str] = None,
+    workers: int = RUNTIME_INSPECT_WORKERS
+) -> Iterator[list[Finding]]:
+    try:
+        client = create_client(base_url, workers=workers)
+        # Replay events from before the initial scan so nothing that changes
+        # while it runs is missed; rescans are deduplicated below.
+        since = int(time.time())
+        summaries = list_container_summaries(client)
+        initial = scan_containers(client, summaries, workers=workers)
+        events = client.events(
+            since=since,
+            decode=True,
+            filters={"type": "container", "event": WATCH_RESCAN_ACTIONS + WATCH_DROP_ACTIONS}
+        )
+    except DOCKER_ERRORS as e:
+        yield [_docker_error(f"Cannot connect to Docker: {str(e)}")]
+        return
+
+    known = {}
+    batch = []
+    for container_id, found in initial:
+        known[container_id] = found
+        batch.extend(found)
+
+    try:
+        yield batch
+        for event in events:
+            action = event.get("Action") or event.get("status", "")
+            container_id = event.get("Actor", {}).get("ID") or event.get("id")
+            if not container_id:
+                continue
+            if action in WATCH_DROP_ACTIONS:
+                known.pop(container_id, None)
+                continue
+            if action not in WATCH_RESCAN_ACTIONS:
+                continue
+            try:
+                container = client.containers.get(container_id)
+            except docker.errors.NotFound:
+                continue
+            found = run_container_checks(container)
+            previous = known.get(container_id, [])
+            known[container_id] = found
+            new = [finding for finding in found if finding not in previous]
+            if new:
+                yield new
+    except DOCKER_ERRORS as e:
+        yield [_docker_error(f"Docker event stream failed: {str(e)}")]
+    finally:
+        events.close()
+        client.close()
@@ -1,87 +1,161 @@
-from config import SENSITIVE_PORTS
+from typing import Callable, NamedTuple, Optional
+from utils.file_loader import Instruction
+from utils.finding import Finding, Rule, Severity
+from utils.matchers import compile_any
+from utils.ports import parse_expose, sensitive_port_index
 
+LATEST_TAG = Rule("DF001", Severity.HIGH, "Latest tag detected", "Line {line}: FROM {0}")
+MISSING_USER = Rule("DF002", Severity.MEDIUM, "Missing USER directive", "Container runs as root")
+SENSITIVE_PORT = Rule("DF003", Severity.HIGH, "Sensitive port exposed", "Line {line}: Port {0}")
+ADD_INSTEAD_OF_COPY = Rule("DF004", Severity.LOW, "ADD instead of COPY", "Line {line}: Use COPY for local files")
+MISSING_HEALTHCHECK = Rule("DF005", Severity.LOW, "Missing HEALTHCHECK", "No health monitoring configured")
 
-def check_latest_tag(lines: list[str]) -> list[dict]:
-    findings = []
-    for i, line in enumerate(lines):
-        stripped = line.strip()
-        if stripped.startswith("FROM "):
-            image = stripped[5:].split()[0]
-            if ":latest" in image or ":" not in image:
-                findings.append({
-                    "severity": "HIGH",
-                    "check": "Latest tag detected",
-                    "details": f"Line {i+1}: {stripped}"
-                })
-    return findings
+
+class DockerfileRule(NamedTuple):
+    name: str
+    keywords: tuple[str, ...]
+    on_instruction: Optional[Callable[[Instruction, dict], list[Finding]]] = None
+    on_finish: Optional[Callable[[dict], list[Finding]]] = None
+
+
+def _image_reference(args: str) -> str:
+    for token in args.split():
+        if not token.startswith("--"):
+            return token
+    return ""
 
 
-def check_missing_user(lines: list[str]) -> list[dict]:
-    has_user = any(line.strip().startswith("USER ") for line in lines)
-    if not has_user:
-        return [{
-            "severity": "MEDIUM",
-            "check": "Missing USER directive",
-            "details": "Container runs as root"
-        }]
+def latest_tag_on_from(ins: Instruction, state: dict) -> list[Finding]:
+    stage_names = state.setdefault("stage_names", set())
+    tokens = ins.args.split()
+    image = _image_reference(ins.args)
+    if len(tokens) >= 2 and tokens[-2].upper() == "AS":
+        stage_names.add(tokens[-1].lower())
+    # Stages built earlier in the same file and the empty base image
+    # carry no registry tag of their own.
+    if not image or image == "scratch" or image.lower() in stage_names:
+        return []
+    if ":latest" in image or ":" not in image:
+        return [Finding(LATEST_TAG, (ins.args,), line=ins.start_line)]
     return []
 
 
-def check_sensitive_ports(lines: list[str]) -> list[dict]:
-    findings = []
-    for i, line in enumerate(lines):
-        stripped = line.strip()
-        if stripped.startswith("EXPOSE "):
-            ports_str = stripped[7:]
-            for port_str in ports_str.split():
-                try:
-                    port = int(port_str.split("/")[0])
-                    if port in SENSITIVE_PORTS:
-                        findings.append({
-                            "severity": "HIGH",
-                            "check": "Sensitive port exposed",
-                            "details": f"Line {i+1}: Port {port}"
-                        })
-                except ValueError:
-                    continue
-    return findings
+def missing_user_on_user(ins: Instruction, state: dict) -> list[Finding]:
+    if ins.args:
+        state["seen"] = True
+    return []
 
 
-def check_add_instead_of_copy(lines: list[str]) -> list[dict]:
+def missing_user_on_finish(state: dict) -> list[Finding]:
+    if not state.get("seen"):
+        return [Finding(MISSING_USER)]
+    return []
+
+
+def sensitive_ports_on_expose(ins: Instruction, state: dict) -> list[Finding]:
     findings = []
-    for i, line in enumerate(lines):
-        stripped = line.strip()
-        if stripped.startswith("ADD ") and not any(x in stripped for x in [".tar", ".gz", ".zip", "http"]):
-            findings.append({
-                "severity": "LOW",
-                "check": "ADD instead of COPY",
-                "details": f"Line {i+1}: Use COPY for local files"
-            })
+    index = sensitive_port_index()
+    for token in ins.args.split():
+        port_range = parse_expose(token)
+        if port_range is None:
+            continue
+        for match in index.overlaps(*port_range):
+            findings.append(Finding(SENSITIVE_PORT, (match.label(),), line=ins.start_line))
     return findings
 
 
-def check_missing_healthcheck(lines: list[str]) -> list[dict]:
-    has_healthcheck = any(line.strip().startswith("HEALTHCHECK ") for line in lines)
-    if not has_healthcheck:
-        return [{
-            "severity": "LOW",
-            "check": "Missing HEALTHCHECK",
-            "details": "No health monitoring configured"
-        }]
+ADD_EXPECTED_SOURCES = compile_any([".tar", ".gz", ".zip", "http"])
+
+
+def add_instead_of_copy_on_add(ins: Instruction, state: dict) -> list[Finding]:
+    if not ADD_EXPECTED_SOURCES.search(ins.args):
+        return [Finding(ADD_INSTEAD_OF_COPY, (ins.args,), line=ins.start_line)]
+    return []
+
+
+def missing_healthcheck_on_healthcheck(ins: Instruction, state: dict) -> list[Finding]:
+    if ins.args:
+        state["seen"] = True
+    return []
+
+
+def missing_healthcheck_on_finish(state: dict) -> list[Finding]:
+    if not state.get("seen"):
+        return [Finding(MISSING_HEALTHCHECK)]
     return []
 
 
+LATEST_TAG_RULE = DockerfileRule("latest_tag", ("FROM",), latest_tag_on_from)
+MISSING_USER_RULE = DockerfileRule("missing_user", ("USER",), missing_user_on_user, missing_user_on_finish)
+SENSITIVE_PORTS_RULE = DockerfileRule("sensitive_ports", ("EXPOSE",), sensitive_ports_on_expose)
+ADD_INSTEAD_OF_COPY_RULE = DockerfileRule("add_instead_of_copy", ("ADD",), add_instead_of_copy_on_add)
+MISSING_HEALTHCHECK_RULE = DockerfileRule(
+    "missing_healthcheck", ("HEALTHCHECK",), missing_healthcheck_on_healthcheck, missing_healthcheck_on_finish
+)
+
 DOCKERFILE_CHECKS = [
-    check_latest_tag,
-    check_missing_user,
-    check_sensitive_ports,
-    check_add_instead_of_copy,
-    check_missing_healthcheck,
+    LATEST_TAG_RULE,
+    MISSING_USER_RULE,
+    SENSITIVE_PORTS_RULE,
+    ADD_INSTEAD_OF_COPY_RULE,
+    MISSING_HEALTHCHECK_RULE,
 ]
 
 
-def run_dockerfile_checks(lines: list[str]) -> list[dict]:
+def build_dispatch(rules: list[DockerfileRule]) -> dict[str, list[tuple[int, Callable]]]:
+    dispatch = {}
+    for index, rule in enumerate(rules):
+        if rule.on_instruction is None:
+            continue
+        for keyword in rule.keywords:
+            dispatch.setdefault(keyword.upper(), []).append((index, rule.on_instruction))
+    return dispatch
+
+
+def run_rules(instructions: list[Instruction], rules: list[DockerfileRule]) -> list[Finding]:
+    dispatch = build_dispatch(rules)
+    states = [{} for _ in rules]
+    per_rule = [[] for _ in rules]
+
+    for ins in instructions:
+        handlers = dispatch.get(ins.keyword)
+        if not handlers:
+            continue
+        for index, handler in handlers:
+            found = handler(ins, states[index])
+            if found:
+                per_rule[index].extend(found)
+
+    for index, rule in enumerate(rules):
+        if rule.on_finish is not None:
+            per_rule[index].extend(rule.on_finish(states[index]))
+
+    # Concatenate per rule so the report order matches the registry order.
     findings = []
-    for check in DOCKERFILE_CHECKS:
-        findings.extend(check(lines))
+    for found in per_rule:
+        findings.extend(found)
     return findings
+
+
+def check_latest_tag(instructions: list[Instruction]) -> list[Finding]:
+    return run_rules(instructions, [LATEST_TAG_RULE])
+
+
+def check_missing_user(instructions: list[Instruction]) -> list[Finding]:
+    return run_rules(instructions, [MISSING_USER_RULE])
+
+
+def check_sensitive_ports(instructions: list[Instruction]) -> list[Finding]:
+    return run_rules(instructions, [SENSITIVE_PORTS_RULE])
+
+
+def check_add_instead_of_copy(instructions: list[Instruction]) -> list[Finding]:
+    return run_rules(instructions, [ADD_INSTEAD_OF_COPY_RULE])
+
+
+def check_missing_healthcheck(instructions: list[Instruction]) -> list[Finding]:
+    return run_rules(instructions, [MISSING_HEALTHCHECK_RULE])
+
+
+def run_dockerfile_checks(instructions: list[Instruction]) -> list[Finding]:
+    return run_rules(instructions, DOCKERFILE_CHECKS)
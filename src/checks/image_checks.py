@@ -0,0 +1,52 @@
+from checks.dockerfile_checks import (
+    DOCKERFILE_CHECKS, LATEST_TAG, MISSING_USER, SENSITIVE_PORT, MISSING_HEALTHCHECK, run_rules
+)
+from utils.file_loader import Instruction
+from utils.finding import Finding, Rule, Severity
+from utils.image_tar import ImageConfig
+
+IMAGE_LATEST_TAG = Rule("IM001", Severity.HIGH, "Latest tag detected", "Image {0} uses latest or no tag")
+IMAGE_MISSING_USER = Rule("IM002", Severity.MEDIUM, "Missing USER directive", "Image {0} runs as root")
+IMAGE_SENSITIVE_PORT = Rule("IM003", Severity.HIGH, "Sensitive port exposed", "Image {1} exposes port {0}")
+IMAGE_MISSING_HEALTHCHECK = Rule(
+    "IM005", Severity.LOW, "Missing HEALTHCHECK", "Image {0} has no health monitoring configured"
+)
+
+# Dockerfile rules that still apply once an image is built, and the rule
+# each one reports as when it fires on an image config.
+IMAGE_RULES = {
+    LATEST_TAG.id: IMAGE_LATEST_TAG,
+    MISSING_USER.id: IMAGE_MISSING_USER,
+    SENSITIVE_PORT.id: IMAGE_SENSITIVE_PORT,
+    MISSING_HEALTHCHECK.id: IMAGE_MISSING_HEALTHCHECK,
+}
+IMAGE_CHECK_NAMES = ["latest_tag", "missing_user", "sensitive_ports", "missing_healthcheck"]
+
+
+def image_instructions(image: ImageConfig) -> list[Instruction]:
+    config = image.config.get("config") or image.config.get("Config") or {}
+    instructions = []
+
+    def add(keyword: str, args: str) -> None:
+        instructions.append(Instruction(keyword, args, 0, 0, 0))
+
+    # Only tagged images have a reference for the latest-tag rule to judge.
+    if ":" in image.name or "/" in image.name:
+        add("FROM", image.name)
+    if config.get("User"):
+        add("USER", config["User"])
+    for port in config.get("ExposedPorts") or {}:
+        add("EXPOSE", port)
+    healthcheck = config.get("Healthcheck") or {}
+    if healthcheck.get("Test"):
+        add("HEALTHCHECK", " ".join(healthcheck["Test"]))
+    return instructions
+
+
+def run_image_checks(image: ImageConfig) -> list[Finding]:
+    # Looked up at call time so the rules are the live registry entries.
+    rules = [rule for rule in DOCKERFILE_CHECKS if rule.name in IMAGE_CHECK_NAMES]
+    return [
+        Finding(IMAGE_RULES[finding.rule.id], finding.args + (image.name,))
+        for finding in run_rules(image_instructions(image), rules)
+    ]
@@ -0,0 +1,168 @@
+import hashlib
+import json
+import os
+from typing import Optional
+from checks import dockerfile_checks, compose_checks
+from checks.dockerfile_checks import DockerfileRule
+from utils.cache import default_cache_dir
+from utils.file_loader import Instruction
+from utils.finding import Finding, Rule, Severity, RULES
+from utils.matchers import compile_accessor, compile_predicate
+
+DOCKERFILE = "dockerfile"
+COMPOSE = "compose"
+RUNTIME = "runtime"
+PACK_TARGETS = (DOCKERFILE, COMPOSE, RUNTIME)
+PACK_FORMAT_VERSION = 1
+
+INSTALLED_PACKS = []
+
+
+def _parse_pack(path: str, data: bytes):
+    if path.endswith(".toml"):
+        try:
+            import tomllib
+        except ImportError:
+            import tomli as tomllib
+        return tomllib.loads(data.decode())
+    import yaml
+    return yaml.safe_load(data)
+
+
+def _normalize_rule(raw: dict, path: str) -> dict:
+    if not isinstance(raw, dict):
+        raise ValueError(f"{path}: each rule must be a mapping")
+    rule_id = str(raw.get("id") or "")
+    target = raw.get("target")
+    if not rule_id:
+        raise ValueError(f"{path}: rule without an id")
+    if target not in PACK_TARGETS:
+        raise ValueError(f"{path}: rule {rule_id} target must be one of {', '.join(PACK_TARGETS)}")
+    severity = str(raw.get("severity", "MEDIUM")).upper()
+    if severity not in Severity.__members__:
+        raise ValueError(f"{path}: rule {rule_id} has unknown severity {severity}")
+    match = raw.get("match")
+    if not isinstance(match, dict):
+        raise ValueError(f"{path}: rule {rule_id} needs a match mapping")
+    instructions = raw.get("instruction") or raw.get("instructions") or []
+    if isinstance(instructions, str):
+        instructions = [instructions]
+    if target == DOCKERFILE and not instructions:
+        raise ValueError(f"{path}: dockerfile rule {rule_id} needs an instruction")
+    title = str(raw.get("title") or rule_id)
+    return {
+        "id": rule_id,
+        "target": target,
+        "severity": severity,
+        "title": title,
+        "message": str(raw.get("message") or title),
+        "instructions": [str(keyword).upper() for keyword in instructions],
+        "field": str(raw.get("field") or ""),
+        "absent": bool(raw.get("absent")),
+        "match": match,
+    }
+
+
+def load_rule_specs(path: str, cache_dir: Optional[str] = None) -> tuple[str, list[dict]]:
+    with open(path, "rb") as f:
+        data = f.read()
+    digest = hashlib.sha256(b"%d\0" % PACK_FORMAT_VERSION + data).hexdigest()
+    cache_path = os.path.join(cache_dir or default_cache_dir(), "rulepacks", f"{digest}.json")
+    try:
+        with open(cache_path, "r") as f:
+            return digest, json.load(f)
+    except (OSError, ValueError):
+        pass
+
+    document = _parse_pack(path, data) or {}
+    raw_rules = document.get("rules") if isinstance(document, dict) else None
+    if not isinstance(raw_rules, list):
+        raise ValueError(f"{path}: expected a top-level 'rules' list")
+    specs = [_normalize_rule(raw, path) for raw in raw_rules]
+    # Every predicate is compiled once up front so a bad regex fails the
+    # load rather than the scan.
+    for spec in specs:
+        compile_predicate(spec["match"])
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(specs, f)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
+    return digest, specs
+
+
+def _register(spec: dict) -> Rule:
+    existing = RULES.get(spec["id"])
+    if existing is not None and (existing.title, existing.template) != (spec["title"], spec["message"]):
+        raise ValueError(f"Rule id {spec['id']} is already defined")
+    return Rule(spec["id"], Severity(spec["severity"]), spec["title"], spec["message"])
+
+
+def _dockerfile_rule(spec: dict, rule: Rule) -> DockerfileRule:
+    predicate = compile_predicate(spec["match"])
+    name = f"pack:{rule.id}"
+    if spec["absent"]:
+        def on_instruction(ins: Instruction, state: dict) -> list[Finding]:
+            if predicate(ins.args) is not None:
+                state["seen"] = True
+            return []
+
+        def on_finish(state: dict) -> list[Finding]:
+            return [] if state.get("seen") else [Finding(rule)]
+        return DockerfileRule(name, tuple(spec["instructions"]), on_instruction, on_finish)
+
+    def on_match(ins: Instruction, state: dict) -> list[Finding]:
+        found = predicate(ins.args)
+        return [] if found is None else [Finding(rule, (found,), line=ins.start_line)]
+    return DockerfileRule(name, tuple(spec["instructions"]), on_match)
+
+
+def _compose_rule(spec: dict, rule: Rule):
+    predicate = compile_predicate(spec["match"])
+    access = compile_accessor(spec["field"])
+
+    def check(name: str, service: dict) -> list[Finding]:
+        found = predicate(access(service))
+        return [] if found is None else [Finding(rule, (found,), service=name)]
+    check.__name__ = f"pack:{rule.id}"
+    return check
+
+
+def _runtime_rule(spec: dict, rule: Rule):
+    predicate = compile_predicate(spec["match"])
+    access = compile_accessor(spec["field"])
+
+    def check(container) -> list[Finding]:
+        found = predicate(access(container.attrs))
+        return [] if found is None else [Finding(rule, (found, container.name))]
+    check.__name__ = f"pack:{rule.id}"
+    return check
+
+
+def compile_rule_packs(paths: list[str], cache_dir: Optional[str] = None) -> tuple[list[str], dict[str, list]]:
+    digests = []
+    compiled = {target: [] for target in PACK_TARGETS}
+    builders = {DOCKERFILE: _dockerfile_rule, COMPOSE: _compose_rule, RUNTIME: _runtime_rule}
+    for path in paths:
+        digest, specs = load_rule_specs(path, cache_dir)
+        digests.append(digest)
+        for spec in specs:
+            compiled[spec["target"]].append(builders[spec["target"]](spec, _register(spec)))
+    return digests, compiled
+
+
+def install_rule_packs(paths: list[str], include_runtime: bool = False, cache_dir: Optional[str] = None) -> None:
+    installed = {path for path, _ in INSTALLED_PACKS}
+    paths = [path for path in paths if path not in installed]
+    if not paths:
+        return
+    digests, compiled = compile_rule_packs(paths, cache_dir)
+    dockerfile_checks.DOCKERFILE_CHECKS.extend(compiled[DOCKERFILE])
+    compose_checks.COMPOSE_CHECKS.extend(compiled[COMPOSE])
+    if include_runtime:
+        from checks import container_runtime_checks
+        container_runtime_checks.RUNTIME_CHECKS.extend(compiled[RUNTIME])
+    INSTALLED_PACKS.extend(zip(paths, digests))
@@ -1,4 +1,29 @@
 SENSITIVE_PORTS = [22, 3389, 5432, 3306, 6379, 27017, 9200]
 SENSITIVE_HOST_PATHS = ["/", "/etc", "/var/run/docker.sock", "/proc", "/sys"]
+HOST_PATH_ALIASES = {"/var/run": "/run", "/var/lock": "/run/lock"}
 MAX_MEMORY_MB = 2048
 MAX_CPU_SHARES = 1024
+
+DOCKERFILE_PATTERNS = ["Dockerfile*", "*.dockerfile"]
+COMPOSE_PATTERNS = ["docker-compose*.yml", "docker-compose*.yaml", "compose*.yaml", "compose*.yml"]
+SKIP_DIRS = [".git", ".hg", ".svn", "node_modules", "__pycache__", ".venv", "venv"]
+RUNTIME_INSPECT_WORKERS = 16
+DOCKER_TIMEOUT_SECONDS = 30
+RUNTIME_HOST_CONCURRENCY = 8
+
+RULESET_VERSION = "5"
+CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+SERVE_ADDRESS = "127.0.0.1:8765"
+SERVE_CACHE_ENTRIES = 4096
+SERVE_MAX_BODY_BYTES = 8 * 1024 * 1024
+
+REPORT_PAGE_SIZE = 1000
+SUMMARY_TOP_N = 10
+
+INSPECT_DUMP_CHUNK_BYTES = 1024 * 1024
+INSPECT_DUMP_MAX_RECORD_BYTES = 16 * 1024 * 1024
+INSPECT_DUMP_BATCH_SIZE = 1000
+
+RUNTIME_SNAPSHOT_TTL_SECONDS = 7 * 24 * 3600
+RUNTIME_SNAPSHOT_REVALIDATE_SECONDS = 3600
@@ -1,10 +1,23 @@
 import argparse
+import os
 import sys
-from checks.dockerfile_checks import run_dockerfile_checks
-from checks.compose_checks import run_compose_checks
-from checks.container_runtime_checks import run_runtime_checks
-from utils.file_loader import load_dockerfile, load_compose_file
-from utils.report import print_findings, print_banner
+from contextlib import closing
+from utils.discovery import discover_files, discover_changed_files
+from utils.cache import open_cache
+from scanner import (
+    iter_scan_files, iter_inspect_dumps, cached_scan_file, scan_image_tar, ruleset_fingerprint,
+    runtime_ruleset_fingerprint, DOCKERFILE, COMPOSE
+)
+from config import (
+    RUNTIME_INSPECT_WORKERS, RUNTIME_HOST_CONCURRENCY, DOCKER_TIMEOUT_SECONDS, SERVE_ADDRESS, SUMMARY_TOP_N
+)
+from utils.finding import Severity
+from utils.report import print_banner, create_writer
+from utils import profiling
+
+
+class FailFast(Exception):
+    pass
 
 
 def parse_args():
@@ -17,64 +30,394 @@ def parse_args():
     )
     parser.add_argument(
         "--compose",
-        help="Path to docker-compose file to scan"
+        action="append",
+        help="Path to docker-compose file to scan; repeat to merge override files in order, like docker compose -f"
+    )
+    parser.add_argument(
+        "--path",
+        help="Directory to scan recursively for Dockerfiles and compose files"
+    )
+    parser.add_argument(
+        "--changed-since",
+        metavar="REF",
+        help="Only scan Dockerfiles and compose files changed since this git ref, plus compose files that "
+             "build a changed Dockerfile (scans --path, default: current directory)"
+    )
+    parser.add_argument(
+        "--image-tar",
+        action="append",
+        help="Image archive from docker save or an OCI layout tarball ('-' for stdin); repeat to scan several"
+    )
+    parser.add_argument(
+        "--inspect-dump",
+        action="append",
+        metavar="PATH",
+        help="Run the runtime checks on saved docker inspect output: a JSON array or JSON Lines file, "
+             "optionally .gz ('-' for stdin); repeat to scan several in parallel"
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help="Number of worker processes for --path and --inspect-dump scans (default: CPU count)"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Do not read or write the on-disk result cache for file scans or the container snapshots for --runtime"
+    )
+    parser.add_argument(
+        "--cache-dir",
+        help="Directory for the result cache (default: ~/.cache/docker-scanner)"
     )
     parser.add_argument(
         "--runtime",
         action="store_true",
         help="Scan running containers"
     )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="With --runtime: after the first scan, follow Docker events and report new findings as they appear"
+    )
+    parser.add_argument(
+        "--inspect-workers",
+        type=int,
+        default=RUNTIME_INSPECT_WORKERS,
+        help=f"Concurrent container inspect requests for --runtime (default: {RUNTIME_INSPECT_WORKERS})"
+    )
+    parser.add_argument(
+        "--docker-host",
+        action="append",
+        help="Docker daemon endpoint for --runtime, e.g. unix:///var/run/docker.sock or tcp://host:2376; repeat to scan several"
+    )
+    parser.add_argument(
+        "--hosts-file",
+        help="File listing Docker daemon endpoints for --runtime, one per line (# starts a comment)"
+    )
+    parser.add_argument(
+        "--host-concurrency",
+        type=int,
+        default=RUNTIME_HOST_CONCURRENCY,
+        help=f"Docker hosts scanned at the same time (default: {RUNTIME_HOST_CONCURRENCY})"
+    )
+    parser.add_argument(
+        "--host-timeout",
+        type=int,
+        default=DOCKER_TIMEOUT_SECONDS,
+        help=f"Seconds to wait on each Docker API request before giving up on a host (default: {DOCKER_TIMEOUT_SECONDS})"
+    )
     parser.add_argument(
         "--json",
         action="store_true",
-        help="Output results as JSON"
+        help="Output results as JSON (same as --format json)"
+    )
+    parser.add_argument(
+        "--format",
+        choices=["table", "json", "jsonl", "sarif"],
+        default=None,
+        help="Output format; jsonl and sarif are written incrementally as findings arrive"
+    )
+    parser.add_argument(
+        "--summary",
+        action="store_true",
+        help="Report counts grouped by rule with the top rules per severity instead of every finding (table or json)"
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=SUMMARY_TOP_N,
+        help=f"Rules listed per severity with --summary (default: {SUMMARY_TOP_N})"
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--max-findings",
+        type=int,
+        help="List at most this many findings in table or json output; the rest are counted but not shown"
+    )
+    parser.add_argument(
+        "--rules",
+        action="append",
+        metavar="PACK",
+        help="Load an extra YAML or TOML rule pack; repeat for several"
+    )
+    parser.add_argument(
+        "--baseline",
+        metavar="FILE",
+        help="Suppress findings whose fingerprint is recorded in this baseline; exit 1 only on new findings"
+    )
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="With --baseline: rewrite the baseline to the findings of this run"
+    )
+    parser.add_argument(
+        "--fail-fast",
+        nargs="?",
+        const="LOW",
+        type=str.upper,
+        choices=[severity.value for severity in Severity],
+        metavar="SEVERITY",
+        help="Stop scanning at the first finding at or above SEVERITY (default: LOW, i.e. any finding); "
+             "the exit code then only reflects findings at that level"
+    )
+    parser.add_argument(
+        "--serve",
+        nargs="?",
+        const=SERVE_ADDRESS,
+        metavar="ADDRESS",
+        help=f"Run a scan server on HOST:PORT or unix:/path/to.sock instead of scanning (default: {SERVE_ADDRESS})"
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="table",
+        choices=["table", "json", "prometheus"],
+        help="Record time, calls and findings per rule and scan phase; printed to stderr (default: table)"
+    )
+    parser.add_argument(
+        "--profile-output",
+        help="Write the --profile report to this file instead, e.g. a node exporter textfile"
+    )
+    args = parser.parse_args()
+    if args.changed_since and not args.path:
+        args.path = "."
+    if args.profile_output and args.profile is None:
+        args.profile = "prometheus" if args.profile_output.endswith(".prom") else "json"
+    if args.format is None:
+        args.format = "json" if args.json else "table"
+    return args
 
 
 def main():
     args = parse_args()
     
-    if not args.json:
+    if args.rules:
+        from checks.rule_packs import install_rule_packs
+        try:
+            install_rule_packs(
+                args.rules, include_runtime=bool(args.runtime or args.inspect_dump), cache_dir=args.cache_dir
+            )
+        except Exception as e:
+            print(f"Error loading rule pack: {e}")
+            sys.exit(1)
+    
+    if args.serve:
+        from server import serve
+        try:
+            serve(args.serve)
+        except (OSError, ValueError) as e:
+            print(f"Error: Cannot serve on {args.serve}: {e}")
+            sys.exit(1)
+        return
+    
+    if args.format == "table":
         print_banner()
     
-    if not any([args.dockerfile, args.compose, args.runtime]):
-        print("Error: Specify at least one scan type (--dockerfile, --compose, --runtime)")
+    if not any([args.dockerfile, args.compose, args.path, args.image_tar, args.inspect_dump, args.runtime]):
+        print(
+            "Error: Specify at least one scan type "
+            "(--dockerfile, --compose, --path, --image-tar, --inspect-dump, --runtime)"
+        )
+        sys.exit(1)
+    
+    if args.jobs is not None and args.jobs < 1:
+        print("Error: --jobs must be at least 1")
+        sys.exit(1)
+    
+    if args.watch and not args.runtime:
+        print("Error: --watch requires --runtime")
         sys.exit(1)
     
-    all_findings = []
+    if args.inspect_workers < 1:
+        print("Error: --inspect-workers must be at least 1")
+        sys.exit(1)
+    
+    if (args.docker_host or args.hosts_file) and not args.runtime:
+        print("Error: --docker-host and --hosts-file require --runtime")
+        sys.exit(1)
+    
+    hosts = list(args.docker_host or [])
+    if args.hosts_file:
+        from utils.docker_fetch import read_hosts_file
+        try:
+            hosts.extend(read_hosts_file(args.hosts_file))
+        except OSError as e:
+            print(f"Error: Cannot read hosts file: {e}")
+            sys.exit(1)
+        if not hosts:
+            print(f"Error: No Docker hosts listed in {args.hosts_file}")
+            sys.exit(1)
+    hosts = list(dict.fromkeys(hosts))
+    
+    if args.watch and len(hosts) > 1:
+        print("Error: --watch supports a single Docker host")
+        sys.exit(1)
+    
+    if args.host_concurrency < 1 or args.host_timeout < 1:
+        print("Error: --host-concurrency and --host-timeout must be at least 1")
+        sys.exit(1)
+    
+    if args.summary and args.format not in ("table", "json"):
+        print("Error: --summary supports table and json output")
+        sys.exit(1)
+    
+    if args.top < 1 or (args.max_findings is not None and args.max_findings < 0):
+        print("Error: --top must be at least 1 and --max-findings cannot be negative")
+        sys.exit(1)
+    
+    if args.update_baseline and not args.baseline:
+        print("Error: --update-baseline requires --baseline")
+        sys.exit(1)
+    
+    if args.fail_fast and args.update_baseline:
+        print("Error: --fail-fast cannot be combined with --update-baseline")
+        sys.exit(1)
+    
+    baseline = None
+    if args.baseline:
+        from utils.baseline import BaselineFilter, baseline_root, load_baseline
+        try:
+            baseline = BaselineFilter(load_baseline(args.baseline), baseline_root(args.baseline))
+        except OSError as e:
+            print(f"Error: Cannot read baseline: {e}")
+            sys.exit(1)
     
+    profiler = None
+    if args.profile:
+        profiler = profiling.enable(include_runtime=bool(args.runtime or args.inspect_dump))
+    
+    writer = create_writer(
+        args.format, stream_batches=args.watch, summary=args.summary, top=args.top, max_findings=args.max_findings
+    )
+    if profiler is not None:
+        writer.write = profiler.wrap(profiling.PHASE, "render", writer.write, counts_findings=False)
+        writer.close = profiler.wrap(profiling.PHASE, "render", writer.close, counts_findings=False)
+    
+    gate = Severity(args.fail_fast).rank if args.fail_fast else None
+    tripped = False
+    
+    def emit(findings):
+        if baseline is not None:
+            findings = baseline.filter(findings)
+        writer.write(findings)
+        if gate is not None and any(finding.severity.rank >= gate for finding in findings):
+            raise FailFast
+    
+    cache = None
+    if (args.dockerfile or args.compose or args.path) and not args.no_cache:
+        cache = open_cache(args.cache_dir, ruleset_fingerprint())
+    
+    try:
+        scan_sources(args, hosts, cache, emit)
+    except FailFast:
+        tripped = True
+    finally:
+        if cache is not None:
+            cache.close()
+    
+    writer.close()
+    
+    if baseline is not None:
+        if args.update_baseline:
+            from utils.baseline import save_baseline
+            save_baseline(args.baseline, baseline.seen)
+        if baseline.suppressed and args.format == "table":
+            print(f"{baseline.suppressed} known finding(s) suppressed by baseline {args.baseline}")
+    
+    if profiler is not None:
+        profiling.write_report(profiler, args.profile, args.profile_output)
+    
+    # Recording a new baseline accepts everything it found; with a
+    # --fail-fast gate only findings at its severity fail the run.
+    if args.update_baseline:
+        sys.exit(0)
+    failed = tripped if gate is not None else writer.count > 0
+    sys.exit(1 if failed else 0)
+
+
+def scan_sources(args, hosts: list[str], cache, emit) -> None:
+    # emit raises FailFast to stop early; every scan generator is closed on
+    # the way out, which cancels the file and inspect work still queued.
     if args.dockerfile:
         try:
-            lines = load_dockerfile(args.dockerfile)
-            findings = run_dockerfile_checks(lines)
-            all_findings.extend(findings)
+            findings = cached_scan_file(DOCKERFILE, args.dockerfile, cache)
         except FileNotFoundError as e:
             print(f"Error: {e}")
             sys.exit(1)
+        emit(findings)
     
     if args.compose:
         try:
-            config = load_compose_file(args.compose)
-            findings = run_compose_checks(config)
-            all_findings.extend(findings)
+            compose_file, *overrides = args.compose
+            findings = cached_scan_file(COMPOSE, compose_file, cache, tuple(overrides))
         except FileNotFoundError as e:
             print(f"Error: {e}")
             sys.exit(1)
         except Exception as e:
             print(f"Error parsing compose file: {e}")
             sys.exit(1)
+        emit(findings)
     
-    if args.runtime:
-        findings = run_runtime_checks()
-        all_findings.extend(findings)
+    if args.path:
+        try:
+            if args.changed_since:
+                dockerfiles, compose_files = discover_changed_files(args.path, args.changed_since)
+            else:
+                dockerfiles, compose_files = discover_files(args.path)
+        except (FileNotFoundError, ValueError) as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        with closing(iter_scan_files(dockerfiles, compose_files, jobs=args.jobs, cache=cache)) as batches:
+            for findings in batches:
+                emit(findings)
+    
+    for image_tar in args.image_tar or []:
+        try:
+            findings = scan_image_tar(image_tar)
+        except FileNotFoundError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        except Exception as e:
+            print(f"Error reading image archive {image_tar}: {e}")
+            sys.exit(1)
+        emit(findings)
     
-    print_findings(all_findings, as_json=args.json)
+    if args.inspect_dump:
+        for dump in args.inspect_dump:
+            if dump != "-" and not os.path.isfile(dump):
+                print(f"Error: Inspect dump not found: {dump}")
+                sys.exit(1)
+        with closing(iter_inspect_dumps(args.inspect_dump, jobs=args.jobs)) as batches:
+            for findings in batches:
+                emit(findings)
     
-    if all_findings:
-        sys.exit(1)
-    else:
-        sys.exit(0)
+    if args.runtime:
+        # The Docker SDK pulls in requests/urllib3; only load it for runtime scans.
+        from checks.container_runtime_checks import iter_runtime_checks, iter_multi_host_checks, watch_runtime_checks
+        from utils.snapshots import open_snapshot_store
+        snapshots = None
+        if not args.watch and not args.no_cache:
+            snapshots = open_snapshot_store(args.cache_dir, runtime_ruleset_fingerprint())
+        if args.watch:
+            scan = watch_runtime_checks(hosts[0] if hosts else None, workers=args.inspect_workers)
+        elif hosts:
+            scan = iter_multi_host_checks(
+                hosts, workers=args.inspect_workers, concurrency=args.host_concurrency, timeout=args.host_timeout,
+                snapshots=snapshots
+            )
+        else:
+            scan = iter_runtime_checks(workers=args.inspect_workers, timeout=args.host_timeout, snapshots=snapshots)
+        try:
+            with closing(scan):
+                for findings in scan:
+                    emit(findings)
+        except KeyboardInterrupt:
+            if not args.watch:
+                raise
+        finally:
+            # Closed after the scan generators so no host thread still uses it.
+            if snapshots is not None:
+                snapshots.close()
 
 
 if __name__ == "__main__":
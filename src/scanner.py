@@ -0,0 +1,355 @@
+import hashlib
+import os
+import zlib
+from typing import Iterator, Optional
+import config
+from checks.dockerfile_checks import run_dockerfile_checks, DOCKERFILE_CHECKS
+from checks.compose_checks import run_compose_checks, COMPOSE_CHECKS
+from checks import rule_packs
+from utils.cache import ResultCache
+from utils.file_loader import load_dockerfile, load_compose_file, parse_dockerfile, parse_compose_text
+from utils.finding import Finding, Rule, Severity
+from utils import profiling
+
+DOCKERFILE = "dockerfile"
+COMPOSE = "compose"
+IMAGE = "image"
+
+DOCKERFILE_READ_ERROR = Rule("SC001", Severity.HIGH, "Dockerfile read error", "Cannot read Dockerfile: {0}")
+COMPOSE_PARSE_ERROR = Rule("SC002", Severity.HIGH, "Compose parse error", "Cannot parse compose file: {0}")
+INSPECT_DUMP_ERROR = Rule("SC003", Severity.HIGH, "Inspect dump read error", "Cannot read inspect dump: {0}")
+
+
+def ruleset_fingerprint() -> str:
+    # Cached results are only valid for the rules and policy that produced them.
+    parts = [
+        config.RULESET_VERSION,
+        ",".join(rule.name for rule in DOCKERFILE_CHECKS),
+        ",".join(rule.__name__ for rule in COMPOSE_CHECKS),
+        repr(config.SENSITIVE_PORTS),
+        ",".join(digest for _, digest in rule_packs.INSTALLED_PACKS),
+    ]
+    return hashlib.sha256("\n".join(parts).encode()).hexdigest()[:16]
+
+
+def runtime_ruleset_fingerprint() -> str:
+    from checks.container_runtime_checks import RUNTIME_CHECKS
+    parts = [
+        config.RULESET_VERSION,
+        ",".join(check.__name__ for check in RUNTIME_CHECKS),
+        repr(config.SENSITIVE_HOST_PATHS),
+        repr(sorted(config.HOST_PATH_ALIASES.items())),
+        ",".join(digest for _, digest in rule_packs.INSTALLED_PACKS),
+    ]
+    return hashlib.sha256("\n".join(parts).encode()).hexdigest()[:16]
+
+
+def check_file(kind: str, path: str, overrides: tuple[str, ...] = ()) -> list[Finding]:
+    if kind == DOCKERFILE:
+        with profiling.timer(profiling.PHASE, "load_dockerfile"):
+            instructions = load_dockerfile(path)
+        return profiling.measure(profiling.RUNNER, "run_dockerfile_checks", run_dockerfile_checks, instructions)
+    with profiling.timer(profiling.PHASE, "load_compose_file"):
+        config = load_compose_file(path, *overrides)
+    return profiling.measure(profiling.RUNNER, "run_compose_checks", run_compose_checks, config)
+
+
+def check_content(kind: str, content: str) -> list[Finding]:
+    if kind == DOCKERFILE:
+        with profiling.timer(profiling.PHASE, "parse_dockerfile"):
+            instructions = parse_dockerfile([line.rstrip() for line in content.splitlines()])
+        return profiling.measure(profiling.RUNNER, "run_dockerfile_checks", run_dockerfile_checks, instructions)
+    with profiling.timer(profiling.PHASE, "parse_compose"):
+        config = parse_compose_text(content)
+    return profiling.measure(profiling.RUNNER, "run_compose_checks", run_compose_checks, config)
+
+
+def cached_check_file(
+    kind: str,
+    path: str,
+    cache: Optional[ResultCache] = None,
+    overrides: tuple[str, ...] = ()
+) -> list[Finding]:
+    if cache is None:
+        return check_file(kind, path, overrides)
+    try:
+        key = cache.file_key(kind, path, *overrides)
+    except OSError:
+        return check_file(kind, path, overrides)
+    findings = cache.get(key)
+    if findings is None:
+        findings = check_file(kind, path, overrides)
+        cache.put(key, findings)
+    return findings
+
+
+def _error_finding(kind: str, path: str, error: Exception) -> Finding:
+    rule = DOCKERFILE_READ_ERROR if kind == DOCKERFILE else COMPOSE_PARSE_ERROR
+    return Finding(rule, (str(error),))
+
+
+def _scan_task(task: tuple[str, str]) -> tuple[list[Finding], bool]:
+    kind, path = task
+    try:
+        return check_file(kind, path), True
+    except Exception as e:
+        return [_error_finding(kind, path, e)], False
+
+
+def scan_content(kind: str, content: str) -> tuple[list[Finding], bool]:
+    try:
+        return check_content(kind, content), True
+    except Exception as e:
+        return [_error_finding(kind, "", e)], False
+
+
+def _init_worker(pack_paths: tuple[str, ...], profile: bool) -> None:
+    # Workers started without fork re-import the modules, so rule packs and
+    # profiling wrappers are installed again, in the parent's order.
+    rule_packs.install_rule_packs(list(pack_paths))
+    if profile:
+        profiling.start_worker()
+
+
+def _tag_file(findings: list[Finding], path: str) -> list[Finding]:
+    for finding in findings:
+        finding.file = path
+    return findings
+
+
+def check_image_tar(path: str) -> list[Finding]:
+    from checks.image_checks import run_image_checks
+    from utils.image_tar import load_image_tar
+
+    with profiling.timer(profiling.PHASE, "load_image_tar"):
+        images = load_image_tar(path)
+    findings = []
+    for image in images:
+        findings.extend(profiling.measure(profiling.RUNNER, "run_image_checks", run_image_checks, image))
+    return findings
+
+
+def scan_image_tar(path: str) -> list[Finding]:
+    # Not cached: hashing a multi-GB archive would cost more than reading
+    # its manifest and config.
+    return _tag_file(check_image_tar(path), path)
+
+
+def cached_scan_file(
+    kind: str,
+    path: str,
+    cache: Optional[ResultCache] = None,
+    overrides: tuple[str, ...] = ()
+) -> list[Finding]:
+    # The cache stores findings serialised, so tagging the copy it hands
+    # back does not change what later lookups return.
+    return _tag_file(cached_check_file(kind, path, cache, overrides), path)
+
+
+def iter_scan_files(
+    dockerfiles: list[str],
+    compose_files: list[str],
+    jobs: Optional[int] = None,
+    cache: Optional[ResultCache] = None
+) -> Iterator[list[Finding]]:
+    tasks = [(DOCKERFILE, path) for path in dockerfiles]
+    tasks.extend((COMPOSE, path) for path in compose_files)
+
+    cached = {}
+    keys = {}
+    pending = []
+    for index, (kind, path) in enumerate(tasks):
+        if cache is not None:
+            try:
+                key = cache.file_key(kind, path)
+            except OSError:
+                key = None
+            if key is not None:
+                hit = cache.get(key)
+                if hit is not None:
+                    cached[index] = hit
+                    continue
+                keys[index] = key
+        pending.append(index)
+
+    # Misses come back from the pool in submission order, which is also
+    # task order, so hits and misses can be interleaved without buffering.
+    results = _run_tasks([tasks[i] for i in pending], jobs)
+    try:
+        for index, (_, path) in enumerate(tasks):
+            if index in cached:
+                findings = cached.pop(index)
+            else:
+                findings, ok = next(results)
+                if ok and index in keys:
+                    cache.put(keys[index], findings)
+            yield _tag_file(findings, path)
+    finally:
+        results.close()
+
+
+def scan_files(
+    dockerfiles: list[str],
+    compose_files: list[str],
+    jobs: Optional[int] = None,
+    cache: Optional[ResultCache] = None
+) -> list[Finding]:
+    findings = []
+    for found in iter_scan_files(dockerfiles, compose_files, jobs=jobs, cache=cache):
+        findings.extend(found)
+    return findings
+
+
+def _scan_chunk(tasks: list[tuple[str, str]]) -> list[tuple[list[Finding], bool]]:
+    return [_scan_task(task) for task in tasks]
+
+
+def _profiled_scan_chunk(tasks: list[tuple[str, str]]) -> tuple[list[tuple[list[Finding], bool]], Optional[list]]:
+    return _scan_chunk(tasks), profiling.drain()
+
+
+def _run_tasks(tasks: list[tuple[str, str]], jobs: Optional[int]) -> Iterator[tuple[list[Finding], bool]]:
+    if not tasks:
+        return
+
+    jobs = jobs or os.cpu_count() or 1
+    jobs = min(jobs, len(tasks))
+    if jobs == 1:
+        for task in tasks:
+            yield _scan_task(task)
+        return
+
+    from collections import deque
+    from concurrent.futures import ProcessPoolExecutor
+    chunksize = max(1, len(tasks) // (jobs * 4))
+    chunks = (tasks[start:start + chunksize] for start in range(0, len(tasks), chunksize))
+    profiler = profiling.PROFILER
+    initargs = (tuple(path for path, _ in rule_packs.INSTALLED_PACKS), profiler is not None)
+    executor = ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=initargs)
+    # Only a couple of chunks per worker are in flight. Results are taken
+    # in submission order, so output is stable regardless of which worker
+    # finishes first, and a consumer that stops early (--fail-fast) leaves
+    # the rest of the files unread.
+    window = deque()
+    try:
+        for chunk in chunks:
+            window.append(executor.submit(_profiled_scan_chunk if profiler else _scan_chunk, chunk))
+            if len(window) < jobs * 2:
+                continue
+            yield from _chunk_results(window.popleft(), profiler)
+        while window:
+            yield from _chunk_results(window.popleft(), profiler)
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _chunk_results(future, profiler: Optional[profiling.Profiler]) -> list[tuple[list[Finding], bool]]:
+    if profiler is None:
+        return future.result()
+    # Each chunk carries the worker's stats since its previous chunk, so
+    # the parent's profile covers every process.
+    results, stats = future.result()
+    profiler.merge(stats)
+    return results
+
+
+def iter_inspect_dump_checks(path: str, batch_size: int = config.INSPECT_DUMP_BATCH_SIZE) -> Iterator[list[Finding]]:
+    from checks.container_runtime_checks import run_container_checks
+    from utils.inspect_dump import iter_inspect_records
+
+    batch = []
+    try:
+        for record in iter_inspect_records(path):
+            batch.extend(run_container_checks(record))
+            if len(batch) >= batch_size:
+                yield _tag_file(batch, path)
+                batch = []
+    except (OSError, ValueError, EOFError, zlib.error) as e:
+        # Findings already made are kept; the error marks where reading stopped.
+        batch.append(Finding(INSPECT_DUMP_ERROR, (str(e),)))
+    if batch:
+        yield _tag_file(batch, path)
+
+
+_DUMP_QUEUE = None
+_DUMP_STOP = None
+
+
+def _init_dump_worker(pack_paths: tuple[str, ...], profile: bool, queue, stop) -> None:
+    global _DUMP_QUEUE, _DUMP_STOP
+    rule_packs.install_rule_packs(list(pack_paths), include_runtime=True)
+    if profile:
+        profiling.start_worker(include_runtime=True)
+    # The parent reads every batch before shutting the pool down, unless it
+    # stopped early and no longer wants them; either way a worker must not
+    # block on exit flushing the queue.
+    queue.cancel_join_thread()
+    _DUMP_QUEUE, _DUMP_STOP = queue, stop
+
+
+def _put_batch(message: tuple) -> bool:
+    from queue import Full
+    while not _DUMP_STOP.is_set():
+        try:
+            _DUMP_QUEUE.put(message, timeout=0.2)
+            return True
+        except Full:
+            continue
+    return False
+
+
+def _scan_dump_to_queue(path: str) -> None:
+    try:
+        for findings in iter_inspect_dump_checks(path):
+            if not _put_batch((findings, None)):
+                return
+    finally:
+        _put_batch((None, profiling.drain()))
+
+
+def iter_inspect_dumps(paths: list[str], jobs: Optional[int] = None) -> Iterator[list[Finding]]:
+    jobs = min(jobs or os.cpu_count() or 1, len(paths))
+    # Only this process can read stdin.
+    if jobs <= 1 or "-" in paths:
+        for path in paths:
+            yield from iter_inspect_dump_checks(path)
+        return
+
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+    from queue import Empty
+    # Worker findings are unpickled against this process's rule registry,
+    # so the runtime rules have to be registered here first.
+    import checks.container_runtime_checks
+    # One file per worker; batches come back through a bounded queue as
+    # they are made, so neither side holds a whole dump's findings.
+    context = multiprocessing.get_context()
+    queue = context.Queue(maxsize=jobs * 4)
+    stop = context.Event()
+    profiler = profiling.PROFILER
+    initargs = (tuple(path for path, _ in rule_packs.INSTALLED_PACKS), profiler is not None, queue, stop)
+    executor = ProcessPoolExecutor(
+        max_workers=jobs, mp_context=context, initializer=_init_dump_worker, initargs=initargs
+    )
+    try:
+        futures = [executor.submit(_scan_dump_to_queue, path) for path in paths]
+        remaining = len(paths)
+        while remaining:
+            try:
+                findings, stats = queue.get(timeout=0.5)
+            except Empty:
+                for future in futures:
+                    if future.done() and future.exception() is not None:
+                        raise future.exception()
+                continue
+            if findings is not None:
+                yield findings
+                continue
+            remaining -= 1
+            if profiler is not None and stats:
+                profiler.merge(stats)
+        for future in futures:
+            future.result()
+    finally:
+        stop.set()
+        executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,198 @@
+import json
+import os
+import socket
+import socketserver
+import stat
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from config import SERVE_ADDRESS, SERVE_CACHE_ENTRIES, SERVE_MAX_BODY_BYTES
+from scanner import scan_content, ruleset_fingerprint, DOCKERFILE, COMPOSE
+from utils.cache import content_key
+
+KINDS = (DOCKERFILE, COMPOSE)
+
+
+class ScanService:
+    def __init__(self, cache_entries: int = SERVE_CACHE_ENTRIES):
+        self.ruleset = ruleset_fingerprint()
+        self.cache_entries = cache_entries
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def scan(self, kind: str, content: str) -> list[dict]:
+        key = content_key(kind, self.ruleset, content.encode())
+        with self._lock:
+            findings = self._cache.get(key)
+            if findings is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return findings
+            self.misses += 1
+
+        # Checks run outside the lock so concurrent requests only contend
+        # on the cache itself.
+        found, ok = scan_content(kind, content)
+        findings = [finding.to_dict() for finding in found]
+        if ok:
+            with self._lock:
+                self._cache[key] = findings
+                if len(self._cache) > self.cache_entries:
+                    self._cache.popitem(last=False)
+        return findings
+
+    def warm_up(self) -> None:
+        # Pay for the YAML import and the first rule dispatch before the
+        # first request arrives.
+        scan_content(DOCKERFILE, "FROM scratch\n")
+        scan_content(COMPOSE, "services: {}\n")
+
+
+class BadRequest(Exception):
+    pass
+
+
+class ScanRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "docker-scanner"
+
+    def log_message(self, format, *args):
+        pass
+
+    def address_string(self):
+        # Unix socket peers have no (host, port) address.
+        return self.client_address[0] if isinstance(self.client_address, tuple) else "local"
+
+    def _send_json(self, status: int, payload) -> None:
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_body(self) -> str:
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            raise BadRequest("Invalid Content-Length")
+        if length < 0:
+            raise BadRequest("Invalid Content-Length")
+        if length > SERVE_MAX_BODY_BYTES:
+            raise BadRequest(f"Request body exceeds {SERVE_MAX_BODY_BYTES} bytes")
+        try:
+            return self.rfile.read(length).decode()
+        except UnicodeDecodeError:
+            raise BadRequest("Request body is not valid UTF-8")
+
+    def _batch(self, body: str) -> dict:
+        try:
+            items = json.loads(body)["items"]
+        except (ValueError, KeyError, TypeError):
+            raise BadRequest('Expected a JSON object with an "items" list')
+        if not isinstance(items, list):
+            raise BadRequest('"items" must be a list')
+        results = []
+        for index, item in enumerate(items):
+            if not isinstance(item, dict) or item.get("kind") not in KINDS or not isinstance(item.get("content"), str):
+                raise BadRequest(f"Item {index} needs a kind of {' or '.join(KINDS)} and string content")
+            results.append({
+                "name": item.get("name", str(index)),
+                "kind": item["kind"],
+                "findings": self.server.service.scan(item["kind"], item["content"]),
+            })
+        return {"results": results}
+
+    def do_GET(self):
+        if self.path == "/healthz":
+            service = self.server.service
+            self._send_json(200, {"status": "ok", "ruleset": service.ruleset, "hits": service.hits,
+                                  "misses": service.misses})
+        else:
+            self._send_json(404, {"error": f"Unknown path: {self.path}"})
+
+    def do_POST(self):
+        try:
+            body = self._read_body()
+            if self.path == "/v1/dockerfile":
+                payload = {"findings": self.server.service.scan(DOCKERFILE, body)}
+            elif self.path == "/v1/compose":
+                payload = {"findings": self.server.service.scan(COMPOSE, body)}
+            elif self.path == "/v1/batch":
+                payload = self._batch(body)
+            else:
+                self._send_json(404, {"error": f"Unknown path: {self.path}"})
+                return
+        except BadRequest as e:
+            self.close_connection = True
+            self._send_json(400, {"error": str(e)})
+            return
+        self._send_json(200, payload)
+
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def server_bind(self):
+        # Replace a socket left behind by an earlier run, but never
+        # anything else that happens to be at the path.
+        if os.path.lexists(self.server_address):
+            if not _is_socket(self.server_address):
+                raise FileExistsError(f"Not a socket, refusing to replace: {self.server_address}")
+            if _socket_in_use(self.server_address):
+                raise FileExistsError(f"Another server is listening on {self.server_address}")
+            os.unlink(self.server_address)
+        super().server_bind()
+
+
+def _is_socket(path: str) -> bool:
+    try:
+        return stat.S_ISSOCK(os.lstat(path).st_mode)
+    except OSError:
+        return False
+
+
+def _socket_in_use(path: str) -> bool:
+    # A stale socket refuses connections; a live one answers.
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(path)
+        except OSError:
+            return False
+    return True
+
+
+def _parse_port(port: str) -> int:
+    if not port.isdigit() or int(port) > 65535:
+        raise ValueError(f"Invalid port: {port!r}")
+    return int(port)
+
+
+def create_server(address: str = SERVE_ADDRESS, service: Optional[ScanService] = None):
+    # "unix:/path/to.sock" serves on a Unix socket; anything else is
+    # "host:port" or a bare port on localhost.
+    if address.startswith("unix:"):
+        server = UnixHTTPServer(address[len("unix:"):], ScanRequestHandler)
+    else:
+        host, _, port = address.rpartition(":")
+        server = ThreadingHTTPServer((host or "127.0.0.1", _parse_port(port)), ScanRequestHandler)
+        server.daemon_threads = True
+    server.service = service or ScanService()
+    return server
+
+
+def serve(address: str = SERVE_ADDRESS) -> None:
+    server = create_server(address)
+    server.service.warm_up()
+    print(f"Serving scans on {address}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if address.startswith("unix:") and _is_socket(address[len("unix:"):]):
+            os.unlink(address[len("unix:"):])
@@ -0,0 +1,71 @@
+import hashlib
+import os
+from pathlib import Path
+from typing import Iterable, Optional
+from utils.discovery import git_toplevel
+from utils.finding import Finding
+
+BASELINE_HEADER = "# docker-scanner baseline v1"
+
+
+def normalize_subject(args: tuple) -> str:
+    # Collapse whitespace so reformatting a line does not turn a known
+    # finding into a new one.
+    return "\0".join(" ".join(str(arg).split()) for arg in args)
+
+
+def baseline_root(path: str) -> str:
+    # Paths are recorded relative to the repository holding the baseline,
+    # or to its directory outside git, so ./svc, $PWD/svc and a scan from a
+    # subdirectory all agree.
+    directory = os.path.dirname(os.path.abspath(path))
+    return git_toplevel(directory) or directory
+
+
+def normalize_file(file: str, root: Optional[str]) -> str:
+    if not file or root is None:
+        return file or ""
+    return Path(os.path.relpath(os.path.abspath(file), root)).as_posix()
+
+
+def fingerprint(finding: Finding, root: Optional[str] = None) -> str:
+    # Line numbers and container IDs are left out on purpose: they change
+    # when unrelated lines are added or a container is recreated, while the
+    # finding itself stays the same.
+    parts = (finding.rule.id, normalize_file(finding.file, root), finding.service or "", finding.host or "",
+             normalize_subject(finding.args))
+    return hashlib.blake2b("\x1f".join(parts).encode(), digest_size=12).hexdigest()
+
+
+def load_baseline(path: str) -> set[str]:
+    if not os.path.exists(path):
+        return set()
+    with open(path, "r") as f:
+        return {line for line in f.read().split("\n") if line and not line.startswith("#")}
+
+
+def save_baseline(path: str, fingerprints: Iterable[str]) -> None:
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(BASELINE_HEADER + "\n")
+        f.writelines(f"{value}\n" for value in sorted(set(fingerprints)))
+    os.replace(tmp_path, path)
+
+
+class BaselineFilter:
+    def __init__(self, known: set[str], root: Optional[str] = None):
+        self.known = known
+        self.root = root
+        self.seen = set()
+        self.suppressed = 0
+
+    def filter(self, findings: list[Finding]) -> list[Finding]:
+        new = []
+        for finding in findings:
+            value = fingerprint(finding, self.root)
+            self.seen.add(value)
+            if value in self.known:
+                self.suppressed += 1
+            else:
+                new.append(finding)
+        return new
@@ -0,0 +1,109 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Optional
+from config import CACHE_MAX_BYTES
+from utils.finding import Finding
+
+
+def default_cache_dir() -> str:
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "docker-scanner")
+
+
+def content_key(kind: str, ruleset: str, content: bytes) -> str:
+    digest = hashlib.sha256()
+    digest.update(f"{kind}\0{ruleset}\0".encode())
+    digest.update(content)
+    return digest.hexdigest()
+
+
+class ResultCache:
+    def __init__(self, directory: str, ruleset: str, max_bytes: int = CACHE_MAX_BYTES):
+        Path(directory).mkdir(parents=True, exist_ok=True)
+        self.ruleset = ruleset
+        self.max_bytes = max_bytes
+        self._db = sqlite3.connect(os.path.join(directory, "results.sqlite"))
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "key TEXT PRIMARY KEY, findings TEXT NOT NULL, size INTEGER NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._touched = {}
+        self._pending = {}
+
+    def file_key(self, kind: str, *paths: str) -> str:
+        contents = []
+        for path in paths:
+            with open(path, "rb") as f:
+                contents.append(f.read())
+        # Length-prefix each file so different splits never hash the same.
+        return content_key(kind, self.ruleset, b"".join(b"%d\0%s" % (len(c), c) for c in contents))
+
+    def get(self, key: str) -> Optional[list[Finding]]:
+        data = self._pending.get(key)
+        if data is None:
+            try:
+                row = self._db.execute("SELECT findings FROM results WHERE key = ?", (key,)).fetchone()
+            except sqlite3.Error:
+                # Locked or damaged: scan the file as if it were not cached.
+                return None
+            if row is None:
+                return None
+            data = row[0]
+            # Recency updates are batched and written on close().
+            self._touched[key] = time.time()
+        return [Finding.from_record(record) for record in json.loads(data)]
+
+    def put(self, key: str, findings: list[Finding]) -> None:
+        # Buffered and written in one short transaction on close(), so the
+        # file is not locked against other scanners for the whole run.
+        self._pending[key] = json.dumps([finding.to_record() for finding in findings])
+        self._touched.pop(key, None)
+
+    def evict(self) -> None:
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        stale = []
+        kept = 0
+        for key, size in self._db.execute("SELECT key, size FROM results ORDER BY last_used DESC"):
+            if kept + size <= self.max_bytes:
+                kept += size
+            else:
+                stale.append((key,))
+        self._db.executemany("DELETE FROM results WHERE key = ?", stale)
+
+    def close(self) -> None:
+        if self._db is None:
+            return
+        now = time.time()
+        try:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO results (key, findings, size, last_used) VALUES (?, ?, ?, ?)",
+                [(key, data, len(data), now) for key, data in self._pending.items()]
+            )
+            self._db.executemany(
+                "UPDATE results SET last_used = ? WHERE key = ?",
+                [(used, key) for key, used in self._touched.items()]
+            )
+            self.evict()
+            self._db.commit()
+        except sqlite3.Error:
+            # Another scanner held the lock past the timeout; this run's
+            # results are simply not cached.
+            self._db.rollback()
+        finally:
+            self._pending.clear()
+            self._touched.clear()
+            self._db.close()
+            self._db = None
+
+
+def open_cache(directory: Optional[str], ruleset: str, max_bytes: int = CACHE_MAX_BYTES) -> Optional[ResultCache]:
+    try:
+        return ResultCache(directory or default_cache_dir(), ruleset, max_bytes)
+    except (OSError, sqlite3.Error):
+        return None
@@ -0,0 +1,127 @@
+import os
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Optional
+from config import DOCKERFILE_PATTERNS, COMPOSE_PATTERNS, SKIP_DIRS
+
+
+def is_dockerfile(name: str) -> bool:
+    return any(fnmatch(name, pattern) for pattern in DOCKERFILE_PATTERNS)
+
+
+def is_compose_file(name: str) -> bool:
+    return any(fnmatch(name, pattern) for pattern in COMPOSE_PATTERNS)
+
+
+def discover_files(root: str) -> tuple[list[str], list[str]]:
+    root_path = Path(root)
+    if not root_path.is_dir():
+        raise FileNotFoundError(f"Scan directory not found: {root}")
+
+    dockerfiles = []
+    compose_files = []
+    for dirpath, dirnames, filenames in os.walk(root_path):
+        dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS]
+        for name in filenames:
+            if is_dockerfile(name):
+                dockerfiles.append(os.path.join(dirpath, name))
+            elif is_compose_file(name):
+                compose_files.append(os.path.join(dirpath, name))
+
+    dockerfiles.sort()
+    compose_files.sort()
+    return dockerfiles, compose_files
+
+
+def _git(root: str, *args: str, ok_codes: tuple[int, ...] = (0,)) -> str:
+    import subprocess
+    try:
+        result = subprocess.run(["git", "-C", root, *args], capture_output=True, text=True)
+    except FileNotFoundError:
+        raise ValueError("git is not installed")
+    if result.returncode not in ok_codes:
+        raise ValueError(f"git {args[0]} failed: {result.stderr.strip()}")
+    return result.stdout
+
+
+def git_toplevel(path: str) -> Optional[str]:
+    try:
+        return os.path.normpath(_git(path, "rev-parse", "--show-toplevel").strip())
+    except ValueError:
+        return None
+
+
+def _split_z(output: str) -> list[str]:
+    return [path for path in output.split("\0") if path]
+
+
+def _is_scannable(path: str) -> bool:
+    return not any(part in SKIP_DIRS for part in Path(path).parts[:-1])
+
+
+def _build_dockerfile(compose_dir: str, build) -> Optional[str]:
+    if isinstance(build, str):
+        context, dockerfile = build, "Dockerfile"
+    elif isinstance(build, dict):
+        context, dockerfile = build.get("context") or ".", build.get("dockerfile") or "Dockerfile"
+    else:
+        return None
+    if "://" in str(context) or str(context).startswith("git@"):
+        return None
+    return os.path.normpath(os.path.join(compose_dir, str(context), str(dockerfile)))
+
+
+def _compose_files_building(top: str, compose_paths: list[str], dockerfiles: set[str]) -> list[str]:
+    from utils.file_loader import load_compose_file
+    matches = []
+    for rel_path in compose_paths:
+        path = os.path.join(top, rel_path)
+        try:
+            services = load_compose_file(path).get("services") or {}
+        except Exception:
+            continue
+        compose_dir = os.path.dirname(path)
+        for service in services.values():
+            if isinstance(service, dict) and _build_dockerfile(compose_dir, service.get("build")) in dockerfiles:
+                matches.append(rel_path)
+                break
+    return matches
+
+
+def discover_changed_files(root: str, ref: str) -> tuple[list[str], list[str]]:
+    root_path = Path(root)
+    if not root_path.is_dir():
+        raise FileNotFoundError(f"Scan directory not found: {root}")
+    top = _git(root, "rev-parse", "--show-toplevel").strip()
+    scope = Path(os.path.relpath(root_path.resolve(), top)).as_posix()
+    scope = "" if scope == "." else scope + "/"
+
+    # Resolved first so a ref such as --output=... can never reach git diff
+    # as an option.
+    try:
+        commit = _git(top, "rev-parse", "--verify", "--quiet", "--end-of-options", f"{ref}^{{commit}}").strip()
+    except ValueError:
+        raise ValueError(f"Not a commit: {ref}")
+
+    # Diffing the ref against the working tree covers both staged and
+    # unstaged edits; untracked files are listed separately. Deleted files
+    # have nothing left to scan.
+    changed = _split_z(_git(top, "diff", "--name-only", "-z", "--diff-filter=d", commit, "--"))
+    changed += _split_z(_git(top, "ls-files", "-z", "--others", "--exclude-standard"))
+    changed = sorted({path for path in changed if path.startswith(scope) and _is_scannable(path)})
+
+    dockerfiles = [path for path in changed if is_dockerfile(os.path.basename(path))]
+    compose_files = [path for path in changed if is_compose_file(os.path.basename(path))]
+
+    if dockerfiles:
+        # Unchanged compose files are only parsed when git grep finds a
+        # build key in them, so the cost follows the change, not the repo.
+        pathspecs = [f":(glob){scope}**/{pattern}" for pattern in COMPOSE_PATTERNS]
+        candidates = _split_z(_git(top, "grep", "-l", "-z", "-w", "build", "--", *pathspecs, ok_codes=(0, 1)))
+        candidates = [path for path in candidates if path not in compose_files and _is_scannable(path)]
+        changed_dockerfiles = {os.path.normpath(os.path.join(top, path)) for path in dockerfiles}
+        compose_files = sorted(compose_files + _compose_files_building(top, candidates, changed_dockerfiles))
+
+    def local(path: str) -> str:
+        return os.path.join(root, os.path.relpath(os.path.join(top, path), root_path.resolve()))
+    return [local(path) for path in dockerfiles], [local(path) for path in compose_files]
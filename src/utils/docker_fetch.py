@@ -0,0 +1,76 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Iterator, Optional
+import docker
+import requests
+from docker.errors import NotFound
+from config import RUNTIME_INSPECT_WORKERS, DOCKER_TIMEOUT_SECONDS
+from utils import profiling
+
+DOCKER_ERRORS = (docker.errors.DockerException, requests.exceptions.RequestException)
+
+
+def create_client(
+    base_url: Optional[str] = None,
+    workers: int = RUNTIME_INSPECT_WORKERS,
+    timeout: int = DOCKER_TIMEOUT_SECONDS
+) -> docker.DockerClient:
+    # Size the connection pool to the worker count so concurrent inspects
+    # reuse keep-alive connections instead of reopening the socket.
+    if base_url:
+        client = docker.DockerClient(base_url=base_url, max_pool_size=workers, timeout=timeout)
+    else:
+        client = docker.from_env(max_pool_size=workers, timeout=timeout)
+    # Proxy and netrc lookups from the environment cost more than the
+    # inspect itself and never apply to a local socket.
+    if client.api.base_url.startswith("http+docker://"):
+        client.api.trust_env = False
+    return client
+
+
+def read_hosts_file(path: str) -> list[str]:
+    hosts = []
+    with open(path, "r") as f:
+        for line in f:
+            line = line.split("#", 1)[0].strip()
+            if line:
+                hosts.append(line)
+    return hosts
+
+
+def list_container_summaries(client: docker.DockerClient) -> list[dict]:
+    with profiling.timer(profiling.PHASE, "docker_api:list"):
+        return client.api.containers()
+
+
+def iter_inspected_containers(
+    client: docker.DockerClient,
+    summaries: list[dict],
+    workers: int = RUNTIME_INSPECT_WORKERS
+) -> Iterator[tuple[int, object]]:
+    if not summaries:
+        return
+    inspect = client.api.inspect_container
+    if profiling.PROFILER is not None:
+        inspect = profiling.PROFILER.wrap(profiling.PHASE, "docker_api:inspect", inspect, counts_findings=False)
+    executor = ThreadPoolExecutor(max_workers=max(1, min(workers, len(summaries))))
+    try:
+        futures = {
+            executor.submit(inspect, summary["Id"]): index
+            for index, summary in enumerate(summaries)
+        }
+        for future in as_completed(futures):
+            try:
+                attrs = future.result()
+            except NotFound:
+                # Removed between the list call and its inspect.
+                yield futures[future], None
+                continue
+            except DOCKER_ERRORS as e:
+                # One failed inspect is reported for its container alone;
+                # the rest of the host is still scanned.
+                yield futures[future], e
+                continue
+            yield futures[future], client.containers.prepare_model(attrs)
+    finally:
+        # A consumer that stops early drops the inspects still queued.
+        executor.shutdown(wait=True, cancel_futures=True)
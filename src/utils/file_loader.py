@@ -1,22 +1,177 @@
+import re
 from pathlib import Path
-from typing import Optional
-import yaml
+from typing import NamedTuple, Optional
 
 
-def load_dockerfile(path: str) -> list[str]:
+class Instruction(NamedTuple):
+    keyword: str
+    args: str
+    start_line: int
+    end_line: int
+    stage: int
+
+
+DIRECTIVE_RE = re.compile(r"^#\s*([a-zA-Z][a-zA-Z0-9]*)\s*=\s*(.+?)\s*$")
+# A heredoc starts a word; <<< is a bash here-string, not a heredoc.
+HEREDOC_RE = re.compile(r"(?<![<\w])<<(?!<)(-?)\s*[\"']?([A-Za-z_][A-Za-z0-9_]*)[\"']?")
+
+
+def _read_directives(lines: list[str]) -> tuple[str, int]:
+    escape = "\\"
+    index = 0
+    # Parser directives are only honoured at the very top of the file,
+    # before any comment, blank line or instruction.
+    while index < len(lines):
+        match = DIRECTIVE_RE.match(lines[index].strip())
+        if not match:
+            break
+        if match.group(1).lower() == "escape" and match.group(2) in ("\\", "`"):
+            escape = match.group(2)
+        index += 1
+    return escape, index
+
+
+def parse_dockerfile(lines: list[str]) -> list[Instruction]:
+    escape, index = _read_directives(lines)
+    instructions = []
+    stage = -1
+    total = len(lines)
+
+    while index < total:
+        stripped = lines[index].strip()
+        start = index
+        index += 1
+        if not stripped or stripped.startswith("#"):
+            continue
+
+        parts = []
+        while stripped.endswith(escape):
+            parts.append(stripped[:-1].strip())
+            stripped = ""
+            while index < total:
+                candidate = lines[index].strip()
+                index += 1
+                if candidate and not candidate.startswith("#"):
+                    stripped = candidate
+                    break
+            else:
+                break
+        if stripped:
+            parts.append(stripped)
+        text = " ".join(part for part in parts if part)
+
+        keyword, _, args = text.partition(" ")
+        keyword = keyword.upper()
+        args = args.strip()
+
+        heredoc = HEREDOC_RE.search(args) if keyword in ("RUN", "COPY", "ADD") else None
+        if heredoc:
+            strip_tabs, delimiter = heredoc.groups()
+            body = []
+            while index < total:
+                line = lines[index]
+                index += 1
+                if (line.lstrip("\t") if strip_tabs else line).rstrip() == delimiter:
+                    break
+                body.append(line)
+            if body:
+                args = args + "\n" + "\n".join(body)
+
+        if keyword == "FROM":
+            stage += 1
+        instructions.append(Instruction(keyword, args, start + 1, index, stage))
+
+    return instructions
+
+
+def load_dockerfile(path: str) -> list[Instruction]:
     file_path = Path(path)
     if not file_path.exists():
         raise FileNotFoundError(f"Dockerfile not found: {path}")
-    
+
     with open(file_path, "r") as f:
-        return [line.rstrip() for line in f.readlines()]
+        return parse_dockerfile([line.rstrip() for line in f.readlines()])
+
+
+COMPOSE_REPLACE_KEYS = {"command", "entrypoint", "test"}
 
 
-def load_compose_file(path: str) -> dict:
+def _yaml_loader():
+    import yaml
+    # libyaml's C loader is several times faster; fall back when PyYAML was
+    # built without it.
+    return getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def _parse_compose(path: str) -> tuple:
+    import yaml
+    with open(path, "r") as f:
+        documents = yaml.load_all(f, Loader=_yaml_loader())
+        return tuple(doc for doc in documents if doc)
+
+
+def load_compose_documents(path: str) -> tuple:
     file_path = Path(path)
     if not file_path.exists():
         raise FileNotFoundError(f"Compose file not found: {path}")
-    
-    with open(file_path, "r") as f:
-        config = yaml.safe_load(f)
-        return config if config else {}
+    return _parse_compose(str(file_path))
+
+
+def _copy_value(value):
+    # A file listed twice is merged from the same parsed documents, so
+    # nothing from them may end up shared within the merged config.
+    if isinstance(value, dict):
+        return merge_compose({}, value)
+    if isinstance(value, list):
+        return [_copy_value(item) for item in value]
+    return value
+
+
+def _merge_list(base: list, override: list) -> list:
+    merged = list(base)
+    for item in override:
+        if item not in merged:
+            merged.append(_copy_value(item))
+    return merged
+
+
+def merge_compose(base: dict, override: dict) -> dict:
+    merged = dict(base)
+    for key, value in override.items():
+        current = merged.get(key)
+        if isinstance(current, dict) and isinstance(value, dict):
+            merged[key] = merge_compose(current, value)
+        elif isinstance(current, list) and isinstance(value, list) and key not in COMPOSE_REPLACE_KEYS:
+            merged[key] = _merge_list(current, value)
+        else:
+            merged[key] = _copy_value(value)
+    return merged
+
+
+def _merge_documents(config: dict, documents, source: str) -> dict:
+    for document in documents:
+        if not isinstance(document, dict):
+            raise ValueError(f"Compose document in {source} is not a mapping")
+        config = merge_compose(config, document)
+    return config
+
+
+def load_compose_file(path: str, *overrides: str) -> dict:
+    config = {}
+    # A file named more than once in the set is parsed once; the documents
+    # are dropped when the merge is done, so large files are not kept.
+    parsed = {}
+    # Later documents and files override earlier ones, as with repeated
+    # `docker compose -f` flags.
+    for file_path in (path,) + overrides:
+        key = str(Path(file_path).resolve())
+        if key not in parsed:
+            parsed[key] = load_compose_documents(file_path)
+        config = _merge_documents(config, parsed[key], file_path)
+    return config
+
+
+def parse_compose_text(text: str, source: str = "<text>") -> dict:
+    import yaml
+    documents = [doc for doc in yaml.load_all(text, Loader=_yaml_loader()) if doc]
+    return _merge_documents({}, documents, source)
@@ -0,0 +1,136 @@
+import sys
+from enum import Enum
+from typing import Optional
+
+
+class Severity(str, Enum):
+    LOW = "LOW"
+    MEDIUM = "MEDIUM"
+    HIGH = "HIGH"
+
+    @property
+    def rank(self) -> int:
+        return SEVERITY_RANKS[self]
+
+
+SEVERITY_RANKS = {Severity.LOW: 1, Severity.MEDIUM: 2, Severity.HIGH: 3}
+
+RULES = {}
+
+
+class Rule:
+    __slots__ = ("id", "severity", "title", "template")
+
+    def __init__(self, rule_id: str, severity: Severity, title: str, template: str):
+        self.id = sys.intern(rule_id)
+        self.severity = severity
+        self.title = sys.intern(title)
+        self.template = template
+        RULES[self.id] = self
+
+    def __reduce__(self):
+        # Unpickle to the registered instance so worker results share it.
+        return (get_rule, (self.id,))
+
+    def __repr__(self) -> str:
+        return f"Rule({self.id!r}, {self.severity.value}, {self.title!r})"
+
+
+def get_rule(rule_id: str) -> Rule:
+    return RULES[rule_id]
+
+
+LOCATION_FIELDS = ("file", "line", "service", "container", "host")
+
+
+class Finding:
+    __slots__ = ("rule", "args", "file", "line", "service", "container", "host")
+
+    def __init__(
+        self,
+        rule: Rule,
+        args: tuple = (),
+        file: Optional[str] = None,
+        line: Optional[int] = None,
+        service: Optional[str] = None,
+        container: Optional[str] = None,
+        host: Optional[str] = None
+    ):
+        self.rule = rule
+        self.args = args
+        self.file = file
+        self.line = line
+        self.service = service
+        self.container = container
+        self.host = host
+
+    @property
+    def rule_id(self) -> str:
+        return self.rule.id
+
+    @property
+    def severity(self) -> Severity:
+        return self.rule.severity
+
+    @property
+    def check(self) -> str:
+        return self.rule.title
+
+    @property
+    def details(self) -> str:
+        # Formatted on demand so large reports only pay for what is rendered.
+        return self.rule.template.format(
+            *self.args, line=self.line, service=self.service, container=self.container, host=self.host
+        )
+
+    def to_dict(self) -> dict:
+        data = {
+            "severity": self.rule.severity.value,
+            "check": self.rule.title,
+            "details": self.details,
+        }
+        for field in LOCATION_FIELDS:
+            value = getattr(self, field)
+            if value is not None:
+                data[field] = value
+        return data
+
+    def to_record(self) -> list:
+        return [self.rule.id, list(self.args), self.file, self.line, self.service, self.container, self.host]
+
+    @classmethod
+    def from_record(cls, record: list) -> "Finding":
+        rule_id, args, file, line, service, container, host = record
+        return cls(RULES[rule_id], tuple(args), file, line, service, container, host)
+
+    def _key(self) -> tuple:
+        return (self.rule.id, self.args, self.file, self.line, self.service, self.container, self.host)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Finding):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __hash__(self) -> int:
+        return hash(self._key())
+
+    def __getitem__(self, key: str):
+        # Mapping-style access keeps code written against the old dict
+        # findings working.
+        if key in ("severity", "check", "details", "rule_id"):
+            return getattr(self, key)
+        if key in LOCATION_FIELDS and getattr(self, key) is not None:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def get(self, key: str, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def __repr__(self) -> str:
+        return f"Finding({self.rule.id}, {self.details!r})"
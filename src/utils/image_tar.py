@@ -0,0 +1,132 @@
+import json
+import posixpath
+import sys
+import tarfile
+from typing import BinaryIO, NamedTuple, Optional
+
+DOCKER_MANIFEST = "manifest.json"
+OCI_INDEX = "index.json"
+MAX_METADATA_BYTES = 4 * 1024 * 1024
+JSON_SNIFF_BYTES = 64
+OCI_NAME_ANNOTATIONS = ("io.containerd.image.name", "org.opencontainers.image.ref.name")
+
+
+class ImageConfig(NamedTuple):
+    name: str
+    config: dict
+
+
+def _member_name(member: tarfile.TarInfo) -> str:
+    return posixpath.normpath(member.name).lstrip("/")
+
+
+def _is_metadata(member: tarfile.TarInfo) -> bool:
+    # Manifests, indexes and configs are small JSON files; layers are the
+    # large members and are never read.
+    if not member.isfile() or member.size > MAX_METADATA_BYTES:
+        return False
+    name = _member_name(member)
+    return name.endswith(".json") or name.startswith("blobs/")
+
+
+def _read_metadata(archive: tarfile.TarFile, member: tarfile.TarInfo, name: str) -> Optional[bytes]:
+    stream = archive.extractfile(member)
+    if name.endswith(".json"):
+        return stream.read()
+    # Most OCI blobs are layers: only JSON documents are kept, judged by
+    # their first bytes, so a layer is never buffered.
+    head = stream.read(JSON_SNIFF_BYTES)
+    if not head.lstrip().startswith(b"{"):
+        return None
+    return head + stream.read()
+
+
+def _collect_metadata(archive: tarfile.TarFile, seekable: bool) -> dict:
+    members = {}
+    for member in archive:
+        if not _is_metadata(member):
+            continue
+        name = _member_name(member)
+        # A stream cannot go back, so its metadata is read as it passes; a
+        # seekable archive keeps the header and reads only what is used.
+        data = member if seekable else _read_metadata(archive, member, name)
+        if data is not None:
+            members[name] = data
+    return members
+
+
+def _load_json(archive: tarfile.TarFile, members: dict, name: str):
+    data = members.get(posixpath.normpath(name))
+    if data is None:
+        raise ValueError(f"Image archive is missing {name}")
+    if isinstance(data, tarfile.TarInfo):
+        data = archive.extractfile(data).read()
+    return json.loads(data)
+
+
+def _blob_path(digest: str) -> str:
+    algorithm, _, encoded = digest.partition(":")
+    return f"blobs/{algorithm}/{encoded}"
+
+
+def _short_digest(path: str) -> str:
+    return posixpath.basename(path).removesuffix(".json")[:12]
+
+
+def _docker_images(archive: tarfile.TarFile, members: dict) -> list[ImageConfig]:
+    images = []
+    for entry in _load_json(archive, members, DOCKER_MANIFEST):
+        config_path = entry["Config"]
+        tags = entry.get("RepoTags") or []
+        name = tags[0] if tags else _short_digest(config_path)
+        images.append(ImageConfig(name, _load_json(archive, members, config_path)))
+    return images
+
+
+def _descriptor_name(descriptor: dict, default: Optional[str]) -> Optional[str]:
+    annotations = descriptor.get("annotations") or {}
+    return next((annotations[key] for key in OCI_NAME_ANNOTATIONS if key in annotations), default)
+
+
+def _oci_images(archive: tarfile.TarFile, members: dict) -> list[ImageConfig]:
+    images = []
+    index = _load_json(archive, members, OCI_INDEX)
+    pending = [(descriptor, None) for descriptor in index.get("manifests", [])]
+    while pending:
+        descriptor, name = pending.pop(0)
+        name = _descriptor_name(descriptor, name)
+        document = _load_json(archive, members, _blob_path(descriptor["digest"]))
+        if "manifests" in document:
+            # Nested index, e.g. a multi-platform image; entries inherit
+            # the name annotated on the parent.
+            pending.extend((child, name) for child in document["manifests"])
+            continue
+        config_digest = document["config"]["digest"]
+        config = _load_json(archive, members, _blob_path(config_digest))
+        images.append(ImageConfig(name or config_digest.partition(":")[2][:12], config))
+    return images
+
+
+def read_image_configs(fileobj: BinaryIO, seekable: bool = False) -> list[ImageConfig]:
+    mode = "r:" if seekable else "r|*"
+    with tarfile.open(fileobj=fileobj, mode=mode) as archive:
+        members = _collect_metadata(archive, seekable)
+        if DOCKER_MANIFEST in members:
+            return _docker_images(archive, members)
+        if OCI_INDEX in members:
+            return _oci_images(archive, members)
+    raise ValueError("No manifest.json or index.json found in image archive")
+
+
+def load_image_tar(path: str) -> list[ImageConfig]:
+    if path == "-":
+        return read_image_configs(sys.stdin.buffer)
+    with open(path, "rb") as f:
+        # An uncompressed tar on disk is read by seeking from header to
+        # header, so layer data is never touched; compressed archives have
+        # to be streamed through the decompressor.
+        try:
+            return read_image_configs(f, seekable=True)
+        except tarfile.ReadError:
+            f.seek(0)
+            return read_image_configs(f)
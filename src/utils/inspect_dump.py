@@ -0,0 +1,87 @@
+import gzip
+import json
+import sys
+from contextlib import nullcontext
+from typing import Iterator, TextIO
+from config import INSPECT_DUMP_CHUNK_BYTES, INSPECT_DUMP_MAX_RECORD_BYTES
+
+_SEPARATORS = " \t\r\n"
+
+
+class InspectRecord:
+    # Stands in for a docker-py Container built from a saved inspect
+    # payload; runtime rules only read attrs, name and id.
+    __slots__ = ("attrs", "id", "name")
+
+    def __init__(self, attrs: dict):
+        self.attrs = attrs
+        self.id = attrs.get("Id") or attrs.get("ID")
+        self.name = (attrs.get("Name") or "").lstrip("/") or (self.id or "")[:12]
+
+
+def iter_json_values(
+    stream: TextIO,
+    chunk_size: int = INSPECT_DUMP_CHUNK_BYTES,
+    max_record: int = INSPECT_DUMP_MAX_RECORD_BYTES
+) -> Iterator:
+    # Reads JSON Lines, concatenated documents and top-level arrays, as
+    # written by docker inspect, possibly several appended. Array elements
+    # are decoded one at a time, so memory follows the largest record and
+    # not the size of the dump.
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    in_array = False
+    eof = False
+    while True:
+        while pos < len(buffer) and (buffer[pos] in _SEPARATORS or (in_array and buffer[pos] == ",")):
+            pos += 1
+        if pos == len(buffer):
+            if eof:
+                break
+            buffer, pos = stream.read(chunk_size), 0
+            eof = not buffer
+            continue
+        if buffer[pos] == "[" and not in_array:
+            in_array = True
+            pos += 1
+            continue
+        if buffer[pos] == "]" and in_array:
+            in_array = False
+            pos += 1
+            continue
+        try:
+            value, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            end = None
+        # A record that fails to decode, or a number that runs to the end of
+        # the buffer, may just be cut off by the chunk boundary.
+        if end is None or (end == len(buffer) and not eof):
+            if len(buffer) - pos > max_record:
+                raise ValueError(f"Record at offset {pos} exceeds {max_record} bytes or is not valid JSON")
+            more = stream.read(chunk_size)
+            eof = not more
+            buffer, pos = buffer[pos:] + more, 0
+            continue
+        pos = end
+        yield value
+    if in_array:
+        raise ValueError("Unterminated JSON array")
+
+
+def open_dump(path: str):
+    if path == "-":
+        return nullcontext(sys.stdin)
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8")
+    return open(path, encoding="utf-8")
+
+
+def iter_inspect_records(path: str) -> Iterator[InspectRecord]:
+    with open_dump(path) as stream:
+        for value in iter_json_values(stream):
+            if not isinstance(value, dict):
+                raise ValueError(f"Expected docker inspect objects, found {type(value).__name__}")
+            yield InspectRecord(value)
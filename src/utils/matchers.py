@@ -0,0 +1,83 @@
+import re
+from typing import Callable, Iterable, Optional
+
+_MISSING = object()
+
+
+def compile_any(literals: Iterable[str], ignore_case: bool = False) -> re.Pattern:
+    # One alternation instead of a loop of substring tests; longest first so
+    # the reported match is the most specific literal.
+    alternatives = sorted({str(literal) for literal in literals}, key=len, reverse=True)
+    if not alternatives:
+        return re.compile(r"(?!)")
+    return re.compile("|".join(map(re.escape, alternatives)), re.IGNORECASE if ignore_case else 0)
+
+
+def compile_accessor(path: str) -> Callable[[dict], object]:
+    # "deploy.resources.limits.memory" -> a function that walks those keys,
+    # returning _MISSING as soon as one is absent.
+    keys = tuple(path.split(".")) if path else ()
+
+    def access(data):
+        for key in keys:
+            if not isinstance(data, dict):
+                return _MISSING
+            data = data.get(key, _MISSING)
+            if data is _MISSING:
+                return _MISSING
+        return data
+    return access
+
+
+def is_missing(value) -> bool:
+    return value is _MISSING or value is None or value == "" or value == [] or value == {}
+
+
+def _values(value) -> list:
+    if isinstance(value, dict):
+        return [str(key) for key in value]
+    if isinstance(value, (list, tuple, set)):
+        return [str(item) for item in value]
+    return [str(value)]
+
+
+def compile_predicate(spec: dict) -> Callable[[object], Optional[str]]:
+    # Returns a function that yields the matched text, or None. Supported
+    # keys: regex, any, equals, missing, present; "not" negates a nested
+    # predicate.
+    if "not" in spec:
+        inner = compile_predicate(spec["not"])
+        return lambda value: None if inner(value) is not None else _describe(value)
+    if spec.get("missing"):
+        return lambda value: "" if is_missing(value) else None
+    if spec.get("present"):
+        return lambda value: None if is_missing(value) else _describe(value)
+    if "equals" in spec:
+        expected = {str(item) for item in _values(spec["equals"])}
+        return lambda value: _search(value, lambda text: text if text in expected else None)
+    ignore_case = bool(spec.get("ignore_case"))
+    if "regex" in spec:
+        pattern = re.compile(spec["regex"], re.IGNORECASE if ignore_case else 0)
+    elif "any" in spec:
+        pattern = compile_any(spec["any"], ignore_case)
+    else:
+        raise ValueError(f"Unsupported match predicate: {sorted(spec)}")
+
+    def match_pattern(text: str) -> Optional[str]:
+        found = pattern.search(text)
+        return found.group(0) if found else None
+    return lambda value: _search(value, match_pattern)
+
+
+def _describe(value) -> str:
+    return "" if value is _MISSING or value is None else ", ".join(_values(value))
+
+
+def _search(value, match: Callable[[str], Optional[str]]) -> Optional[str]:
+    if value is _MISSING or value is None:
+        return None
+    for text in _values(value):
+        found = match(text)
+        if found is not None:
+            return found
+    return None
@@ -0,0 +1,73 @@
+import posixpath
+from typing import Iterable, Optional
+
+_VALUE = ""
+
+
+def split_path(path: str) -> Optional[tuple[str, ...]]:
+    # normpath folds "..", "." and repeated or trailing slashes; an empty
+    # component can never appear afterwards, so it doubles as the value key.
+    if not path.startswith("/"):
+        return None
+    return tuple(part for part in posixpath.normpath(path).split("/") if part)
+
+
+class PathTrie:
+    __slots__ = ("_root",)
+
+    def __init__(self):
+        self._root = {}
+
+    def insert(self, parts: tuple[str, ...], value) -> None:
+        node = self._root
+        for part in parts:
+            node = node.setdefault(part, {})
+        node[_VALUE] = value
+
+    def longest_prefix(self, parts: tuple[str, ...]) -> tuple[Optional[object], int]:
+        node = self._root
+        best = node.get(_VALUE)
+        depth = 0
+        for index, part in enumerate(parts, 1):
+            node = node.get(part)
+            if node is None:
+                break
+            if _VALUE in node:
+                best = node[_VALUE]
+                depth = index
+        return best, depth
+
+
+class HostPathMatcher:
+    __slots__ = ("_aliases", "_paths")
+
+    def __init__(self, paths: Iterable[str], aliases: Optional[dict[str, str]] = None):
+        self._aliases = PathTrie()
+        for alias, target in (aliases or {}).items():
+            alias_parts, target_parts = split_path(alias), split_path(target)
+            if alias_parts and target_parts is not None:
+                self._aliases.insert(alias_parts, target_parts)
+        self._paths = PathTrie()
+        for path in paths:
+            parts = self.canonical(path)
+            if parts is not None:
+                self._paths.insert(parts, "/" + "/".join(parts))
+
+    def canonical(self, path: str) -> Optional[tuple[str, ...]]:
+        parts = split_path(path)
+        if parts is None:
+            return None
+        target, depth = self._aliases.longest_prefix(parts)
+        if target is not None:
+            parts = target + parts[depth:]
+        return parts
+
+    def match(self, path: str) -> Optional[str]:
+        parts = self.canonical(path)
+        if parts is None:
+            return None
+        matched, depth = self._paths.longest_prefix(parts)
+        # "/" only matches a mount of the root itself, not everything below it.
+        if depth == 0 and parts:
+            return None
+        return matched
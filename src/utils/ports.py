@@ -0,0 +1,122 @@
+from bisect import bisect_left
+from functools import lru_cache
+from typing import Iterable, NamedTuple, Optional, Union
+import config
+
+MAX_PORT = 65535
+
+
+class PortRange(NamedTuple):
+    start: int
+    end: int
+
+    def label(self) -> Union[int, str]:
+        return self.start if self.start == self.end else f"{self.start}-{self.end}"
+
+
+class PortMapping(NamedTuple):
+    host_ip: Optional[str]
+    published: Optional[PortRange]
+    target: PortRange
+    protocol: str
+
+
+def parse_port_range(text: Union[str, int]) -> Optional[PortRange]:
+    text = str(text).strip()
+    start, sep, end = text.partition("-")
+    try:
+        start = int(start)
+        end = int(end) if sep else start
+    except ValueError:
+        return None
+    if not 0 <= start <= end <= MAX_PORT:
+        return None
+    return PortRange(start, end)
+
+
+def parse_expose(token: str) -> Optional[PortRange]:
+    # Dockerfile EXPOSE: "80", "80/udp" or "8000-8010/tcp".
+    return parse_port_range(token.split("/", 1)[0])
+
+
+def _split_host_ip(spec: str) -> tuple[Optional[str], str]:
+    if spec.startswith("["):
+        host_ip, _, rest = spec[1:].partition("]")
+        return host_ip, rest.lstrip(":")
+    parts = spec.split(":")
+    if len(parts) == 3:
+        return parts[0], f"{parts[1]}:{parts[2]}"
+    return None, spec
+
+
+def parse_compose_port(spec) -> Optional[PortMapping]:
+    # Short syntax: "80", "8080:80", "127.0.0.1:8080:80", "127.0.0.1::80",
+    # "[::1]:8080:80" and ranges such as "8000-9000:8000-9000", each with an
+    # optional "/protocol"; long syntax is a dict with target and published.
+    if isinstance(spec, dict):
+        target = parse_port_range(spec.get("target", ""))
+        if target is None:
+            return None
+        published = spec.get("published")
+        published = parse_port_range(published) if published not in (None, "") else None
+        return PortMapping(spec.get("host_ip"), published, target, str(spec.get("protocol") or "tcp"))
+
+    if isinstance(spec, int):
+        target = parse_port_range(spec)
+        return PortMapping(None, None, target, "tcp") if target else None
+
+    if not isinstance(spec, str):
+        return None
+    spec, _, protocol = spec.strip().partition("/")
+    host_ip, rest = _split_host_ip(spec)
+    published_text, sep, target_text = rest.rpartition(":")
+    if not sep:
+        published_text, target_text = "", rest
+    target = parse_port_range(target_text)
+    if target is None:
+        return None
+    published = None
+    if published_text:
+        published = parse_port_range(published_text)
+        if published is None:
+            return None
+    return PortMapping(host_ip or None, published, target, protocol or "tcp")
+
+
+class PortIndex:
+    __slots__ = ("_starts", "_ends")
+
+    def __init__(self, ports: Iterable[Union[int, str, tuple[int, int]]]):
+        ranges = []
+        for port in ports:
+            port_range = PortRange(*port) if isinstance(port, tuple) else parse_port_range(port)
+            if port_range is not None:
+                ranges.append(port_range)
+        # Merge overlapping and adjacent ranges so lookups see disjoint,
+        # sorted intervals.
+        merged = []
+        for start, end in sorted(ranges):
+            if merged and start <= merged[-1][1] + 1:
+                merged[-1][1] = max(merged[-1][1], end)
+            else:
+                merged.append([start, end])
+        self._starts = [start for start, _ in merged]
+        self._ends = [end for _, end in merged]
+
+    def overlaps(self, start: int, end: Optional[int] = None) -> list[PortRange]:
+        end = start if end is None else end
+        matches = []
+        index = bisect_left(self._ends, start)
+        while index < len(self._starts) and self._starts[index] <= end:
+            matches.append(PortRange(max(start, self._starts[index]), min(end, self._ends[index])))
+            index += 1
+        return matches
+
+    def __contains__(self, port: int) -> bool:
+        index = bisect_left(self._ends, port)
+        return index < len(self._starts) and self._starts[index] <= port
+
+
+@lru_cache(maxsize=1)
+def sensitive_port_index() -> PortIndex:
+    return PortIndex(config.SENSITIVE_PORTS)
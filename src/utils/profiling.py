@@ -0,0 +1,187 @@
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+from typing import Callable, Optional, TextIO
+
+RULE = "rule"
+RUNNER = "runner"
+PHASE = "phase"
+
+METRIC_PREFIX = "docker_scanner_profile"
+
+
+class Profiler:
+    def __init__(self):
+        self.stats = {}
+        self._lock = threading.Lock()
+
+    def record(self, section: str, name: str, seconds: float, findings: int = 0, calls: int = 1) -> None:
+        with self._lock:
+            entry = self.stats.get((section, name))
+            if entry is None:
+                self.stats[(section, name)] = [calls, seconds, findings]
+            else:
+                entry[0] += calls
+                entry[1] += seconds
+                entry[2] += findings
+
+    @contextmanager
+    def timer(self, section: str, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(section, name, time.perf_counter() - start)
+
+    def wrap(self, section: str, name: str, func: Callable, counts_findings: bool = True) -> Callable:
+        @wraps(func)
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            result = func(*args, **kwargs)
+            found = len(result) if counts_findings and result else 0
+            self.record(section, name, time.perf_counter() - start, found)
+            return result
+        return timed
+
+    def drain(self) -> list:
+        with self._lock:
+            rows = [(section, name, *entry) for (section, name), entry in self.stats.items()]
+            self.stats = {}
+        return rows
+
+    def merge(self, rows: list) -> None:
+        for section, name, calls, seconds, findings in rows:
+            self.record(section, name, seconds, findings, calls)
+
+    def rows(self) -> list[tuple]:
+        with self._lock:
+            rows = [(section, name, *entry) for (section, name), entry in self.stats.items()]
+        return sorted(rows, key=lambda row: (row[0], -row[3], row[1]))
+
+    def to_json(self) -> str:
+        return json.dumps([
+            {"section": section, "name": name, "calls": calls, "seconds": round(seconds, 6), "findings": findings}
+            for section, name, calls, seconds, findings in self.rows()
+        ], indent=2)
+
+    def to_prometheus(self) -> str:
+        metrics = [
+            ("seconds_total", "Wall time spent, in seconds.", 3),
+            ("calls_total", "Number of calls.", 2),
+            ("findings_total", "Findings produced.", 4),
+        ]
+        lines = []
+        for suffix, help_text, column in metrics:
+            metric = f"{METRIC_PREFIX}_{suffix}"
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} counter")
+            for row in self.rows():
+                name = row[1].replace("\\", "\\\\").replace('"', '\\"')
+                lines.append(f'{metric}{{section="{row[0]}",name="{name}"}} {row[column]}')
+        return "\n".join(lines) + "\n"
+
+    def print_table(self, stream: TextIO) -> None:
+        from rich.console import Console
+        from rich.table import Table
+
+        table = Table(title="Scan Profile")
+        table.add_column("Section")
+        table.add_column("Name")
+        table.add_column("Calls", justify="right")
+        table.add_column("Time (ms)", justify="right")
+        table.add_column("Findings", justify="right")
+        for section, name, calls, seconds, findings in self.rows():
+            table.add_row(section, name, str(calls), f"{seconds * 1000:.2f}", str(findings))
+        Console(file=stream).print(table)
+
+
+PROFILER: Optional[Profiler] = None
+
+
+def timer(section: str, name: str):
+    if PROFILER is None:
+        return nullcontext()
+    return PROFILER.timer(section, name)
+
+
+def measure(section: str, name: str, func: Callable, *args):
+    if PROFILER is None:
+        return func(*args)
+    start = time.perf_counter()
+    result = func(*args)
+    PROFILER.record(section, name, time.perf_counter() - start, len(result))
+    return result
+
+
+def drain() -> Optional[list]:
+    return PROFILER.drain() if PROFILER is not None else None
+
+
+def _wrap_dockerfile_rule(profiler: Profiler, rule):
+    name = f"dockerfile:{rule.name}"
+    return rule._replace(
+        on_instruction=rule.on_instruction and profiler.wrap(RULE, name, rule.on_instruction),
+        # Separate rows, so calls count instructions and files apart.
+        on_finish=rule.on_finish and profiler.wrap(RULE, f"{name}:finish", rule.on_finish),
+    )
+
+
+def _instrument_registries(profiler: Profiler, include_runtime: bool) -> None:
+    from checks import dockerfile_checks, compose_checks
+
+    # Registries are patched in place so runners that iterate them by
+    # reference pick up the wrappers; nothing is wrapped unless enabled.
+    dockerfile_checks.DOCKERFILE_CHECKS[:] = [
+        _wrap_dockerfile_rule(profiler, rule) for rule in dockerfile_checks.DOCKERFILE_CHECKS
+    ]
+    compose_checks.COMPOSE_CHECKS[:] = [
+        profiler.wrap(RULE, f"compose:{rule.__name__}", rule) for rule in compose_checks.COMPOSE_CHECKS
+    ]
+    if include_runtime:
+        from checks import container_runtime_checks
+        container_runtime_checks.RUNTIME_CHECKS[:] = [
+            profiler.wrap(RULE, f"runtime:{check.__name__}", check)
+            for check in container_runtime_checks.RUNTIME_CHECKS
+        ]
+
+
+def enable(include_runtime: bool = False) -> Profiler:
+    global PROFILER
+    if PROFILER is None:
+        PROFILER = Profiler()
+        _instrument_registries(PROFILER, include_runtime)
+    return PROFILER
+
+
+def start_worker(include_runtime: bool = False) -> None:
+    # Forked workers inherit the parent's profiler and its wrappers; clear
+    # what it had recorded so only the worker's own time is sent back.
+    if PROFILER is not None:
+        PROFILER.drain()
+    else:
+        enable(include_runtime)
+
+
+def write_report(profiler: Profiler, output_format: str, path: Optional[str] = None) -> None:
+    if path is None:
+        _write_format(profiler, output_format, sys.stderr)
+        return
+    # Write then rename, so the node exporter textfile collector never reads
+    # a half-written file.
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        _write_format(profiler, output_format, f)
+    os.replace(tmp_path, path)
+
+
+def _write_format(profiler: Profiler, output_format: str, stream: TextIO) -> None:
+    if output_format == "table":
+        profiler.print_table(stream)
+    elif output_format == "prometheus":
+        stream.write(profiler.to_prometheus())
+    else:
+        stream.write(profiler.to_json() + "\n")
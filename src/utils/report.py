@@ -1,8 +1,9 @@
 import json
-from rich.console import Console
-from rich.table import Table
-from rich.panel import Panel
-from rich.text import Text
+import sys
+from itertools import islice
+from typing import Iterable, Iterator, Optional, TextIO
+from config import REPORT_PAGE_SIZE, SUMMARY_TOP_N
+from utils.finding import Finding, Severity
 
 
 BANNER = """
@@ -22,33 +23,340 @@ BANNER = """
 
 
 def print_banner() -> None:
+    from rich.console import Console
     console = Console()
     console.print(BANNER, style="bold cyan")
 
 
-def print_findings(findings: list[dict], as_json: bool = False) -> None:
+SEVERITY_COLORS = {Severity.HIGH: "red", Severity.MEDIUM: "yellow", Severity.LOW: "blue"}
+
+
+def _finding_rows(findings: Iterable[Finding], show_file: bool, show_host: bool) -> Iterator[list[str]]:
+    for finding in findings:
+        severity = finding.severity
+        color = SEVERITY_COLORS[severity]
+        row = [f"[{color}]{severity.value}[/{color}]"]
+        if show_file:
+            row.append(finding.file or "")
+        if show_host:
+            row.append(finding.host or "")
+        row.extend([finding.check, finding.details])
+        yield row
+
+
+def _write_json_array(findings: Iterable[Finding], stream: TextIO) -> None:
+    # Same layout as json.dumps(list, indent=2), one element at a time.
+    separator = "[\n  "
+    for finding in findings:
+        stream.write(separator + json.dumps(finding.to_dict(), indent=2).replace("\n", "\n  "))
+        separator = ",\n  "
+    stream.write("[]\n" if separator.startswith("[") else "\n]\n")
+
+
+def print_findings(
+    findings: Iterable[Finding],
+    as_json: bool = False,
+    stream: Optional[TextIO] = None,
+    show_file: Optional[bool] = None,
+    show_host: Optional[bool] = None,
+    omitted: int = 0,
+    page_size: int = REPORT_PAGE_SIZE,
+) -> None:
+    stream = stream or sys.stdout
     if as_json:
-        print(json.dumps(findings, indent=2))
+        _write_json_array(findings, stream)
+        if omitted:
+            print(f"{omitted} more finding(s) not shown (--max-findings)", file=sys.stderr)
         return
     
-    if not findings:
-        console = Console()
-        console.print("[green]No misconfigurations found![/green]")
-        return
+    # Rich is only needed for terminal output; JSON runs skip importing it.
+    from rich.console import Console
+    from rich.table import Table
     
-    table = Table(title="Misconfiguration Report")
-    table.add_column("Severity", style="bold")
-    table.add_column("Check")
-    table.add_column("Details")
+    console = Console(file=stream)
+    if show_file is None or show_host is None:
+        findings = list(findings)
+        show_file = any(finding.file for finding in findings)
+        show_host = any(finding.host for finding in findings)
     
-    for finding in findings:
-        severity = finding["severity"]
-        color = "red" if severity == "HIGH" else "yellow" if severity == "MEDIUM" else "blue"
-        table.add_row(
-            f"[{color}]{severity}[/{color}]",
-            finding["check"],
-            finding["details"]
-        )
+    columns = ["Severity"] + ["File"] * show_file + ["Host"] * show_host + ["Check", "Details"]
+    rows = _finding_rows(findings, show_file, show_host)
     
-    console = Console()
-    console.print(table)
+    # Rows are built a page at a time and each page is printed as its own
+    # table, so Rich never lays out more than page_size rows at once.
+    title = "Misconfiguration Report"
+    page = list(islice(rows, page_size))
+    if not page and not omitted:
+        console.print("[green]No misconfigurations found![/green]")
+        return
+    while page:
+        table = Table(title=title)
+        for column in columns:
+            table.add_column(column, style="bold" if column == "Severity" else None)
+        for row in page:
+            table.add_row(*row)
+        console.print(table)
+        title = None
+        page = list(islice(rows, page_size))
+    if omitted:
+        console.print(f"[dim]... {omitted} more finding(s) not shown (--max-findings)[/dim]")
+
+
+SUBJECT_NOUNS = {
+    "container": "containers", "service": "services", "file": "files", "host": "hosts", "location": "locations"
+}
+
+
+def _subject(finding: Finding) -> tuple:
+    if finding.container:
+        return "container", finding.host or finding.file, finding.container
+    if finding.service:
+        return "service", finding.file, finding.service
+    if finding.file:
+        return "file", finding.file
+    if finding.host:
+        return "host", finding.host
+    return "file", None
+
+
+class FindingGroup:
+    __slots__ = ("rule", "count", "subjects", "example")
+
+    def __init__(self, rule, example: Finding):
+        self.rule = rule
+        self.count = 0
+        self.subjects = set()
+        self.example = example
+
+    def add(self, finding: Finding) -> None:
+        self.count += 1
+        self.subjects.add(_subject(finding))
+
+    def affected(self) -> str:
+        kinds = {subject[0] for subject in self.subjects}
+        kind = kinds.pop() if len(kinds) == 1 else "location"
+        return f"{len(self.subjects)} {kind if len(self.subjects) == 1 else SUBJECT_NOUNS[kind]}"
+
+    def to_dict(self) -> dict:
+        return {
+            "rule_id": self.rule.id,
+            "severity": self.rule.severity.value,
+            "check": self.rule.title,
+            "count": self.count,
+            "affected": self.affected(),
+            "example": self.example.details,
+        }
+
+
+class SummaryWriter:
+    def __init__(self, as_json: bool = False, top: int = SUMMARY_TOP_N, stream: Optional[TextIO] = None):
+        self.as_json = as_json
+        self.top = top
+        self.stream = stream or sys.stdout
+        self.count = 0
+        self._groups = {}
+
+    def write(self, findings: list[Finding]) -> None:
+        # Groups keep counts and subject keys, not the findings themselves.
+        for finding in findings:
+            group = self._groups.get(finding.rule.id)
+            if group is None:
+                group = self._groups[finding.rule.id] = FindingGroup(finding.rule, finding)
+            group.add(finding)
+        self.count += len(findings)
+
+    def by_severity(self) -> list[tuple[Severity, list[FindingGroup]]]:
+        sections = []
+        for severity in sorted(Severity, key=lambda severity: -severity.rank):
+            groups = [group for group in self._groups.values() if group.rule.severity is severity]
+            if groups:
+                groups.sort(key=lambda group: (-group.count, group.rule.id))
+                sections.append((severity, groups))
+        return sections
+
+    def close(self) -> None:
+        sections = self.by_severity()
+        if self.as_json:
+            summary = {
+                "total": self.count,
+                "severities": {
+                    severity.value: {
+                        "count": sum(group.count for group in groups),
+                        "rules": len(groups),
+                        "top": [group.to_dict() for group in groups[:self.top]],
+                    }
+                    for severity, groups in sections
+                },
+            }
+            self.stream.write(json.dumps(summary, indent=2) + "\n")
+            return
+        
+        from rich.console import Console
+        from rich.table import Table
+        
+        console = Console(file=self.stream)
+        if not sections:
+            console.print("[green]No misconfigurations found![/green]")
+            return
+        for severity, groups in sections:
+            color = SEVERITY_COLORS[severity]
+            total = sum(group.count for group in groups)
+            table = Table(title=f"[{color}]{severity.value}[/{color}]: {total} finding(s) from {len(groups)} rule(s)")
+            table.add_column("Rule")
+            table.add_column("Check")
+            table.add_column("Findings", justify="right")
+            table.add_column("Affected", justify="right")
+            table.add_column("Example")
+            for group in groups[:self.top]:
+                table.add_row(group.rule.id, group.rule.title, f"× {group.count}", group.affected(), group.example.details)
+            if len(groups) > self.top:
+                table.caption = f"... {len(groups) - self.top} more rule(s)"
+            console.print(table)
+        console.print(f"{self.count} finding(s) in total")
+
+
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+SARIF_LEVELS = {Severity.HIGH: "error", Severity.MEDIUM: "warning", Severity.LOW: "note"}
+TOOL_NAME = "docker-scanner"
+TOOL_VERSION = "1.0"
+TOOL_URI = "https://github.com/Daniel-wambua/docker-scanner"
+
+
+class ReportWriter:
+    def __init__(
+        self,
+        as_json: bool = False,
+        stream_batches: bool = False,
+        max_findings: Optional[int] = None,
+        stream: Optional[TextIO] = None
+    ):
+        self.as_json = as_json
+        self.stream_batches = stream_batches
+        self.max_findings = max_findings
+        self.stream = stream
+        self.count = 0
+        self._findings = []
+        self._show_file = False
+        self._show_host = False
+
+    def write(self, findings: list[Finding]) -> None:
+        self.count += len(findings)
+        if self.stream_batches:
+            if findings:
+                print_findings(findings, as_json=self.as_json, stream=self.stream)
+            return
+        # Past the cap findings are only counted, so memory stays bounded
+        # however large the scan.
+        if self.max_findings is not None:
+            findings = findings[:max(self.max_findings - len(self._findings), 0)]
+        for finding in findings:
+            self._show_file = self._show_file or finding.file is not None
+            self._show_host = self._show_host or finding.host is not None
+        self._findings.extend(findings)
+
+    def close(self) -> None:
+        if not self.stream_batches:
+            print_findings(
+                self._findings, as_json=self.as_json, stream=self.stream,
+                show_file=self._show_file, show_host=self._show_host, omitted=self.count - len(self._findings)
+            )
+            self._findings = []
+
+
+class JsonLinesWriter:
+    def __init__(self, stream: Optional[TextIO] = None):
+        self.stream = stream or sys.stdout
+        self.count = 0
+
+    def write(self, findings: list[Finding]) -> None:
+        for finding in findings:
+            self.stream.write(json.dumps(finding.to_dict()) + "\n")
+        self.count += len(findings)
+        self.stream.flush()
+
+    def close(self) -> None:
+        self.stream.flush()
+
+
+class SarifWriter:
+    def __init__(self, stream: Optional[TextIO] = None):
+        self.stream = stream or sys.stdout
+        self.count = 0
+        self._rules = {}
+        self._rule_index = {}
+        self._started = False
+
+    def _start(self) -> None:
+        # Results are streamed first; the tool section, which lists every rule
+        # seen, is written once the run is complete.
+        self.stream.write(
+            '{"$schema": %s, "version": "2.1.0", "runs": [{"results": [' % json.dumps(SARIF_SCHEMA)
+        )
+        self._started = True
+
+    def _result(self, finding: Finding) -> dict:
+        rule = finding.rule
+        level = SARIF_LEVELS[rule.severity]
+        if rule.id not in self._rules:
+            self._rule_index[rule.id] = len(self._rules)
+            self._rules[rule.id] = {
+                "id": rule.id,
+                "name": rule.title,
+                "shortDescription": {"text": rule.title},
+                "defaultConfiguration": {"level": level},
+            }
+        result = {
+            "ruleId": rule.id,
+            "ruleIndex": self._rule_index[rule.id],
+            "level": level,
+            "message": {"text": finding.details},
+        }
+        if finding.file:
+            location = {"artifactLocation": {"uri": finding.file}}
+            if finding.line:
+                location["region"] = {"startLine": finding.line}
+            result["locations"] = [{"physicalLocation": location}]
+        elif finding.container or finding.host:
+            location = {"name": finding.container or finding.host, "kind": "resource"}
+            if finding.host:
+                location["fullyQualifiedName"] = "/".join(filter(None, [finding.host, finding.container]))
+            result["locations"] = [{"logicalLocations": [location]}]
+        return result
+
+    def write(self, findings: list[Finding]) -> None:
+        if not self._started:
+            self._start()
+        for finding in findings:
+            if self.count:
+                self.stream.write(", ")
+            self.stream.write(json.dumps(self._result(finding)))
+            self.count += 1
+        self.stream.flush()
+
+    def close(self) -> None:
+        if not self._started:
+            self._start()
+        driver = {
+            "name": TOOL_NAME,
+            "version": TOOL_VERSION,
+            "informationUri": TOOL_URI,
+            "rules": list(self._rules.values()),
+        }
+        self.stream.write('], "tool": {"driver": %s}}]}\n' % json.dumps(driver))
+        self.stream.flush()
+
+
+def create_writer(
+    output_format: str,
+    stream_batches: bool = False,
+    summary: bool = False,
+    top: int = SUMMARY_TOP_N,
+    max_findings: Optional[int] = None
+):
+    if summary:
+        return SummaryWriter(as_json=output_format == "json", top=top)
+    if output_format == "jsonl" or (output_format == "json" and stream_batches):
+        return JsonLinesWriter()
+    if output_format == "sarif":
+        return SarifWriter()
+    return ReportWriter(as_json=output_format == "json", stream_batches=stream_batches, max_findings=max_findings)
@@ -0,0 +1,134 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+from config import RUNTIME_SNAPSHOT_TTL_SECONDS, RUNTIME_SNAPSHOT_REVALIDATE_SECONDS
+from utils.cache import default_cache_dir
+from utils.finding import Finding
+
+# Summary fields that change when a container is recreated, renamed or
+# re-pointed at another image. Status and NetworkSettings are left out:
+# they change on every restart without touching the configuration.
+SUMMARY_FIELDS = ("Names", "Image", "ImageID", "Created", "HostConfig", "Mounts", "Labels")
+# Inspect fields the runtime rules, and rule packs, read.
+CONFIG_FIELDS = ("Name", "HostConfig", "Mounts", "Config")
+
+
+def _digest(data: dict, fields: tuple[str, ...]) -> str:
+    payload = json.dumps([data.get(field) for field in fields], sort_keys=True, default=str)
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+def summary_hash(summary: dict) -> str:
+    return _digest(summary, SUMMARY_FIELDS)
+
+
+def config_hash(attrs: dict) -> str:
+    return _digest(attrs, CONFIG_FIELDS)
+
+
+class SnapshotStore:
+    def __init__(
+        self,
+        directory: str,
+        ruleset: str,
+        ttl: float = RUNTIME_SNAPSHOT_TTL_SECONDS,
+        revalidate: float = RUNTIME_SNAPSHOT_REVALIDATE_SECONDS
+    ):
+        Path(directory).mkdir(parents=True, exist_ok=True)
+        self.ruleset = ruleset
+        self.ttl = ttl
+        self.revalidate = revalidate
+        self.hits = 0
+        self.reused = 0
+        # Host scans run in their own threads and share one store; reads
+        # go through the lock and writes are buffered until close().
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(os.path.join(directory, "runtime.sqlite"), check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS snapshots ("
+            "container_id TEXT PRIMARY KEY, ruleset TEXT NOT NULL, summary_hash TEXT NOT NULL, "
+            "config_hash TEXT NOT NULL, findings TEXT NOT NULL, checked REAL NOT NULL, last_seen REAL NOT NULL)"
+        )
+        self._seen = {}
+        self._rows = {}
+
+    def _row(self, container_id: str) -> Optional[tuple]:
+        with self._lock:
+            self._seen[container_id] = time.time()
+            try:
+                return self._db.execute(
+                    "SELECT summary_hash, config_hash, findings, checked FROM snapshots "
+                    "WHERE container_id = ? AND ruleset = ?",
+                    (container_id, self.ruleset)
+                ).fetchone()
+            except sqlite3.Error:
+                # Locked by another scanner: inspect and check as usual.
+                return None
+
+    def lookup(self, summary: dict) -> Optional[list[Finding]]:
+        # Trusting the summary alone skips the inspect, but docker update
+        # can change limits without changing it, so that trust expires after
+        # the revalidation window.
+        row = self._row(summary["Id"])
+        if row is None or row[0] != summary_hash(summary) or time.time() - row[3] > self.revalidate:
+            return None
+        with self._lock:
+            self.hits += 1
+        return [Finding.from_record(record) for record in json.loads(row[2])]
+
+    def reuse(self, summary: dict, attrs: dict) -> Optional[list[Finding]]:
+        # After an inspect: an unchanged configuration keeps its findings
+        # without running the checks again.
+        row = self._row(summary["Id"])
+        digest = config_hash(attrs)
+        if row is None or row[1] != digest:
+            return None
+        with self._lock:
+            self.reused += 1
+            self._rows[summary["Id"]] = (summary_hash(summary), digest, row[2])
+        return [Finding.from_record(record) for record in json.loads(row[2])]
+
+    def put(self, summary: dict, attrs: dict, findings: list[Finding]) -> None:
+        # Serialised now, before the caller tags findings with a host.
+        data = json.dumps([finding.to_record() for finding in findings])
+        with self._lock:
+            self._rows[summary["Id"]] = (summary_hash(summary), config_hash(attrs), data)
+
+    def close(self) -> None:
+        if self._db is None:
+            return
+        now = time.time()
+        with self._lock:
+            try:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO snapshots "
+                    "(container_id, ruleset, summary_hash, config_hash, findings, checked, last_seen) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [(container_id, self.ruleset, *row, now, now) for container_id, row in self._rows.items()]
+                )
+                seen = [
+                    (when, container_id) for container_id, when in self._seen.items() if container_id not in self._rows
+                ]
+                self._db.executemany("UPDATE snapshots SET last_seen = ? WHERE container_id = ?", seen)
+                # Containers that have not been listed for a whole TTL are gone.
+                self._db.execute("DELETE FROM snapshots WHERE last_seen < ?", (now - self.ttl,))
+                self._db.commit()
+            except sqlite3.Error:
+                self._db.rollback()
+            finally:
+                self._db.close()
+                self._db = None
+                self._rows.clear()
+                self._seen.clear()
+
+
+def open_snapshot_store(directory: Optional[str], ruleset: str) -> Optional[SnapshotStore]:
+    try:
+        return SnapshotStore(directory or default_cache_dir(), ruleset)
+    except (OSError, sqlite3.Error):
+        return None
@@ -0,0 +1,193 @@
+import json
+import os
+import queue
+import re
+import shutil
+import socketserver
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+
+API_VERSION = "1.45"
+VERSION_PREFIX = r"(?:/v[0-9.]+)?"
+INSPECT_RE = re.compile(VERSION_PREFIX + r"/containers/([^/]+)/json$")
+LIST_RE = re.compile(VERSION_PREFIX + r"/containers/json$")
+VERSION_RE = re.compile(VERSION_PREFIX + r"/version$")
+PING_RE = re.compile(VERSION_PREFIX + r"/_ping$")
+EVENTS_RE = re.compile(VERSION_PREFIX + r"/events$")
+
+
+def make_container(index: int, **host_config) -> dict:
+    config = {"Privileged": False, "Memory": 0, "CpuShares": 0, "NanoCpus": 0, "NetworkMode": "bridge"}
+    config.update(host_config)
+    return {
+        "Id": f"{index:064x}",
+        "Name": f"/container-{index}",
+        "Created": "2024-01-01T00:00:00Z",
+        "State": {"Status": "running"},
+        "Config": {"Image": "nginx:1.25"},
+        "HostConfig": config,
+        "Mounts": [],
+    }
+
+
+def summarize(attrs: dict) -> dict:
+    return {
+        "Id": attrs["Id"],
+        "Names": [attrs.get("Name", "")],
+        "Image": attrs.get("Config", {}).get("Image", ""),
+        "Created": 1704067200,
+        "State": attrs.get("State", {}).get("Status", "running"),
+        "HostConfig": {"NetworkMode": attrs.get("HostConfig", {}).get("NetworkMode", "")},
+        "Mounts": attrs.get("Mounts", []),
+    }
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+    # The default backlog of 5 refuses connects from larger inspect pools.
+    request_queue_size = 128
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def address_string(self):
+        return "fake-docker"
+
+    def _send_json(self, status: int, payload) -> None:
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _stream_events(self, daemon) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        try:
+            while not daemon.stopping:
+                try:
+                    event = daemon.events.get(timeout=0.05)
+                except queue.Empty:
+                    continue
+                data = (json.dumps(event) + "\n").encode()
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+                self.wfile.flush()
+            self.wfile.write(b"0\r\n\r\n")
+        except OSError:
+            pass
+        self.close_connection = True
+
+    def do_GET(self):
+        daemon = self.server.fake
+        path = self.path.split("?", 1)[0]
+        daemon.requests.append(path)
+        if daemon.delay:
+            time.sleep(daemon.delay)
+
+        if PING_RE.match(path):
+            body = b"OK"
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        elif VERSION_RE.match(path):
+            self._send_json(200, {"ApiVersion": API_VERSION, "Version": "26.0.0", "MinAPIVersion": "1.24"})
+        elif LIST_RE.match(path):
+            self._send_json(200, [summarize(attrs) for attrs in daemon.list_containers()])
+        elif EVENTS_RE.match(path):
+            self._stream_events(daemon)
+        elif INSPECT_RE.match(path):
+            container_id = INSPECT_RE.match(path).group(1)
+            attrs = daemon.get_container(container_id)
+            if container_id in daemon.failing:
+                self._send_json(500, {"message": "inspect failed"})
+            elif attrs is None:
+                self._send_json(404, {"message": f"No such container: {container_id}"})
+            else:
+                daemon.inspected.append(container_id)
+                self._send_json(200, attrs)
+        else:
+            self._send_json(404, {"message": f"page not found: {path}"})
+
+
+class FakeDockerDaemon:
+    def __init__(self, containers: list[dict] | None = None, delay: float = 0.0):
+        self._dir = tempfile.mkdtemp(prefix="fake-docker-")
+        self.socket_path = os.path.join(self._dir, "docker.sock")
+        self.base_url = f"unix://{self.socket_path}"
+        self.delay = delay
+        self.requests = []
+        self.inspected = []
+        self.failing = set()
+        self._lock = threading.Lock()
+        self._containers = {}
+        self.events = queue.Queue()
+        self.stopping = False
+        for attrs in containers or []:
+            self.add_container(attrs)
+        self._server = None
+        self._thread = None
+
+    def add_container(self, attrs: dict) -> None:
+        with self._lock:
+            self._containers[attrs["Id"]] = attrs
+
+    def remove_container(self, container_id: str) -> None:
+        with self._lock:
+            self._containers.pop(container_id, None)
+
+    def emit_event(self, action: str, container_id: str) -> None:
+        self.events.put({
+            "Type": "container",
+            "Action": action,
+            "status": action,
+            "id": container_id,
+            "Actor": {"ID": container_id, "Attributes": {}},
+            "time": int(time.time()),
+        })
+
+    def list_containers(self) -> list[dict]:
+        with self._lock:
+            return list(self._containers.values())
+
+    def get_container(self, container_id: str) -> dict | None:
+        with self._lock:
+            attrs = self._containers.get(container_id)
+            if attrs is None:
+                for full_id, candidate in self._containers.items():
+                    if full_id.startswith(container_id) or candidate.get("Name") == f"/{container_id}":
+                        return candidate
+            return attrs
+
+    def start(self) -> "FakeDockerDaemon":
+        self._server = _Server(self.socket_path, _Handler)
+        self._server.fake = self
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.stopping = True
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        shutil.rmtree(self._dir, ignore_errors=True)
+
+    def __enter__(self) -> "FakeDockerDaemon":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
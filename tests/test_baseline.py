@@ -0,0 +1,125 @@
+import sys
+import os
+import json
+import subprocess
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from checks.dockerfile_checks import LATEST_TAG, SENSITIVE_PORT
+from checks.container_runtime_checks import PRIVILEGED_CONTAINER
+from utils.baseline import BaselineFilter, BASELINE_HEADER, baseline_root, fingerprint, load_baseline, save_baseline
+from utils.finding import Finding
+
+MAIN = os.path.join(os.path.dirname(__file__), '..', 'src', 'main.py')
+
+
+def test_fingerprint_ignores_line_and_whitespace():
+    a = Finding(LATEST_TAG, ("ubuntu  AS build",), file="svc/Dockerfile", line=1)
+    b = Finding(LATEST_TAG, ("ubuntu AS build",), file="svc/Dockerfile", line=7)
+    assert fingerprint(a) == fingerprint(b)
+    assert fingerprint(a) != fingerprint(Finding(LATEST_TAG, ("ubuntu AS build",), file="other/Dockerfile"))
+    assert fingerprint(a) != fingerprint(Finding(SENSITIVE_PORT, ("ubuntu AS build",), file="svc/Dockerfile"))
+
+
+def test_fingerprint_ignores_container_id_but_not_host():
+    a = Finding(PRIVILEGED_CONTAINER, ("web",), container="aaaaaaaaaaaa", host="tcp://a:2376")
+    b = Finding(PRIVILEGED_CONTAINER, ("web",), container="bbbbbbbbbbbb", host="tcp://a:2376")
+    c = Finding(PRIVILEGED_CONTAINER, ("web",), container="aaaaaaaaaaaa", host="tcp://b:2376")
+    assert fingerprint(a) == fingerprint(b) != fingerprint(c)
+
+
+def test_save_and_load_sorted(tmp_path):
+    path = str(tmp_path / "baseline.txt")
+    save_baseline(path, ["ff", "00", "aa", "00"])
+    with open(path) as f:
+        assert f.read() == f"{BASELINE_HEADER}\n00\naa\nff\n"
+    assert load_baseline(path) == {"00", "aa", "ff"}
+    assert load_baseline(str(tmp_path / "missing.txt")) == set()
+
+
+def test_filter_suppresses_known_findings():
+    known = Finding(LATEST_TAG, ("ubuntu",), file="Dockerfile", line=1)
+    new = Finding(SENSITIVE_PORT, (22,), file="Dockerfile", line=2)
+    baseline = BaselineFilter({fingerprint(known)})
+    assert baseline.filter([known, new]) == [new]
+    assert baseline.suppressed == 1
+    assert baseline.seen == {fingerprint(known), fingerprint(new)}
+
+
+def test_fingerprint_paths_are_relative_to_root(tmp_path):
+    root = baseline_root(str(tmp_path / "baseline.txt"))
+    relative = Finding(LATEST_TAG, ("ubuntu",), file=os.path.relpath(tmp_path / "svc" / "Dockerfile"))
+    absolute = Finding(LATEST_TAG, ("ubuntu",), file=str(tmp_path / "svc" / ".." / "svc" / "Dockerfile"))
+    assert fingerprint(relative, root) == fingerprint(absolute, root)
+    assert fingerprint(absolute, root) == fingerprint(Finding(LATEST_TAG, ("ubuntu",), file="svc/Dockerfile"))
+
+
+def run_main(tmp_path, *args, cwd=None):
+    env = dict(os.environ, XDG_CACHE_HOME=str(tmp_path / "cache"))
+    main = os.path.abspath(MAIN)
+    return subprocess.run([sys.executable, main, "--format", "jsonl"] + list(args),
+                          capture_output=True, text=True, env=env, cwd=cwd)
+
+
+def test_cli_reports_and_fails_only_on_new_findings(tmp_path):
+    (tmp_path / "svc").mkdir()
+    dockerfile = tmp_path / "svc" / "Dockerfile"
+    dockerfile.write_text("FROM ubuntu\nUSER app\nHEALTHCHECK CMD true\n")
+    baseline = str(tmp_path / "baseline.txt")
+
+    result = run_main(tmp_path, "--path", str(tmp_path / "svc"), "--baseline", baseline, "--update-baseline")
+    assert result.returncode == 0
+    assert len(load_baseline(baseline)) == 1
+
+    dockerfile.write_text("# comment\nFROM ubuntu\nUSER app\nHEALTHCHECK CMD true\n")
+    result = run_main(tmp_path, "--path", str(tmp_path / "svc"), "--baseline", baseline)
+    assert result.returncode == 0
+    assert result.stdout == ""
+
+    dockerfile.write_text("FROM ubuntu\nUSER app\nHEALTHCHECK CMD true\nEXPOSE 22\n")
+    result = run_main(tmp_path, "--path", str(tmp_path / "svc"), "--baseline", baseline)
+    assert result.returncode == 1
+    assert [json.loads(line)["check"] for line in result.stdout.splitlines()] == ["Sensitive port exposed"]
+
+
+def test_cli_baseline_matches_however_the_path_is_given(tmp_path):
+    (tmp_path / "svc").mkdir()
+    (tmp_path / "svc" / "Dockerfile").write_text("FROM ubuntu\nUSER app\nHEALTHCHECK CMD true\n")
+    baseline = str(tmp_path / "baseline.txt")
+
+    result = run_main(tmp_path, "--path", "./svc", "--baseline", baseline, "--update-baseline", cwd=tmp_path)
+    assert result.returncode == 0
+    for args, cwd in (
+        (["--path", str(tmp_path / "svc")], None),
+        (["--path", "."], tmp_path / "svc"),
+        (["--dockerfile", "svc/Dockerfile"], tmp_path),
+    ):
+        result = run_main(tmp_path, *args, "--baseline", baseline, cwd=cwd)
+        assert (result.returncode, result.stdout) == (0, ""), args
+
+
+def test_cli_dockerfile_findings_name_their_file(tmp_path):
+    for name in ("a", "b"):
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "Dockerfile").write_text("FROM ubuntu\nUSER app\nHEALTHCHECK CMD true\n")
+    baseline = str(tmp_path / "baseline.txt")
+
+    result = run_main(tmp_path, "--dockerfile", str(tmp_path / "a" / "Dockerfile"), "--baseline", baseline,
+                      "--update-baseline")
+    assert json.loads(result.stdout)["file"] == str(tmp_path / "a" / "Dockerfile")
+    result = run_main(tmp_path, "--dockerfile", str(tmp_path / "b" / "Dockerfile"), "--baseline", baseline)
+    assert result.returncode == 1
+    assert json.loads(result.stdout)["file"] == str(tmp_path / "b" / "Dockerfile")
+
+
+def test_cli_new_add_instruction_is_not_suppressed(tmp_path):
+    dockerfile = tmp_path / "Dockerfile"
+    dockerfile.write_text("FROM ubuntu:22.04\nUSER app\nHEALTHCHECK CMD true\nADD a.py /a\n")
+    baseline = str(tmp_path / "baseline.txt")
+    run_main(tmp_path, "--dockerfile", str(dockerfile), "--baseline", baseline, "--update-baseline")
+
+    dockerfile.write_text("FROM ubuntu:22.04\nUSER app\nHEALTHCHECK CMD true\nADD a.py /a\nADD secret.py /s\n")
+    result = run_main(tmp_path, "--dockerfile", str(dockerfile), "--baseline", baseline)
+    assert result.returncode == 1
+    assert [json.loads(line)["details"] for line in result.stdout.splitlines()] == [
+        "Line 5: Use COPY for local files"
+    ]
@@ -0,0 +1,121 @@
+import sys
+import os
+import json
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import scanner
+from scanner import scan_files, cached_check_file, DOCKERFILE
+from utils.cache import ResultCache
+from utils.finding import Finding
+from checks.dockerfile_checks import SENSITIVE_PORT
+
+
+def test_cache_roundtrip(tmp_path):
+    finding = Finding(SENSITIVE_PORT, (22,), file="Dockerfile", line=3)
+    cache = ResultCache(str(tmp_path), "rules-a")
+    cache.put("k", [finding])
+    cache.close()
+
+    cache = ResultCache(str(tmp_path), "rules-a")
+    restored = cache.get("k")
+    assert restored == [finding]
+    assert restored[0].rule is SENSITIVE_PORT
+    assert restored[0].details == "Line 3: Port 22"
+    assert cache.get("missing") is None
+    cache.close()
+
+
+def test_cache_key_depends_on_content_and_ruleset(tmp_path):
+    dockerfile = tmp_path / "Dockerfile"
+    dockerfile.write_text("FROM ubuntu\n")
+    a = ResultCache(str(tmp_path / "cache"), "rules-a")
+    b = ResultCache(str(tmp_path / "cache2"), "rules-b")
+    key = a.file_key(DOCKERFILE, str(dockerfile))
+    assert key != b.file_key(DOCKERFILE, str(dockerfile))
+    dockerfile.write_text("FROM ubuntu:22.04\n")
+    assert key != a.file_key(DOCKERFILE, str(dockerfile))
+    a.close()
+    b.close()
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    finding = [Finding(SENSITIVE_PORT, (22,), line=1)]
+    entry_size = len(json.dumps([f.to_record() for f in finding]))
+    cache = ResultCache(str(tmp_path), "rules", max_bytes=entry_size * 2)
+    cache.put("a", finding)
+    cache.put("b", finding)
+    cache.close()
+
+    cache = ResultCache(str(tmp_path), "rules", max_bytes=entry_size * 2)
+    assert cache.get("a") is not None
+    cache.put("c", finding)
+    cache.close()
+
+    cache = ResultCache(str(tmp_path), "rules", max_bytes=entry_size * 2)
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+    assert cache.get("b") is None
+    cache.close()
+
+
+def test_scan_files_uses_cache(tmp_path, monkeypatch):
+    dockerfile = tmp_path / "Dockerfile"
+    dockerfile.write_text("FROM ubuntu\nEXPOSE 22\n")
+    cache = ResultCache(str(tmp_path / "cache"), "rules")
+    first = scan_files([str(dockerfile)], [], jobs=1, cache=cache)
+    cache.close()
+
+    def fail(kind, path):
+        raise AssertionError("file should not be re-checked")
+
+    monkeypatch.setattr(scanner, "check_file", fail)
+    cache = ResultCache(str(tmp_path / "cache"), "rules")
+    second = scan_files([str(dockerfile)], [], jobs=1, cache=cache)
+    assert second == first
+    assert [f.details for f in cached_check_file(DOCKERFILE, str(dockerfile), cache)] == [
+        f.details for f in first
+    ]
+    cache.close()
+
+
+def test_scan_files_does_not_cache_errors(tmp_path):
+    compose = tmp_path / "docker-compose.yml"
+    compose.write_text("services: [unclosed\n")
+    cache = ResultCache(str(tmp_path / "cache"), "rules")
+    scan_files([], [str(compose)], jobs=1, cache=cache)
+    assert cache.get(cache.file_key("compose", str(compose))) is None
+    cache.close()
+
+
+def test_concurrent_scanners_share_cache(tmp_path):
+    finding = Finding(SENSITIVE_PORT, (22,), file="Dockerfile", line=3)
+    first = ResultCache(str(tmp_path), "rules-a")
+    second = ResultCache(str(tmp_path), "rules-a")
+    first.put("a", [finding])
+    second.put("b", [finding])
+    assert first.get("a") == [finding]
+    assert second.get("a") is None
+    second.close()
+    first.close()
+
+    cache = ResultCache(str(tmp_path), "rules-a")
+    assert cache.get("a") == [finding] and cache.get("b") == [finding]
+    cache.close()
+
+
+def test_locked_cache_is_a_miss(tmp_path):
+    import sqlite3
+    finding = Finding(SENSITIVE_PORT, (22,), file="Dockerfile", line=3)
+    cache = ResultCache(str(tmp_path), "rules-a")
+    cache.put("a", [finding])
+    cache.close()
+
+    cache = ResultCache(str(tmp_path), "rules-a")
+    cache._db.execute("PRAGMA busy_timeout = 0")
+    holder = sqlite3.connect(str(tmp_path / "results.sqlite"))
+    holder.execute("BEGIN EXCLUSIVE")
+    assert cache.get("a") is None
+    cache.put("b", [finding])
+    cache.close()
+    holder.rollback()
+    holder.close()
@@ -0,0 +1,83 @@
+import sys
+import os
+import subprocess
+import pytest
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.discovery import discover_changed_files
+
+
+def git(repo, *args):
+    subprocess.run(["git", "-C", str(repo), *args], check=True, capture_output=True)
+
+
+def write(path, content):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+
+
+@pytest.fixture
+def repo(tmp_path):
+    git(tmp_path, "init", "-q")
+    git(tmp_path, "config", "user.email", "ci@example.com")
+    git(tmp_path, "config", "user.name", "ci")
+    write(tmp_path / "api" / "Dockerfile", "FROM python:3.12\n")
+    write(tmp_path / "web" / "Dockerfile", "FROM node:20\n")
+    write(tmp_path / "worker" / "build.dockerfile", "FROM alpine:3\n")
+    write(tmp_path / "docker-compose.yml",
+          "services:\n  api:\n    build: ./api\n  web:\n    image: web:1\n")
+    write(tmp_path / "deploy" / "compose.worker.yaml",
+          "services:\n  worker:\n    build:\n      context: ../worker\n      dockerfile: build.dockerfile\n")
+    write(tmp_path / "deploy" / "compose.static.yaml", "services:\n  cdn:\n    image: nginx:1.25\n")
+    git(tmp_path, "add", "-A")
+    git(tmp_path, "commit", "-q", "-m", "initial")
+    return tmp_path
+
+
+def relative(repo, paths):
+    return [os.path.relpath(path, repo) for path in paths]
+
+
+def test_no_changes(repo):
+    assert discover_changed_files(str(repo), "HEAD") == ([], [])
+
+
+def test_changed_dockerfile_pulls_in_compose_files_that_build_it(repo):
+    write(repo / "api" / "Dockerfile", "FROM python:3.13\n")
+    write(repo / "worker" / "build.dockerfile", "FROM alpine:3.20\n")
+    git(repo, "add", "worker/build.dockerfile")
+    dockerfiles, compose_files = discover_changed_files(str(repo), "HEAD")
+    assert relative(repo, dockerfiles) == [os.path.join("api", "Dockerfile"), os.path.join("worker", "build.dockerfile")]
+    assert relative(repo, compose_files) == [os.path.join("deploy", "compose.worker.yaml"), "docker-compose.yml"]
+
+
+def test_committed_untracked_and_deleted_changes(repo):
+    git(repo, "tag", "base")
+    write(repo / "deploy" / "compose.static.yaml", "services:\n  cdn:\n    image: nginx:latest\n")
+    git(repo, "commit", "-q", "-am", "bump")
+    write(repo / "new" / "Dockerfile.prod", "FROM ubuntu\n")
+    write(repo / "node_modules" / "pkg" / "Dockerfile", "FROM ignored\n")
+    (repo / "web" / "Dockerfile").unlink()
+    dockerfiles, compose_files = discover_changed_files(str(repo), "base")
+    assert relative(repo, dockerfiles) == [os.path.join("new", "Dockerfile.prod")]
+    assert relative(repo, compose_files) == [os.path.join("deploy", "compose.static.yaml")]
+
+
+def test_scoped_to_subdirectory(repo):
+    write(repo / "api" / "Dockerfile", "FROM python:3.13\n")
+    write(repo / "deploy" / "compose.static.yaml", "services:\n  cdn:\n    image: nginx:latest\n")
+    dockerfiles, compose_files = discover_changed_files(str(repo / "deploy"), "HEAD")
+    assert dockerfiles == []
+    assert relative(repo, compose_files) == [os.path.join("deploy", "compose.static.yaml")]
+
+
+def test_bad_ref(repo):
+    with pytest.raises(ValueError):
+        discover_changed_files(str(repo), "no-such-ref")
+
+
+def test_option_like_ref_is_rejected(repo, tmp_path):
+    output = tmp_path / "written-by-git"
+    with pytest.raises(ValueError, match="Not a commit"):
+        discover_changed_files(str(repo), f"--output={output}")
+    assert not output.exists()
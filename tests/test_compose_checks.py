@@ -162,3 +162,53 @@ def test_malformed_service():
     }
     findings = run_compose_checks(config)
     assert isinstance(findings, list)
+
+
+def test_null_services_and_deploy():
+    assert run_compose_checks({"services": None}) == []
+    config = {
+        "services": {
+            "web": {"image": "nginx:1.21", "user": "app", "deploy": None}
+        }
+    }
+    findings = check_missing_resource_limits(config)
+    assert len(findings) == 2
+
+
+def test_run_compose_checks_keeps_rule_order():
+    config = {
+        "services": {
+            "a": {"image": "nginx", "user": "app", "mem_limit": "1g", "cpus": "1"},
+            "b": {"image": "redis:7", "privileged": True, "mem_limit": "1g", "cpus": "1"}
+        }
+    }
+    checks = [f["check"] for f in run_compose_checks(config)]
+    assert checks == [
+        "Container running as root",
+        "Privileged mode enabled",
+        "Unpinned image version",
+    ]
+
+
+def test_check_sensitive_ports_in_ranges_and_long_syntax():
+    config = {
+        "services": {
+            "db": {
+                "image": "postgres:16",
+                "ports": [
+                    "127.0.0.1:5432:5432",
+                    "20-25:20-25",
+                    {"target": 6379, "published": 6379},
+                    "127.0.0.1::3306",
+                    "8080:80",
+                ],
+            }
+        }
+    }
+    findings = check_exposed_ports_without_mapping(config)
+    assert [f["details"] for f in findings] == [
+        "Service 'db' maps sensitive port 5432",
+        "Service 'db' maps sensitive port 22",
+        "Service 'db' maps sensitive port 6379",
+    ]
+
@@ -8,12 +8,15 @@ from checks.dockerfile_checks import (
     check_sensitive_ports,
     check_add_instead_of_copy,
     check_missing_healthcheck,
-    run_dockerfile_checks
+    run_dockerfile_checks,
+    run_rules,
+    DockerfileRule
 )
+from utils.file_loader import parse_dockerfile
 
 
 def test_check_latest_tag():
-    lines = ["FROM ubuntu:latest", "RUN apt-get update"]
+    lines = parse_dockerfile(["FROM ubuntu:latest", "RUN apt-get update"])
     findings = check_latest_tag(lines)
     assert len(findings) == 1
     assert findings[0]["severity"] == "HIGH"
@@ -21,20 +24,20 @@ def test_check_latest_tag():
 
 
 def test_check_latest_tag_implicit():
-    lines = ["FROM ubuntu", "RUN apt-get update"]
+    lines = parse_dockerfile(["FROM ubuntu", "RUN apt-get update"])
     findings = check_latest_tag(lines)
     assert len(findings) == 1
     assert findings[0]["severity"] == "HIGH"
 
 
 def test_check_latest_tag_with_version():
-    lines = ["FROM ubuntu:20.04", "RUN apt-get update"]
+    lines = parse_dockerfile(["FROM ubuntu:20.04", "RUN apt-get update"])
     findings = check_latest_tag(lines)
     assert len(findings) == 0
 
 
 def test_check_missing_user():
-    lines = ["FROM ubuntu:20.04", "RUN apt-get update"]
+    lines = parse_dockerfile(["FROM ubuntu:20.04", "RUN apt-get update"])
     findings = check_missing_user(lines)
     assert len(findings) == 1
     assert findings[0]["severity"] == "MEDIUM"
@@ -42,13 +45,13 @@ def test_check_missing_user():
 
 
 def test_check_missing_user_with_user():
-    lines = ["FROM ubuntu:20.04", "USER nobody"]
+    lines = parse_dockerfile(["FROM ubuntu:20.04", "USER nobody"])
     findings = check_missing_user(lines)
     assert len(findings) == 0
 
 
 def test_check_sensitive_ports():
-    lines = ["FROM ubuntu:20.04", "EXPOSE 22", "EXPOSE 80"]
+    lines = parse_dockerfile(["FROM ubuntu:20.04", "EXPOSE 22", "EXPOSE 80"])
     findings = check_sensitive_ports(lines)
     assert len(findings) == 1
     assert findings[0]["severity"] == "HIGH"
@@ -56,13 +59,13 @@ def test_check_sensitive_ports():
 
 
 def test_check_sensitive_ports_none():
-    lines = ["FROM ubuntu:20.04", "EXPOSE 8080"]
+    lines = parse_dockerfile(["FROM ubuntu:20.04", "EXPOSE 8080"])
     findings = check_sensitive_ports(lines)
     assert len(findings) == 0
 
 
 def test_check_add_instead_of_copy():
-    lines = ["FROM ubuntu:20.04", "ADD app.py /app/", "COPY config.json /config/"]
+    lines = parse_dockerfile(["FROM ubuntu:20.04", "ADD app.py /app/", "COPY config.json /config/"])
     findings = check_add_instead_of_copy(lines)
     assert len(findings) == 1
     assert findings[0]["severity"] == "LOW"
@@ -70,13 +73,13 @@ def test_check_add_instead_of_copy():
 
 
 def test_check_add_for_archive():
-    lines = ["FROM ubuntu:20.04", "ADD archive.tar.gz /app/"]
+    lines = parse_dockerfile(["FROM ubuntu:20.04", "ADD archive.tar.gz /app/"])
     findings = check_add_instead_of_copy(lines)
     assert len(findings) == 0
 
 
 def test_check_missing_healthcheck():
-    lines = ["FROM ubuntu:20.04", "RUN apt-get update"]
+    lines = parse_dockerfile(["FROM ubuntu:20.04", "RUN apt-get update"])
     findings = check_missing_healthcheck(lines)
     assert len(findings) == 1
     assert findings[0]["severity"] == "LOW"
@@ -84,18 +87,118 @@ def test_check_missing_healthcheck():
 
 
 def test_check_missing_healthcheck_with_healthcheck():
-    lines = ["FROM ubuntu:20.04", "HEALTHCHECK CMD curl localhost"]
+    lines = parse_dockerfile(["FROM ubuntu:20.04", "HEALTHCHECK CMD curl localhost"])
     findings = check_missing_healthcheck(lines)
     assert len(findings) == 0
 
 
 def test_run_dockerfile_checks():
-    lines = ["FROM ubuntu", "EXPOSE 22", "RUN apt-get update"]
+    lines = parse_dockerfile(["FROM ubuntu", "EXPOSE 22", "RUN apt-get update"])
     findings = run_dockerfile_checks(lines)
     assert len(findings) >= 3
 
 
 def test_empty_dockerfile():
-    lines = []
+    lines = parse_dockerfile([])
     findings = run_dockerfile_checks(lines)
     assert isinstance(findings, list)
+
+
+def test_parse_dockerfile_continuations_and_comments():
+    lines = [
+        "# syntax comment",
+        "from ubuntu:22.04 AS build",
+        "RUN apt-get update && \\",
+        "    # inline comment is dropped",
+        "    apt-get install -y curl",
+        "",
+        "FROM alpine:3.19",
+        "user nobody",
+    ]
+    instructions = parse_dockerfile(lines)
+    assert [ins.keyword for ins in instructions] == ["FROM", "RUN", "FROM", "USER"]
+    assert instructions[1].args == "apt-get update && apt-get install -y curl"
+    assert (instructions[1].start_line, instructions[1].end_line) == (3, 5)
+    assert [ins.stage for ins in instructions] == [0, 0, 1, 1]
+
+
+def test_parse_dockerfile_escape_directive():
+    lines = ["# escape=`", "FROM mcr.microsoft.com/windows:ltsc2022", "RUN dir c:\\ `", "    && echo done"]
+    instructions = parse_dockerfile(lines)
+    assert len(instructions) == 2
+    assert instructions[1].args == "dir c:\\ && echo done"
+
+
+def test_parse_dockerfile_heredoc():
+    lines = ["FROM alpine:3.19", "RUN <<EOF", "USER root", "EOF", "USER app"]
+    instructions = parse_dockerfile(lines)
+    assert [ins.keyword for ins in instructions] == ["FROM", "RUN", "USER"]
+    assert instructions[2].args == "app"
+
+
+def test_parse_dockerfile_here_string_is_not_heredoc():
+    lines = ["FROM alpine:3.19", "RUN grep -q x <<< hello", "RUN cat <<-EOF", "\tx", "\tEOF", "USER app", "EXPOSE 22"]
+    instructions = parse_dockerfile(lines)
+    assert [ins.keyword for ins in instructions] == ["FROM", "RUN", "RUN", "USER", "EXPOSE"]
+    assert instructions[1].args == "grep -q x <<< hello"
+    assert instructions[2].args == "cat <<-EOF\n\tx"
+    assert [f.check for f in run_dockerfile_checks(instructions)] == ["Sensitive port exposed", "Missing HEALTHCHECK"]
+
+
+def test_check_latest_tag_lowercase_instruction():
+    lines = parse_dockerfile(["from ubuntu"])
+    findings = check_latest_tag(lines)
+    assert len(findings) == 1
+
+
+def test_check_latest_tag_ignores_stage_alias():
+    lines = parse_dockerfile([
+        "FROM --platform=linux/amd64 golang:1.22 AS builder",
+        "FROM builder",
+        "FROM scratch",
+    ])
+    findings = check_latest_tag(lines)
+    assert len(findings) == 0
+
+
+def test_check_add_multiline():
+    lines = parse_dockerfile(["FROM alpine:3.19", "ADD \\", "    app.py /app/"])
+    findings = check_add_instead_of_copy(lines)
+    assert len(findings) == 1
+    assert "Line 2" in findings[0]["details"]
+
+
+def test_run_rules_dispatches_by_keyword():
+    seen = []
+
+    def on_run(ins, state):
+        seen.append(ins.keyword)
+        state["count"] = state.get("count", 0) + 1
+        return []
+
+    def on_finish(state):
+        return [{"severity": "LOW", "check": "RUN count", "details": str(state.get("count", 0))}]
+
+    rule = DockerfileRule("count_runs", ("run",), on_run, on_finish)
+    lines = parse_dockerfile(["FROM alpine:3.19", "RUN a", "COPY x /x", "RUN b"])
+    findings = run_rules(lines, [rule])
+    assert seen == ["RUN", "RUN"]
+    assert findings == [{"severity": "LOW", "check": "RUN count", "details": "2"}]
+
+
+def test_run_dockerfile_checks_keeps_rule_order():
+    lines = parse_dockerfile(["EXPOSE 22", "FROM ubuntu"])
+    checks = [f["check"] for f in run_dockerfile_checks(lines)]
+    assert checks == [
+        "Latest tag detected",
+        "Missing USER directive",
+        "Sensitive port exposed",
+        "Missing HEALTHCHECK",
+    ]
+
+
+def test_check_sensitive_ports_in_expose_range():
+    lines = parse_dockerfile(["FROM ubuntu:20.04", "EXPOSE 20-25/tcp 8080 ${PORT}"])
+    findings = check_sensitive_ports(lines)
+    assert [f["details"] for f in findings] == ["Line 2: Port 22"]
+
@@ -0,0 +1,100 @@
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import yaml
+from utils import file_loader
+from utils.file_loader import load_compose_file, merge_compose
+
+
+def test_load_compose_file_uses_c_loader_when_available():
+    if yaml.__with_libyaml__:
+        assert file_loader._yaml_loader() is yaml.CSafeLoader
+    else:
+        assert file_loader._yaml_loader() is yaml.SafeLoader
+
+
+def test_load_compose_file_multi_document(tmp_path):
+    path = tmp_path / "docker-compose.yml"
+    path.write_text(
+        "services:\n  web:\n    image: nginx:1.25\n    ports: ['8080:80']\n"
+        "---\n"
+        "services:\n  web:\n    user: app\n    ports: ['8443:443']\n  db:\n    image: postgres:16\n"
+    )
+    config = load_compose_file(str(path))
+    assert config["services"]["web"] == {"image": "nginx:1.25", "ports": ["8080:80", "8443:443"], "user": "app"}
+    assert config["services"]["db"] == {"image": "postgres:16"}
+
+
+def test_load_compose_file_with_overrides(tmp_path):
+    base = tmp_path / "docker-compose.yml"
+    base.write_text(
+        "services:\n"
+        "  web:\n"
+        "    image: nginx:1.25\n"
+        "    command: ['nginx', '-g', 'daemon off;']\n"
+        "    deploy: {resources: {limits: {memory: 256m}}}\n"
+    )
+    override = tmp_path / "docker-compose.prod.yml"
+    override.write_text(
+        "services:\n"
+        "  web:\n"
+        "    image: nginx:1.27\n"
+        "    command: ['nginx']\n"
+        "    deploy: {resources: {limits: {cpus: '0.5'}}}\n"
+    )
+    config = load_compose_file(str(base), str(override))
+    web = config["services"]["web"]
+    assert web["image"] == "nginx:1.27"
+    assert web["command"] == ["nginx"]
+    assert web["deploy"]["resources"]["limits"] == {"memory": "256m", "cpus": "0.5"}
+
+
+def test_load_compose_file_parses_each_file_once(tmp_path, monkeypatch):
+    base = tmp_path / "docker-compose.yml"
+    base.write_text("services:\n  web:\n    image: nginx:1.25\n    ports: ['80:80']\n")
+    override = tmp_path / "docker-compose.override.yml"
+    override.write_text("services:\n  web:\n    user: app\n")
+    parsed = []
+    parse = file_loader._parse_compose
+    monkeypatch.setattr(file_loader, "_parse_compose", lambda path: parsed.append(path) or parse(path))
+
+    config = load_compose_file(str(base), str(override), str(tmp_path / "." / "docker-compose.yml"))
+    assert len(parsed) == 2
+    assert config["services"]["web"] == {"image": "nginx:1.25", "ports": ["80:80"], "user": "app"}
+
+    # Nothing is kept between calls.
+    load_compose_file(str(base))
+    assert len(parsed) == 3
+
+
+def test_load_compose_file_copies_lists(tmp_path):
+    base = tmp_path / "docker-compose.yml"
+    base.write_text(
+        "services:\n  web:\n    ports: ['80:80']\n    volumes:\n      - {type: bind, source: /data, target: /data}\n"
+    )
+    override = tmp_path / "docker-compose.override.yml"
+    override.write_text("services:\n  web:\n    ports: ['443:443']\n")
+
+    config = load_compose_file(str(base))
+    config["services"]["web"]["ports"].append("22:22")
+    config["services"]["web"]["volumes"][0]["source"] = "/"
+    merged = load_compose_file(str(base), str(override))
+    merged["services"]["web"]["ports"].append("23:23")
+
+    web = load_compose_file(str(base), str(override))["services"]["web"]
+    assert web["ports"] == ["80:80", "443:443"]
+    assert web["volumes"][0]["source"] == "/data"
+
+
+def test_load_compose_file_empty(tmp_path):
+    path = tmp_path / "docker-compose.yml"
+    path.write_text("")
+    assert load_compose_file(str(path)) == {}
+
+
+def test_merge_compose_replaces_scalars_and_mixed_types():
+    base = {"services": {"web": {"environment": ["A=1"], "user": "root"}}}
+    override = {"services": {"web": {"environment": {"B": "2"}, "user": "app"}}}
+    merged = merge_compose(base, override)
+    assert merged["services"]["web"] == {"environment": {"B": "2"}, "user": "app"}
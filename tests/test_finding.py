@@ -0,0 +1,56 @@
+import sys
+import os
+import pickle
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from checks.compose_checks import UNPINNED_IMAGE, run_compose_checks
+from utils.finding import Finding, Severity, get_rule
+
+
+def test_finding_has_no_instance_dict():
+    finding = Finding(UNPINNED_IMAGE, ("nginx",), service="web")
+    assert not hasattr(finding, "__dict__")
+
+
+def test_finding_formats_details_lazily():
+    finding = Finding(UNPINNED_IMAGE, ("nginx",), service="web")
+    assert finding.details == "Service 'web' uses latest or no tag: nginx"
+    assert finding.severity is Severity.HIGH
+    assert finding.rule_id == "DC007"
+
+
+def test_finding_to_dict_keeps_json_shape():
+    finding = Finding(UNPINNED_IMAGE, ("nginx",), service="web", file="docker-compose.yml")
+    assert finding.to_dict() == {
+        "severity": "HIGH",
+        "check": "Unpinned image version",
+        "details": "Service 'web' uses latest or no tag: nginx",
+        "file": "docker-compose.yml",
+        "service": "web",
+    }
+    assert finding["severity"] == "HIGH"
+    assert finding.get("line") is None
+    assert "service" in finding
+
+
+def test_findings_share_interned_rule():
+    config = {"services": {f"svc-{i}": {"image": "nginx", "user": "app"} for i in range(3)}}
+    findings = [f for f in run_compose_checks(config) if f.rule_id == "DC007"]
+    assert len({id(f.rule) for f in findings}) == 1
+
+
+def test_finding_pickle_resolves_registered_rule():
+    finding = Finding(UNPINNED_IMAGE, ("nginx",), service="web")
+    restored = pickle.loads(pickle.dumps(finding))
+    assert restored == finding
+    assert restored.rule is get_rule("DC007")
+
+
+def test_severity_rank():
+    assert Severity.HIGH.rank > Severity.MEDIUM.rank > Severity.LOW.rank
+
+
+def test_finding_record_roundtrip_keeps_host():
+    finding = Finding(UNPINNED_IMAGE, ("nginx",), container="0123456789ab", host="tcp://node-1:2376")
+    assert Finding.from_record(finding.to_record()) == finding
+    assert finding.to_dict()["host"] == "tcp://node-1:2376"
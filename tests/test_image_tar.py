@@ -0,0 +1,144 @@
+import sys
+import os
+import io
+import json
+import gzip
+import hashlib
+import tarfile
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.image_tar import read_image_configs, load_image_tar, _collect_metadata
+from checks.image_checks import run_image_checks
+from scanner import scan_image_tar
+
+LAYER_SIZE = 8 * 1024 * 1024
+
+
+def image_config(**config) -> dict:
+    return {"architecture": "amd64", "os": "linux", "config": config, "rootfs": {"type": "layers"}}
+
+
+def add_member(archive, name, data: bytes) -> None:
+    info = tarfile.TarInfo(name)
+    info.size = len(data)
+    archive.addfile(info, io.BytesIO(data))
+
+
+def docker_save_tar(config: dict, repo_tags: list) -> bytes:
+    buffer = io.BytesIO()
+    config_data = json.dumps(config).encode()
+    config_name = hashlib.sha256(config_data).hexdigest() + ".json"
+    with tarfile.open(fileobj=buffer, mode="w") as archive:
+        add_member(archive, "abc123/layer.tar", b"\0" * LAYER_SIZE)
+        add_member(archive, "abc123/json", b"{}")
+        add_member(archive, config_name, config_data)
+        manifest = [{"Config": config_name, "RepoTags": repo_tags, "Layers": ["abc123/layer.tar"]}]
+        add_member(archive, "manifest.json", json.dumps(manifest).encode())
+    return buffer.getvalue()
+
+
+def oci_tar(config: dict, name: str, layer: bytes = b"") -> bytes:
+    buffer = io.BytesIO()
+
+    def blob(document) -> str:
+        data = json.dumps(document).encode()
+        digest = "sha256:" + hashlib.sha256(data).hexdigest()
+        add_member(archive, "blobs/sha256/" + digest.partition(":")[2], data)
+        return digest
+
+    with tarfile.open(fileobj=buffer, mode="w") as archive:
+        layers = []
+        if layer:
+            digest = "sha256:" + hashlib.sha256(layer).hexdigest()
+            add_member(archive, "blobs/sha256/" + digest.partition(":")[2], layer)
+            layers.append({"digest": digest})
+        config_digest = blob(config)
+        manifest_digest = blob({"schemaVersion": 2, "config": {"digest": config_digest}, "layers": layers})
+        nested_digest = blob({"schemaVersion": 2, "manifests": [{"digest": manifest_digest}]})
+        index = {
+            "schemaVersion": 2,
+            "manifests": [{"digest": nested_digest, "annotations": {"io.containerd.image.name": name}}],
+        }
+        add_member(archive, "index.json", json.dumps(index).encode())
+        add_member(archive, "oci-layout", b'{"imageLayoutVersion": "1.0.0"}')
+    return buffer.getvalue()
+
+
+class CountingReader(io.BytesIO):
+    def __init__(self, data: bytes):
+        super().__init__(data)
+        self.bytes_read = 0
+
+    def read(self, size=-1):
+        data = super().read(size)
+        self.bytes_read += len(data)
+        return data
+
+
+def test_seekable_read_skips_layer_data():
+    data = docker_save_tar(image_config(User="app"), ["registry.local/app:1.0"])
+    reader = CountingReader(data)
+    images = read_image_configs(reader, seekable=True)
+    assert [image.name for image in images] == ["registry.local/app:1.0"]
+    assert images[0].config["config"] == {"User": "app"}
+    assert reader.bytes_read < LAYER_SIZE // 100
+
+
+def test_streaming_gzip_archive(tmp_path):
+    path = tmp_path / "image.tar.gz"
+    path.write_bytes(gzip.compress(docker_save_tar(image_config(), ["nginx:latest"])))
+    images = load_image_tar(str(path))
+    assert [image.name for image in images] == ["nginx:latest"]
+
+
+def test_oci_layout_with_nested_index():
+    images = read_image_configs(io.BytesIO(oci_tar(image_config(User="1000"), "docker.io/library/redis:7")))
+    assert [image.name for image in images] == ["docker.io/library/redis:7"]
+    assert images[0].config["config"]["User"] == "1000"
+
+
+def test_streaming_oci_archive_keeps_only_json_blobs():
+    layer = gzip.compress(os.urandom(1024 * 1024))
+    data = oci_tar(image_config(User="1000"), "redis:7", layer)
+    with tarfile.open(fileobj=io.BytesIO(data), mode="r|*") as archive:
+        members = _collect_metadata(archive, seekable=False)
+    assert "blobs/sha256/" + hashlib.sha256(layer).hexdigest() not in members
+    assert len(members) == 4
+    images = read_image_configs(io.BytesIO(gzip.compress(data)))
+    assert [image.name for image in images] == ["redis:7"]
+
+
+def test_archive_without_manifest():
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w") as archive:
+        add_member(archive, "layer.tar", b"data")
+    buffer.seek(0)
+    try:
+        read_image_configs(buffer, seekable=True)
+        assert False, "expected ValueError"
+    except ValueError as e:
+        assert "manifest.json" in str(e)
+
+
+def test_image_checks_reuse_dockerfile_rules():
+    config = image_config(ExposedPorts={"22/tcp": {}, "8080/tcp": {}})
+    images = read_image_configs(io.BytesIO(docker_save_tar(config, ["nginx:latest"])))
+    findings = run_image_checks(images[0])
+    assert [(f.rule_id, f.details) for f in findings] == [
+        ("IM001", "Image nginx:latest uses latest or no tag"),
+        ("IM002", "Image nginx:latest runs as root"),
+        ("IM003", "Image nginx:latest exposes port 22"),
+        ("IM005", "Image nginx:latest has no health monitoring configured"),
+    ]
+
+
+def test_scan_image_tar_clean_image(tmp_path):
+    config = image_config(User="app", Healthcheck={"Test": ["CMD", "curl", "-f", "http://localhost/"]})
+    path = tmp_path / "app.tar"
+    path.write_bytes(docker_save_tar(config, ["app:1.4.2"]))
+    assert scan_image_tar(str(path)) == []
+
+    path.write_bytes(docker_save_tar(image_config(User="app"), ["app:1.4.2"]))
+    findings = scan_image_tar(str(path))
+    assert [f.check for f in findings] == ["Missing HEALTHCHECK"]
+    assert findings[0].file == str(path)
@@ -0,0 +1,127 @@
+import sys
+import os
+import io
+import gzip
+import json
+import pytest
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from fake_docker import make_container
+from utils.inspect_dump import InspectRecord, iter_json_values, iter_inspect_records
+from scanner import iter_inspect_dump_checks, iter_inspect_dumps
+
+SAFE = {"Memory": 1 << 28, "CpuShares": 512}
+
+
+def test_iter_json_values_array_across_chunks():
+    records = [{"Id": f"{i:064x}", "Pad": "x" * i} for i in range(50)]
+    stream = io.StringIO(json.dumps(records, indent=2))
+    assert list(iter_json_values(stream, chunk_size=7)) == records
+
+
+def test_iter_json_values_jsonl_and_appended_arrays():
+    text = '{"a": 1}\n{"a": 2}\n[{"a": 3}, {"a": 4}]\n[\n]\n[{"a": 5}]12 [[6]]'
+    assert list(iter_json_values(io.StringIO(text), chunk_size=3)) == [
+        {"a": 1}, {"a": 2}, {"a": 3}, {"a": 4}, {"a": 5}, 12, [6]
+    ]
+
+
+def test_iter_json_values_errors():
+    with pytest.raises(ValueError):
+        list(iter_json_values(io.StringIO('[{"a": 1}, {"a": '), chunk_size=4))
+    with pytest.raises(ValueError):
+        list(iter_json_values(io.StringIO('[{"a": 1}'), chunk_size=4))
+    with pytest.raises(ValueError):
+        list(iter_json_values(io.StringIO('{"a": "' + "x" * 100), chunk_size=8, max_record=32))
+
+
+def test_inspect_record_adapter():
+    record = InspectRecord(make_container(3))
+    assert record.name == "container-3"
+    assert record.id == make_container(3)["Id"]
+
+
+def test_iter_inspect_records_gzip(tmp_path):
+    path = tmp_path / "dump.json.gz"
+    with gzip.open(path, "wt") as f:
+        json.dump([make_container(1), make_container(2)], f)
+    assert [record.name for record in iter_inspect_records(str(path))] == ["container-1", "container-2"]
+
+
+def test_inspect_dump_checks_tag_file_and_container(tmp_path):
+    path = tmp_path / "inspect.jsonl"
+    path.write_text("\n".join(json.dumps(c) for c in [
+        make_container(1, Privileged=True, **SAFE),
+        make_container(2, **SAFE),
+        make_container(3, NetworkMode="host", **SAFE),
+    ]))
+    batches = list(iter_inspect_dump_checks(str(path), batch_size=1))
+    assert [[f.check for f in batch] for batch in batches] == [["Privileged container"], ["Host network mode"]]
+    assert batches[0][0].file == str(path)
+    assert batches[0][0].container == make_container(1)["Id"][:12]
+
+
+def test_inspect_dump_read_error_keeps_earlier_findings(tmp_path):
+    path = tmp_path / "broken.json"
+    path.write_text(json.dumps([make_container(1, Privileged=True, **SAFE)])[:-1] + ", [1, 2")
+    findings = [f for batch in iter_inspect_dump_checks(str(path)) for f in batch]
+    assert [f.check for f in findings] == ["Privileged container", "Inspect dump read error"]
+
+
+def test_inspect_dumps_parallel_matches_serial(tmp_path):
+    paths = []
+    for n in range(4):
+        path = tmp_path / f"host-{n}.json"
+        path.write_text(json.dumps([make_container(n * 10 + i, Privileged=i % 2 == 0) for i in range(30)]))
+        paths.append(str(path))
+
+    def collect(jobs):
+        batches = iter_inspect_dumps(paths, jobs=jobs)
+        return sorted(repr((f.file, f.container, f.check)) for batch in batches for f in batch)
+
+    serial = collect(1)
+    assert len(serial) == 4 * (30 * 2 + 15)
+    assert collect(3) == serial
+
+
+def test_inspect_dumps_parallel_stops_early(tmp_path):
+    paths = []
+    for n in range(3):
+        path = tmp_path / f"host-{n}.jsonl"
+        path.write_text("\n".join(json.dumps(make_container(i, Privileged=True)) for i in range(5000)))
+        paths.append(str(path))
+    batches = iter_inspect_dumps(paths, jobs=2)
+    first = next(batches)
+    batches.close()
+    assert first[0].file in paths
+
+
+def test_cli_scans_dumps_in_parallel(tmp_path):
+    import subprocess
+    paths = []
+    for n in range(2):
+        path = tmp_path / f"host-{n}.json"
+        path.write_text(json.dumps([make_container(n * 10 + i, Privileged=True, **SAFE) for i in range(3)]))
+        paths.append(str(path))
+    main = os.path.join(os.path.dirname(__file__), '..', 'src', 'main.py')
+    # A fresh interpreter, so nothing has imported the runtime rules yet.
+    result = subprocess.run(
+        [sys.executable, main, "--format", "jsonl", "--jobs", "2",
+         "--inspect-dump", paths[0], "--inspect-dump", paths[1]],
+        capture_output=True, text=True
+    )
+    assert result.returncode == 1, result.stderr
+    findings = [json.loads(line) for line in result.stdout.splitlines()]
+    assert len(findings) == 6
+    assert {finding["check"] for finding in findings} == {"Privileged container"}
+    assert {finding["file"] for finding in findings} == set(paths)
+
+
+def test_truncated_gzip_dump_is_a_read_error(tmp_path):
+    path = tmp_path / "dump.json.gz"
+    data = gzip.compress(json.dumps([make_container(i, Privileged=True) for i in range(200)]).encode())
+    path.write_bytes(data[:len(data) // 2])
+    findings = [f for batch in iter_inspect_dump_checks(str(path)) for f in batch]
+    assert findings[-1].check == "Inspect dump read error"
+    assert findings[-1].file == str(path)
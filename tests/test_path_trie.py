@@ -0,0 +1,55 @@
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.path_trie import HostPathMatcher, PathTrie, split_path
+
+ALIASES = {"/var/run": "/run"}
+
+
+def test_split_path_normalises():
+    assert split_path("/etc/") == ("etc",)
+    assert split_path("//data/../etc/./ssl//") == ("etc", "ssl")
+    assert split_path("/") == ()
+    assert split_path("relative/path") is None
+
+
+def test_longest_prefix_returns_deepest_match():
+    trie = PathTrie()
+    trie.insert(("etc",), "etc")
+    trie.insert(("etc", "ssl"), "ssl")
+    assert trie.longest_prefix(("etc", "ssl", "private")) == ("ssl", 2)
+    assert trie.longest_prefix(("etc", "passwd")) == ("etc", 1)
+    assert trie.longest_prefix(("home",)) == (None, 0)
+
+
+def test_matcher_matches_components_not_string_prefixes():
+    matcher = HostPathMatcher(["/etc", "/proc"])
+    assert matcher.match("/etc") == "/etc"
+    assert matcher.match("/etc/nginx/") == "/etc"
+    assert matcher.match("/etcetera") is None
+    assert matcher.match("/data/../etc/passwd") == "/etc"
+    assert matcher.match("volume-name") is None
+
+
+def test_matcher_root_only_matches_itself():
+    matcher = HostPathMatcher(["/", "/sys"])
+    assert matcher.match("/") == "/"
+    assert matcher.match("//") == "/"
+    assert matcher.match("/data") is None
+    assert matcher.match("/sys/fs/cgroup") == "/sys"
+
+
+def test_matcher_resolves_aliases_on_both_sides():
+    matcher = HostPathMatcher(["/var/run/docker.sock", "/run/containerd"], ALIASES)
+    assert matcher.match("/run/docker.sock") == "/run/docker.sock"
+    assert matcher.match("/var/run/docker.sock") == "/run/docker.sock"
+    assert matcher.match("/var/run/containerd/containerd.sock") == "/run/containerd"
+    assert matcher.match("/var/runtime") is None
+
+
+def test_matcher_scales_with_large_policy():
+    policy = [f"/srv/tenant-{i}/secrets" for i in range(5_000)]
+    matcher = HostPathMatcher(policy)
+    assert matcher.match("/srv/tenant-4999/secrets/key.pem") == "/srv/tenant-4999/secrets"
+    assert matcher.match("/srv/tenant-4999/public") is None
@@ -0,0 +1,55 @@
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.ports import PortIndex, PortMapping, PortRange, parse_compose_port, parse_expose, parse_port_range
+
+
+def test_parse_port_range():
+    assert parse_port_range("22") == PortRange(22, 22)
+    assert parse_port_range(" 8000-9000 ") == PortRange(8000, 9000)
+    assert parse_port_range("9000-8000") is None
+    assert parse_port_range("70000") is None
+    assert parse_port_range("${PORT}") is None
+
+
+def test_parse_expose():
+    assert parse_expose("53/udp") == PortRange(53, 53)
+    assert parse_expose("8000-8010/tcp") == PortRange(8000, 8010)
+
+
+def test_parse_compose_port_short_syntax():
+    assert parse_compose_port("80") == PortMapping(None, None, PortRange(80, 80), "tcp")
+    assert parse_compose_port(80) == PortMapping(None, None, PortRange(80, 80), "tcp")
+    assert parse_compose_port("2222:22") == PortMapping(None, PortRange(2222, 2222), PortRange(22, 22), "tcp")
+    assert parse_compose_port("127.0.0.1:5432:5432/tcp") == PortMapping(
+        "127.0.0.1", PortRange(5432, 5432), PortRange(5432, 5432), "tcp"
+    )
+    assert parse_compose_port("127.0.0.1::80") == PortMapping("127.0.0.1", None, PortRange(80, 80), "tcp")
+    assert parse_compose_port("[::1]:6379:6379/udp") == PortMapping(
+        "::1", PortRange(6379, 6379), PortRange(6379, 6379), "udp"
+    )
+    assert parse_compose_port("8000-9000:8000-9000") == PortMapping(
+        None, PortRange(8000, 9000), PortRange(8000, 9000), "tcp"
+    )
+    assert parse_compose_port("${HOST_PORT}:80") is None
+
+
+def test_parse_compose_port_long_syntax():
+    spec = {"target": 22, "published": "2200-2299", "host_ip": "0.0.0.0", "protocol": "tcp"}
+    assert parse_compose_port(spec) == PortMapping("0.0.0.0", PortRange(2200, 2299), PortRange(22, 22), "tcp")
+    assert parse_compose_port({"target": 80}) == PortMapping(None, None, PortRange(80, 80), "tcp")
+    assert parse_compose_port({"published": 80}) is None
+
+
+def test_port_index_merges_and_clips_ranges():
+    index = PortIndex([22, "6000-6010", "6005-6063", (6064, 6070), "bogus"])
+    assert 22 in index
+    assert 23 not in index
+    assert 6070 in index
+    assert index.overlaps(20, 25) == [PortRange(22, 22)]
+    assert index.overlaps(6060, 7000) == [PortRange(6060, 6070)]
+    assert index.overlaps(0, 65535) == [PortRange(22, 22), PortRange(6000, 6070)]
+    assert index.overlaps(80) == []
+    assert PortRange(6000, 6070).label() == "6000-6070"
+    assert PortRange(22, 22).label() == 22
@@ -0,0 +1,107 @@
+import sys
+import os
+import json
+import pytest
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from scanner import scan_files, ruleset_fingerprint
+from utils import profiling
+from checks import dockerfile_checks, compose_checks, container_runtime_checks
+from checks.container_runtime_checks import run_runtime_checks
+from fake_docker import FakeDockerDaemon, make_container
+
+
+@pytest.fixture
+def profiler():
+    saved = (
+        list(dockerfile_checks.DOCKERFILE_CHECKS),
+        list(compose_checks.COMPOSE_CHECKS),
+        list(container_runtime_checks.RUNTIME_CHECKS),
+    )
+    yield profiling.enable(include_runtime=True)
+    profiling.PROFILER = None
+    dockerfile_checks.DOCKERFILE_CHECKS[:], compose_checks.COMPOSE_CHECKS[:], \
+        container_runtime_checks.RUNTIME_CHECKS[:] = saved
+
+
+def _write_tree(tmp_path):
+    for index in range(4):
+        (tmp_path / f"Dockerfile.{index}").write_text("FROM ubuntu\nEXPOSE 22 80\nHEALTHCHECK CMD true\n")
+    (tmp_path / "docker-compose.yml").write_text("services:\n  web:\n    image: nginx\n    privileged: true\n")
+    return (
+        sorted(str(path) for path in tmp_path.glob("Dockerfile.*")),
+        [str(tmp_path / "docker-compose.yml")],
+    )
+
+
+def _stats(profiler):
+    return {(section, name): (calls, findings) for section, name, calls, _, findings in profiler.rows()}
+
+
+def test_profile_counts_calls_and_findings_per_rule(tmp_path, profiler):
+    dockerfiles, compose_files = _write_tree(tmp_path)
+    fingerprint = ruleset_fingerprint()
+    findings = scan_files(dockerfiles, compose_files, jobs=1)
+
+    stats = _stats(profiler)
+    assert stats[("rule", "dockerfile:latest_tag")] == (4, 4)
+    assert stats[("rule", "dockerfile:sensitive_ports")] == (4, 4)
+    # on_instruction never fires for USER here; on_finish runs once per file.
+    assert ("rule", "dockerfile:missing_user") not in stats
+    assert stats[("rule", "dockerfile:missing_user:finish")] == (4, 4)
+    assert stats[("rule", "dockerfile:missing_healthcheck")] == (4, 0)
+    assert stats[("rule", "dockerfile:missing_healthcheck:finish")] == (4, 0)
+    assert stats[("rule", "compose:privileged_mode")] == (1, 1)
+    assert stats[("runner", "run_dockerfile_checks")] == (4, 12)
+    assert stats[("phase", "load_compose_file")] == (1, 0)
+    runner_findings = stats[("runner", "run_dockerfile_checks")][1] + stats[("runner", "run_compose_checks")][1]
+    assert runner_findings == len(findings)
+    # Wrapping the registries must not change the cache fingerprint.
+    profiling.PROFILER = None
+    assert ruleset_fingerprint() == fingerprint
+
+
+def test_profile_merges_worker_stats(tmp_path, profiler):
+    dockerfiles, compose_files = _write_tree(tmp_path)
+    scan_files(dockerfiles, compose_files, jobs=2)
+
+    stats = _stats(profiler)
+    assert stats[("runner", "run_dockerfile_checks")] == (4, 12)
+    assert stats[("rule", "dockerfile:latest_tag")] == (4, 4)
+    assert stats[("runner", "run_compose_checks")][0] == 1
+
+
+def test_profile_runtime_rules_and_docker_api(profiler):
+    containers = [make_container(0, Privileged=True), make_container(1, Memory=512, CpuShares=2)]
+    with FakeDockerDaemon(containers) as daemon:
+        findings = run_runtime_checks(daemon.base_url, workers=2)
+
+    stats = _stats(profiler)
+    assert stats[("rule", "runtime:check_privileged_containers")] == (2, 1)
+    assert stats[("runner", "run_runtime_checks")] == (2, len(findings))
+    assert stats[("phase", "docker_api:list")] == (1, 0)
+    assert stats[("phase", "docker_api:inspect")] == (2, 0)
+
+
+def test_profile_report_formats(tmp_path, profiler):
+    profiler.record("rule", 'compose:"quoted"', 0.5, findings=3)
+    profiler.record("rule", 'compose:"quoted"', 0.25, findings=1)
+
+    path = tmp_path / "scanner.prom"
+    profiling.write_report(profiler, "prometheus", str(path))
+    text = path.read_text()
+    assert "# TYPE docker_scanner_profile_seconds_total counter" in text
+    assert 'docker_scanner_profile_calls_total{section="rule",name="compose:\\"quoted\\""} 2' in text
+    assert 'docker_scanner_profile_findings_total{section="rule",name="compose:\\"quoted\\""} 4' in text
+    assert os.listdir(tmp_path) == ["scanner.prom"]
+
+    path = tmp_path / "profile.json"
+    profiling.write_report(profiler, "json", str(path))
+    assert json.loads(path.read_text()) == [
+        {"section": "rule", "name": 'compose:"quoted"', "calls": 2, "seconds": 0.75, "findings": 4}
+    ]
+
+
+def test_profiling_disabled_by_default():
+    assert profiling.PROFILER is None
+    assert not hasattr(compose_checks.COMPOSE_CHECKS[0], "__wrapped__")
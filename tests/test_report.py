@@ -0,0 +1,160 @@
+import sys
+import os
+import io
+import json
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from checks.dockerfile_checks import LATEST_TAG, MISSING_HEALTHCHECK
+from checks.container_runtime_checks import PRIVILEGED_CONTAINER
+from utils.finding import Finding
+from utils.report import JsonLinesWriter, SarifWriter, ReportWriter, SummaryWriter, print_findings
+
+FINDINGS = [
+    Finding(LATEST_TAG, ("ubuntu",), file="svc/Dockerfile", line=1),
+    Finding(MISSING_HEALTHCHECK),
+    Finding(PRIVILEGED_CONTAINER, ("web",), container="0123456789ab"),
+]
+
+
+def test_jsonl_writer_writes_each_batch_immediately():
+    stream = io.StringIO()
+    writer = JsonLinesWriter(stream)
+    writer.write(FINDINGS[:1])
+    assert json.loads(stream.getvalue()) == {
+        "severity": "HIGH",
+        "check": "Latest tag detected",
+        "details": "Line 1: FROM ubuntu",
+        "file": "svc/Dockerfile",
+        "line": 1,
+    }
+    writer.write(FINDINGS[1:])
+    writer.close()
+    lines = stream.getvalue().splitlines()
+    assert [json.loads(line) for line in lines] == [finding.to_dict() for finding in FINDINGS]
+    assert writer.count == 3
+
+
+def test_sarif_writer_produces_valid_document():
+    stream = io.StringIO()
+    writer = SarifWriter(stream)
+    writer.write(FINDINGS[:2])
+    writer.write([])
+    writer.write(FINDINGS[2:] + FINDINGS[:1])
+    writer.close()
+    document = json.loads(stream.getvalue())
+    run = document["runs"][0]
+    assert document["version"] == "2.1.0"
+    assert len(run["results"]) == 4
+    rules = run["tool"]["driver"]["rules"]
+    assert [rule["id"] for rule in rules] == ["DF001", "DF005", "RT001"]
+    first = run["results"][0]
+    assert first["level"] == "error"
+    assert first["locations"][0]["physicalLocation"]["artifactLocation"]["uri"] == "svc/Dockerfile"
+    assert first["locations"][0]["physicalLocation"]["region"]["startLine"] == 1
+    assert run["results"][3]["ruleIndex"] == 0
+    assert run["results"][2]["locations"][0]["logicalLocations"][0]["name"] == "0123456789ab"
+
+
+def test_sarif_writer_empty_run():
+    stream = io.StringIO()
+    writer = SarifWriter(stream)
+    writer.close()
+    document = json.loads(stream.getvalue())
+    assert document["runs"][0]["results"] == []
+
+
+def test_sarif_writer_qualifies_container_with_host():
+    stream = io.StringIO()
+    writer = SarifWriter(stream)
+    writer.write([Finding(PRIVILEGED_CONTAINER, ("web",), container="0123456789ab", host="tcp://node-1:2376")])
+    writer.close()
+    result = json.loads(stream.getvalue())["runs"][0]["results"][0]
+    location = result["locations"][0]["logicalLocations"][0]
+    assert location == {
+        "name": "0123456789ab",
+        "kind": "resource",
+        "fullyQualifiedName": "tcp://node-1:2376/0123456789ab",
+    }
+
+
+def container_findings(count):
+    return [Finding(PRIVILEGED_CONTAINER, (f"web-{i}",), container=f"{i:012x}") for i in range(count)]
+
+
+def test_print_findings_json_matches_json_dumps():
+    stream = io.StringIO()
+    print_findings(iter(FINDINGS), as_json=True, stream=stream)
+    assert stream.getvalue() == json.dumps([finding.to_dict() for finding in FINDINGS], indent=2) + "\n"
+    stream = io.StringIO()
+    print_findings(iter([]), as_json=True, stream=stream)
+    assert stream.getvalue() == "[]\n"
+
+
+def test_print_findings_renders_lazily_in_pages():
+    consumed = []
+
+    def generate():
+        for finding in container_findings(25):
+            consumed.append(finding)
+            yield finding
+
+    stream = io.StringIO()
+    print_findings(generate(), stream=stream, show_file=False, show_host=False, page_size=10)
+    output = stream.getvalue()
+    assert len(consumed) == 25
+    assert output.count("Misconfiguration Report") == 1
+    assert output.count("Severity") == 3
+    assert "web-24" in output
+
+
+def test_report_writer_caps_listed_findings():
+    stream = io.StringIO()
+    writer = ReportWriter(as_json=True, max_findings=2, stream=stream)
+    writer.write(FINDINGS)
+    writer.write(container_findings(5))
+    writer.close()
+    assert writer.count == 8
+    assert json.loads(stream.getvalue()) == [finding.to_dict() for finding in FINDINGS[:2]]
+
+
+def test_report_writer_table_notes_omitted_findings():
+    stream = io.StringIO()
+    writer = ReportWriter(max_findings=1, stream=stream)
+    writer.write(FINDINGS)
+    writer.close()
+    output = stream.getvalue()
+    assert "svc/Dockerfile" in output
+    assert "RT001" not in output and "Privileged" not in output
+    assert "2 more finding(s) not shown" in output
+
+
+def test_summary_writer_groups_by_rule():
+    stream = io.StringIO()
+    writer = SummaryWriter(as_json=True, top=1, stream=stream)
+    writer.write(container_findings(512))
+    writer.write(FINDINGS)
+    writer.close()
+    summary = json.loads(stream.getvalue())
+    assert summary["total"] == 515
+    high = summary["severities"]["HIGH"]
+    assert high["count"] == 514 and high["rules"] == 2
+    assert high["top"] == [{
+        "rule_id": "RT001",
+        "severity": "HIGH",
+        "check": PRIVILEGED_CONTAINER.title,
+        "count": 513,
+        "affected": "513 containers",
+        "example": Finding(PRIVILEGED_CONTAINER, ("web-0",), container="000000000000").details,
+    }]
+    assert summary["severities"]["LOW"]["top"][0]["affected"] == "1 file"
+
+
+def test_summary_writer_table():
+    stream = io.StringIO()
+    writer = SummaryWriter(top=1, stream=stream)
+    writer.write(FINDINGS + container_findings(3))
+    writer.close()
+    output = stream.getvalue()
+    assert "× 4" in output
+    assert "1 more rule(s)" in output
+    assert "6 finding(s) in total" in output
@@ -0,0 +1,171 @@
+import sys
+import os
+import pytest
+from unittest.mock import Mock
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from checks import dockerfile_checks, compose_checks, container_runtime_checks, rule_packs
+from checks.dockerfile_checks import run_dockerfile_checks
+from checks.compose_checks import run_compose_checks
+from checks.container_runtime_checks import run_container_checks
+from scanner import ruleset_fingerprint, scan_files
+from utils.file_loader import parse_dockerfile
+from utils.matchers import compile_accessor, compile_any, compile_predicate
+
+YAML_PACK = r"""
+rules:
+  - id: ACME001
+    target: dockerfile
+    severity: high
+    title: Download piped to shell
+    message: "Line {line}: pipes {0} output into a shell"
+    instruction: RUN
+    match:
+      regex: '(curl|wget)\b[^|]*\|\s*(ba)?sh'
+  - id: ACME002
+    target: dockerfile
+    severity: low
+    title: Missing maintainer label
+    instruction: LABEL
+    absent: true
+    match:
+      any: [maintainer=, org.opencontainers.image.authors=]
+  - id: ACME010
+    target: compose
+    severity: high
+    title: Dangerous capability added
+    message: "Service '{service}' adds {0}"
+    field: cap_add
+    match:
+      any: [SYS_ADMIN, NET_ADMIN, ALL]
+  - id: ACME011
+    target: compose
+    title: No restart policy
+    message: "Service '{service}' has no restart policy"
+    field: restart
+    match:
+      missing: true
+  - id: ACME020
+    target: runtime
+    severity: high
+    title: Dangerous capability added
+    message: "Container {1} adds {0}"
+    field: HostConfig.CapAdd
+    match:
+      equals: [SYS_ADMIN]
+"""
+
+TOML_PACK = """
+[[rules]]
+id = "ACME030"
+target = "dockerfile"
+title = "Package cache left behind"
+message = "Line {line}: apt lists not removed"
+instruction = "RUN"
+match = { not = { regex = "rm -rf /var/lib/apt/lists" } }
+"""
+
+
+@pytest.fixture
+def installed(tmp_path):
+    saved = (
+        list(dockerfile_checks.DOCKERFILE_CHECKS),
+        list(compose_checks.COMPOSE_CHECKS),
+        list(container_runtime_checks.RUNTIME_CHECKS),
+        list(rule_packs.INSTALLED_PACKS),
+    )
+    (tmp_path / "acme.yaml").write_text(YAML_PACK)
+    (tmp_path / "acme.toml").write_text(TOML_PACK)
+    fingerprint = ruleset_fingerprint()
+    rule_packs.install_rule_packs(
+        [str(tmp_path / "acme.yaml"), str(tmp_path / "acme.toml")],
+        include_runtime=True,
+        cache_dir=str(tmp_path / "cache"),
+    )
+    yield fingerprint
+    dockerfile_checks.DOCKERFILE_CHECKS[:], compose_checks.COMPOSE_CHECKS[:], \
+        container_runtime_checks.RUNTIME_CHECKS[:], rule_packs.INSTALLED_PACKS[:] = saved
+
+
+def test_compile_any_and_accessor():
+    pattern = compile_any(["http", "https://", ".tar"])
+    assert pattern.search("ADD https://example.com/x /x").group(0) == "https://"
+    assert compile_any([]).search("anything") is None
+    access = compile_accessor("deploy.resources.limits.memory")
+    assert access({"deploy": {"resources": {"limits": {"memory": "512m"}}}}) == "512m"
+    assert compile_predicate({"missing": True})(access({"deploy": None})) == ""
+
+
+def test_predicates():
+    assert compile_predicate({"regex": "priv"})("privileged") == "priv"
+    assert compile_predicate({"any": ["a", "b"], "ignore_case": True})(["X", "B"]) == "B"
+    assert compile_predicate({"equals": [True]})(True) == "True"
+    assert compile_predicate({"not": {"regex": "^app$"}})("root") == "root"
+    assert compile_predicate({"present": True})(None) is None
+
+
+def test_dockerfile_pack_rules(installed):
+    instructions = parse_dockerfile([
+        "FROM ubuntu:22.04",
+        "RUN curl -fsSL https://get.example.com | sh",
+        "RUN apt-get update && rm -rf /var/lib/apt/lists/*",
+        "USER app",
+        "HEALTHCHECK CMD true",
+    ])
+    findings = [(f.rule_id, f.details) for f in run_dockerfile_checks(instructions) if f.rule_id.startswith("ACME")]
+    assert findings == [
+        ("ACME001", "Line 2: pipes curl -fsSL https://get.example.com | sh output into a shell"),
+        ("ACME002", "Missing maintainer label"),
+        ("ACME030", "Line 2: apt lists not removed"),
+    ]
+
+
+def test_compose_and_runtime_pack_rules(installed):
+    config = {"services": {"web": {"image": "nginx:1.25", "user": "app", "cap_add": ["NET_ADMIN"]}}}
+    findings = [(f.rule_id, f.details) for f in run_compose_checks(config) if f.rule_id.startswith("ACME")]
+    assert findings == [
+        ("ACME010", "Service 'web' adds NET_ADMIN"),
+        ("ACME011", "Service 'web' has no restart policy"),
+    ]
+
+    container = Mock()
+    container.name = "web"
+    container.id = "0123456789abcdef"
+    container.attrs = {"HostConfig": {"CapAdd": ["CHOWN", "SYS_ADMIN"], "Memory": 1, "CpuShares": 1}}
+    assert [f.details for f in run_container_checks(container)] == ["Container web adds SYS_ADMIN"]
+
+
+def test_packs_change_fingerprint_and_run_in_workers(installed, tmp_path):
+    assert ruleset_fingerprint() != installed
+    for index in range(3):
+        (tmp_path / f"Dockerfile.{index}").write_text("FROM alpine:3\nRUN wget -qO- x | bash\n")
+    paths = sorted(str(path) for path in tmp_path.glob("Dockerfile.*"))
+    findings = scan_files(paths, [], jobs=2)
+    assert sum(f.rule_id == "ACME001" for f in findings) == 3
+
+
+def test_rule_specs_are_cached_on_disk(tmp_path, monkeypatch):
+    path = tmp_path / "acme.yaml"
+    path.write_text(YAML_PACK)
+    digest, specs = rule_packs.load_rule_specs(str(path), str(tmp_path))
+    assert os.path.exists(tmp_path / "rulepacks" / f"{digest}.json")
+
+    def fail(*args):
+        raise AssertionError("pack was parsed again")
+    monkeypatch.setattr(rule_packs, "_parse_pack", fail)
+    assert rule_packs.load_rule_specs(str(path), str(tmp_path)) == (digest, specs)
+
+
+def test_invalid_packs_are_rejected(tmp_path):
+    cases = [
+        "rules: [{id: X1, target: helm, match: {any: [a]}}]",
+        "rules: [{id: X2, target: compose, match: {regex: '('}}]",
+        "rules: [{id: DF001, target: compose, title: Clash, match: {missing: true}}]",
+        "rules: [{id: X3, target: dockerfile, match: {any: [a]}}]",
+        "not_rules: []",
+    ]
+    for index, text in enumerate(cases):
+        path = tmp_path / f"bad{index}.yaml"
+        path.write_text(text)
+        with pytest.raises(Exception):
+            rule_packs.compile_rule_packs([str(path)], str(tmp_path / "cache"))
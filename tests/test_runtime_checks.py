@@ -140,3 +140,20 @@ def test_container_no_mounts():
     }
     findings = check_sensitive_mounts(container)
     assert len(findings) == 0
+
+
+def test_check_sensitive_mounts_normalises_and_resolves_aliases():
+    container = Mock()
+    container.name = "test_container"
+    container.attrs = {
+        "Mounts": [
+            {"Source": "/run/docker.sock", "Destination": "/var/run/docker.sock"},
+            {"Source": "/data/../etc/", "Destination": "/host-etc"},
+            {"Source": "/etcetera", "Destination": "/data"},
+        ]
+    }
+    findings = check_sensitive_mounts(container)
+    assert [f["details"] for f in findings] == [
+        "Container test_container mounts /run/docker.sock",
+        "Container test_container mounts /data/../etc/",
+    ]
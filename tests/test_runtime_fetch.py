@@ -0,0 +1,141 @@
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from fake_docker import FakeDockerDaemon, make_container
+from checks.container_runtime_checks import (
+    run_runtime_checks, watch_runtime_checks, iter_multi_host_checks, run_multi_host_checks
+)
+from utils.docker_fetch import create_client, list_container_summaries, iter_inspected_containers, read_hosts_file
+
+
+def test_list_is_sparse_and_inspects_each_container_once():
+    containers = [make_container(i, Memory=1 << 28, CpuShares=512) for i in range(20)]
+    with FakeDockerDaemon(containers) as daemon:
+        client = create_client(daemon.base_url, workers=4)
+        summaries = list_container_summaries(client)
+        assert len(summaries) == 20
+        assert daemon.inspected == []
+        results = list(iter_inspected_containers(client, summaries, workers=4))
+        client.close()
+    assert sorted(index for index, _ in results) == list(range(20))
+    assert sorted(daemon.inspected) == sorted(c["Id"] for c in containers)
+    names = {container.name for _, container in results}
+    assert "container-0" in names
+
+
+def test_run_runtime_checks_against_fake_daemon():
+    containers = [
+        make_container(1, Privileged=True, Memory=1 << 28, CpuShares=512),
+        make_container(2, NetworkMode="host"),
+    ]
+    with FakeDockerDaemon(containers) as daemon:
+        findings = run_runtime_checks(daemon.base_url, workers=2)
+    checks = [f["check"] for f in findings]
+    assert checks == ["Privileged container", "No memory limit", "No CPU limit", "Host network mode"]
+
+
+def test_run_runtime_checks_skips_removed_containers():
+    containers = [make_container(i) for i in range(3)]
+    with FakeDockerDaemon(containers) as daemon:
+        client = create_client(daemon.base_url, workers=2)
+        summaries = list_container_summaries(client)
+        daemon.remove_container(containers[1]["Id"])
+        results = list(iter_inspected_containers(client, summaries, workers=2))
+        client.close()
+    assert sorted(index for index, container in results if container is not None) == [0, 2]
+
+
+def test_failed_inspect_only_affects_its_container():
+    containers = [make_container(i, Memory=1 << 28, CpuShares=512, Privileged=True) for i in range(50)]
+    with FakeDockerDaemon(containers) as daemon:
+        daemon.failing.add(containers[5]["Id"])
+        findings = run_runtime_checks(daemon.base_url, workers=4)
+    errors = [f for f in findings if f["check"] == "Docker connection error"]
+    assert len(errors) == 1
+    assert errors[0].container == containers[5]["Id"][:12]
+    assert len([f for f in findings if f["check"] == "Privileged container"]) == 49
+
+
+def test_run_runtime_checks_connection_error():
+    findings = run_runtime_checks("unix:///nonexistent/docker.sock", workers=2)
+    assert len(findings) == 1
+    assert findings[0]["check"] == "Docker connection error"
+
+
+def test_watch_runtime_checks_streams_changes_only():
+    safe = make_container(1, Memory=1 << 28, CpuShares=512)
+    with FakeDockerDaemon([safe]) as daemon:
+        watch = watch_runtime_checks(daemon.base_url, workers=2)
+        assert next(watch) == []
+
+        risky = make_container(2, Privileged=True, Memory=1 << 28, CpuShares=512)
+        daemon.add_container(risky)
+        daemon.emit_event("start", risky["Id"])
+        batch = next(watch)
+        assert [f["check"] for f in batch] == ["Privileged container"]
+        assert batch[0]["container"] == risky["Id"][:12]
+
+        # Unchanged container restarts produce nothing new; once destroyed and
+        # recreated its findings are reported again.
+        daemon.emit_event("start", risky["Id"])
+        daemon.emit_event("destroy", risky["Id"])
+        daemon.emit_event("create", risky["Id"])
+        batch = next(watch)
+        assert [f["check"] for f in batch] == ["Privileged container"]
+        assert daemon.inspected.count(risky["Id"]) == 3
+        watch.close()
+
+
+def test_multi_host_scan_tags_hosts_and_isolates_failures():
+    fast = FakeDockerDaemon([make_container(1, Privileged=True, Memory=1 << 28, CpuShares=512)])
+    slow = FakeDockerDaemon([make_container(2, NetworkMode="host", Memory=1 << 28, CpuShares=512)], delay=0.3)
+    unreachable = "unix:///nonexistent/docker.sock"
+    with fast, slow:
+        batches = list(iter_multi_host_checks(
+            [slow.base_url, unreachable, fast.base_url], workers=2, concurrency=3, timeout=5
+        ))
+
+    by_host = {batch[0].host: [f.check for f in batch] for batch in batches}
+    assert by_host == {
+        fast.base_url: ["Privileged container"],
+        slow.base_url: ["Host network mode"],
+        unreachable: ["Docker connection error"],
+    }
+    # The slow daemon's results arrive last instead of holding up the others.
+    assert batches[-1][0].host == slow.base_url
+
+
+def test_multi_host_scan_respects_concurrency_limit():
+    daemons = [FakeDockerDaemon([make_container(i)], delay=0.05) for i in range(4)]
+    for daemon in daemons:
+        daemon.start()
+    try:
+        findings = run_multi_host_checks([d.base_url for d in daemons], workers=1, concurrency=2)
+    finally:
+        for daemon in daemons:
+            daemon.stop()
+    assert sorted(f.host for f in findings if f.check == "No memory limit") == sorted(d.base_url for d in daemons)
+
+
+def test_multi_host_scan_stops_early():
+    daemons = [FakeDockerDaemon([make_container(i)], delay=0.05) for i in range(6)]
+    for daemon in daemons:
+        daemon.start()
+    try:
+        scan = iter_multi_host_checks([d.base_url for d in daemons], workers=1, concurrency=1)
+        first = next(scan)
+        scan.close()
+    finally:
+        for daemon in daemons:
+            daemon.stop()
+    assert first[0].host == daemons[0].base_url
+    # Hosts not yet started were dropped, not scanned in the background.
+    assert [bool(d.requests) for d in daemons].count(True) <= 2
+
+
+def test_read_hosts_file(tmp_path):
+    hosts_file = tmp_path / "hosts"
+    hosts_file.write_text("# fleet\nunix:///var/run/docker.sock\n\ntcp://10.0.0.5:2376  # rack 2\n")
+    assert read_hosts_file(str(hosts_file)) == ["unix:///var/run/docker.sock", "tcp://10.0.0.5:2376"]
@@ -0,0 +1,102 @@
+import sys
+import os
+import json
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.discovery import discover_files
+from scanner import scan_files, iter_scan_files
+
+
+def write(path, content):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+
+
+def make_tree(root):
+    write(root / "svc-b" / "Dockerfile", "FROM ubuntu\nEXPOSE 22\n")
+    write(root / "svc-a" / "Dockerfile.prod", "FROM alpine:3.19\nUSER app\n")
+    write(root / "svc-a" / "worker.dockerfile", "FROM python:3.12\n")
+    write(root / "docker-compose.yml", "services:\n  web:\n    image: nginx\n")
+    write(root / "deploy" / "compose.prod.yaml", "services:\n  db:\n    image: postgres:16\n")
+    write(root / "README.md", "not a container file\n")
+    write(root / ".git" / "Dockerfile", "FROM ignored\n")
+
+
+def test_discover_files(tmp_path):
+    make_tree(tmp_path)
+    dockerfiles, compose_files = discover_files(str(tmp_path))
+    assert [os.path.relpath(p, tmp_path) for p in dockerfiles] == [
+        os.path.join("svc-a", "Dockerfile.prod"),
+        os.path.join("svc-a", "worker.dockerfile"),
+        os.path.join("svc-b", "Dockerfile"),
+    ]
+    assert [os.path.relpath(p, tmp_path) for p in compose_files] == [
+        os.path.join("deploy", "compose.prod.yaml"),
+        "docker-compose.yml",
+    ]
+
+
+def test_discover_files_missing_dir(tmp_path):
+    try:
+        discover_files(str(tmp_path / "missing"))
+        assert False, "expected FileNotFoundError"
+    except FileNotFoundError:
+        pass
+
+
+def test_scan_files_tags_findings_with_file(tmp_path):
+    make_tree(tmp_path)
+    dockerfiles, compose_files = discover_files(str(tmp_path))
+    findings = scan_files(dockerfiles, compose_files, jobs=1)
+    assert findings
+    assert all("file" in f for f in findings)
+    assert any(f["file"].endswith("docker-compose.yml") for f in findings)
+
+
+def test_scan_files_parallel_matches_serial(tmp_path):
+    make_tree(tmp_path)
+    dockerfiles, compose_files = discover_files(str(tmp_path))
+    serial = scan_files(dockerfiles, compose_files, jobs=1)
+    parallel = scan_files(dockerfiles, compose_files, jobs=3)
+    assert serial == parallel
+
+
+def test_scan_files_reports_parse_errors(tmp_path):
+    write(tmp_path / "docker-compose.yml", "services: [unclosed\n")
+    findings = scan_files([], [str(tmp_path / "docker-compose.yml")], jobs=1)
+    assert len(findings) == 1
+    assert findings[0]["check"] == "Compose parse error"
+
+
+def test_iter_scan_files_can_stop_early(tmp_path):
+    paths = []
+    for i in range(40):
+        path = tmp_path / f"svc-{i:02d}" / "Dockerfile"
+        write(path, "FROM ubuntu\n")
+        paths.append(str(path))
+    batches = iter_scan_files(paths, [], jobs=2)
+    first = next(batches)
+    batches.close()
+    assert first[0].file == paths[0]
+
+
+def run_main(*args):
+    import subprocess
+    main = os.path.join(os.path.dirname(__file__), '..', 'src', 'main.py')
+    return subprocess.run([sys.executable, main, "--format", "jsonl", "--no-cache"] + list(args),
+                          capture_output=True, text=True)
+
+
+def test_cli_fail_fast_gates_on_severity(tmp_path):
+    write(tmp_path / "a" / "Dockerfile", "FROM alpine:3.19\n")
+    write(tmp_path / "b" / "Dockerfile", "FROM ubuntu\n")
+    write(tmp_path / "c" / "Dockerfile", "FROM ubuntu\n")
+
+    result = run_main("--path", str(tmp_path), "--jobs", "1", "--fail-fast=high")
+    assert result.returncode == 1
+    files = {json.loads(line)["file"] for line in result.stdout.splitlines()}
+    assert files == {str(tmp_path / "a" / "Dockerfile"), str(tmp_path / "b" / "Dockerfile")}
+
+    result = run_main("--path", str(tmp_path / "a"), "--fail-fast", "HIGH")
+    assert result.returncode == 0
+    assert "Missing USER directive" in result.stdout
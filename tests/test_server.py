@@ -0,0 +1,179 @@
+import sys
+import os
+import json
+import socket
+import threading
+import http.client
+from concurrent.futures import ThreadPoolExecutor
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from server import create_server, ScanService
+
+DOCKERFILE_TEXT = "FROM ubuntu\nEXPOSE 22\n"
+COMPOSE_TEXT = "services:\n  web:\n    image: nginx\n    privileged: true\n"
+
+
+class UnixConnection(http.client.HTTPConnection):
+    def __init__(self, path: str):
+        super().__init__("localhost")
+        self.socket_path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(self.socket_path)
+
+
+def start(address: str):
+    server = create_server(address, ScanService(cache_entries=2))
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    return server
+
+
+def request(connection, method: str, path: str, body=None):
+    if isinstance(body, (dict, list)):
+        body = json.dumps(body)
+    connection.request(method, path, body=body)
+    response = connection.getresponse()
+    return response.status, json.loads(response.read())
+
+
+def stop(server):
+    server.shutdown()
+    server.server_close()
+
+
+def test_dockerfile_and_compose_endpoints():
+    server = start("127.0.0.1:0")
+    connection = http.client.HTTPConnection("127.0.0.1", server.server_address[1])
+    try:
+        status, payload = request(connection, "POST", "/v1/dockerfile", DOCKERFILE_TEXT)
+        assert status == 200
+        assert [f["check"] for f in payload["findings"]] == [
+            "Latest tag detected", "Missing USER directive", "Sensitive port exposed", "Missing HEALTHCHECK"
+        ]
+        status, payload = request(connection, "POST", "/v1/compose", COMPOSE_TEXT)
+        assert status == 200
+        assert "Privileged mode enabled" in [f["check"] for f in payload["findings"]]
+
+        status, payload = request(connection, "POST", "/v1/compose", "services: [unclosed")
+        assert status == 200
+        assert payload["findings"][0]["check"] == "Compose parse error"
+
+        status, payload = request(connection, "POST", "/v1/dockerfile", DOCKERFILE_TEXT)
+        status, health = request(connection, "GET", "/healthz")
+        assert health["hits"] == 1
+        assert health["misses"] == 3
+    finally:
+        connection.close()
+        stop(server)
+
+
+def test_batch_endpoint_over_unix_socket(tmp_path):
+    path = str(tmp_path / "scanner.sock")
+    server = start(f"unix:{path}")
+    connection = UnixConnection(path)
+    try:
+        status, payload = request(connection, "POST", "/v1/batch", {"items": [
+            {"name": "app/Dockerfile", "kind": "dockerfile", "content": DOCKERFILE_TEXT},
+            {"name": "docker-compose.yml", "kind": "compose", "content": COMPOSE_TEXT},
+        ]})
+        assert status == 200
+        assert [result["name"] for result in payload["results"]] == ["app/Dockerfile", "docker-compose.yml"]
+        assert len(payload["results"][0]["findings"]) == 4
+
+        status, payload = request(connection, "POST", "/v1/batch", {"items": [{"kind": "helm", "content": ""}]})
+        assert status == 400
+        assert "Item 0" in payload["error"]
+    finally:
+        connection.close()
+        stop(server)
+
+
+def test_concurrent_requests_and_bounded_cache():
+    server = start("127.0.0.1:0")
+    port = server.server_address[1]
+
+    def scan(index: int) -> int:
+        connection = http.client.HTTPConnection("127.0.0.1", port)
+        try:
+            _, payload = request(connection, "POST", "/v1/dockerfile", f"FROM app:{index}\nUSER app\n")
+            return len(payload["findings"])
+        finally:
+            connection.close()
+
+    try:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            counts = list(executor.map(scan, range(32)))
+        assert counts == [1] * 32
+        assert len(server.service._cache) == 2
+    finally:
+        stop(server)
+
+
+def test_unknown_path():
+    server = start("127.0.0.1:0")
+    connection = http.client.HTTPConnection("127.0.0.1", server.server_address[1])
+    try:
+        assert request(connection, "POST", "/v1/helm", "x")[0] == 404
+        assert request(connection, "GET", "/", None)[0] == 404
+    finally:
+        connection.close()
+        stop(server)
+
+
+def test_unix_socket_never_replaces_other_files(tmp_path):
+    import pytest
+    path = tmp_path / "important.txt"
+    path.write_text("keep me")
+    with pytest.raises(FileExistsError):
+        create_server(f"unix:{path}")
+    assert path.read_text() == "keep me"
+
+    # A stale socket from an earlier run is replaced.
+    stale = str(tmp_path / "scanner.sock")
+    stop(start(f"unix:{stale}"))
+    server = start(f"unix:{stale}")
+    stop(server)
+
+
+def test_unix_socket_in_use_is_not_replaced(tmp_path):
+    import pytest
+    path = str(tmp_path / "scanner.sock")
+    server = start(f"unix:{path}")
+    try:
+        with pytest.raises(FileExistsError):
+            create_server(f"unix:{path}")
+        connection = UnixConnection(path)
+        assert request(connection, "GET", "/healthz")[0] == 200
+        connection.close()
+    finally:
+        stop(server)
+
+
+def test_invalid_port_is_a_clean_error():
+    import subprocess
+    import pytest
+    for address in ("localhost:abc", "localhost:70000", "localhost:-1"):
+        with pytest.raises(ValueError):
+            create_server(address)
+    main = os.path.join(os.path.dirname(__file__), '..', 'src', 'main.py')
+    result = subprocess.run([sys.executable, main, "--serve", "localhost:abc"], capture_output=True, text=True)
+    assert result.returncode == 1
+    assert result.stdout.startswith("Error: Cannot serve on localhost:abc")
+    assert "Traceback" not in result.stderr
+
+
+def test_negative_content_length_is_rejected():
+    server = start("127.0.0.1:0")
+    connection = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=5)
+    try:
+        connection.putrequest("POST", "/v1/dockerfile")
+        connection.putheader("Content-Length", "-1")
+        connection.endheaders()
+        response = connection.getresponse()
+        assert response.status == 400
+        assert json.loads(response.read())["error"] == "Invalid Content-Length"
+    finally:
+        connection.close()
+        stop(server)
@@ -0,0 +1,82 @@
+import sys
+import os
+import sqlite3
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from fake_docker import FakeDockerDaemon, make_container
+from checks.container_runtime_checks import run_runtime_checks
+from utils.snapshots import SnapshotStore, summary_hash, config_hash
+
+SAFE = {"Memory": 1 << 28, "CpuShares": 512}
+
+
+def scan(daemon, directory, **options):
+    store = SnapshotStore(str(directory), "ruleset", **options)
+    findings = run_runtime_checks(daemon.base_url, workers=2, snapshots=store)
+    store.close()
+    return sorted((f.container, f.check) for f in findings), store
+
+
+def test_hashes_ignore_status_but_not_configuration():
+    attrs = make_container(1)
+    summary = {"Id": attrs["Id"], "Names": ["/a"], "Status": "Up 1 minute", "HostConfig": {"NetworkMode": "bridge"}}
+    assert summary_hash(summary) == summary_hash(dict(summary, Status="Up 2 hours"))
+    assert summary_hash(summary) != summary_hash(dict(summary, HostConfig={"NetworkMode": "host"}))
+    assert config_hash(attrs) == config_hash(dict(attrs, State={"Status": "exited"}))
+    assert config_hash(attrs) != config_hash(make_container(1, Privileged=True))
+
+
+def test_unchanged_containers_skip_inspect(tmp_path):
+    containers = [make_container(1, Privileged=True, **SAFE), make_container(2, **SAFE), make_container(3)]
+    with FakeDockerDaemon(containers) as daemon:
+        first, store = scan(daemon, tmp_path)
+        assert store.hits == 0 and len(daemon.inspected) == 3
+        second, store = scan(daemon, tmp_path)
+        assert store.hits == 3 and len(daemon.inspected) == 3
+    assert second == first
+    assert ("0" * 12, "Privileged container") in first
+
+
+def test_changed_summary_is_inspected_again(tmp_path):
+    with FakeDockerDaemon([make_container(1, **SAFE), make_container(2, **SAFE)]) as daemon:
+        scan(daemon, tmp_path)
+        daemon.add_container(make_container(2, NetworkMode="host", **SAFE))
+        findings, store = scan(daemon, tmp_path)
+        assert store.hits == 1
+        assert daemon.inspected.count(make_container(2)["Id"]) == 2
+    assert [check for _, check in findings] == ["Host network mode"]
+
+
+def test_revalidation_reuses_findings_for_unchanged_config(tmp_path):
+    with FakeDockerDaemon([make_container(1, Privileged=True, **SAFE), make_container(2, **SAFE)]) as daemon:
+        scan(daemon, tmp_path)
+        # docker update changes limits without touching the list summary.
+        daemon.add_container(make_container(2))
+        findings, store = scan(daemon, tmp_path, revalidate=0)
+        assert store.hits == 0 and store.reused == 1
+        assert len(daemon.inspected) == 4
+    assert [check for _, check in findings] == ["No CPU limit", "No memory limit", "Privileged container"]
+
+
+def test_other_ruleset_is_not_reused(tmp_path):
+    with FakeDockerDaemon([make_container(1)]) as daemon:
+        scan(daemon, tmp_path)
+        store = SnapshotStore(str(tmp_path), "other")
+        run_runtime_checks(daemon.base_url, workers=2, snapshots=store)
+        store.close()
+        assert store.hits == 0 and len(daemon.inspected) == 2
+
+
+def test_ttl_evicts_containers_that_are_gone(tmp_path):
+    with FakeDockerDaemon([make_container(1), make_container(2)]) as daemon:
+        scan(daemon, tmp_path)
+        db = sqlite3.connect(str(tmp_path / "runtime.sqlite"))
+        db.execute("UPDATE snapshots SET last_seen = ?", (time.time() - 100,))
+        db.commit()
+        daemon.remove_container(make_container(2)["Id"])
+        scan(daemon, tmp_path, ttl=50)
+    rows = db.execute("SELECT container_id FROM snapshots").fetchall()
+    db.close()
+    assert rows == [(make_container(1)["Id"],)]
@@ -0,0 +1,31 @@
+import sys
+import os
+import subprocess
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+from bench_startup import MAIN, parse_importtime
+
+
+def imported_modules(tmp_path, *args):
+    dockerfile = tmp_path / "Dockerfile"
+    dockerfile.write_text("FROM python:3.12-slim\nUSER app\n")
+    env = dict(os.environ, XDG_CACHE_HOME=str(tmp_path / "cache"))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", MAIN, "--dockerfile", str(dockerfile)] + list(args),
+        capture_output=True, text=True, env=env
+    )
+    modules, _ = parse_importtime(result.stderr)
+    return set(modules)
+
+
+def test_dockerfile_json_run_skips_heavy_imports(tmp_path):
+    modules = imported_modules(tmp_path, "--json")
+    assert "scanner" in modules
+    for heavy in ["docker", "requests", "rich", "yaml"]:
+        assert heavy not in modules
+
+
+def test_jsonl_run_skips_rich(tmp_path):
+    modules = imported_modules(tmp_path, "--format", "jsonl")
+    assert "rich" not in modules
+    assert "docker" not in modules